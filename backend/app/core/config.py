@@ -1,6 +1,6 @@
 import os
 import json
-from typing import List, Literal
+from typing import List, Literal, Optional
 from dotenv import load_dotenv
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -10,10 +10,21 @@ load_dotenv(override=False)
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_READ_URL: Optional[str] = None
+    READ_REPLICA_PIN_SECONDS: float = 5.0
+    DB_POOL_MIN_SIZE: int = 5
+    DB_POOL_MAX_SIZE: int = 20
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0
+    DB_POOL_ACQUIRE_TIMEOUT: float = 10.0
+    DB_POOL_WARN_UTILIZATION: float = 0.8
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_COMMAND_TIMEOUT: Optional[float] = 60.0
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_REAP_INTERVAL_SECONDS: float = 3600.0
+    REFRESH_TOKEN_REAP_BATCH_SIZE: int = 1000
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:5173",
         "http://localhost:3000",
@@ -22,8 +33,36 @@ class Settings(BaseSettings):
     COOKIE_SECURE: bool = True
     COOKIE_SAMESITE: Literal["lax", "strict", "none"] = "lax"
     RATE_LIMIT_ENABLED: bool = True
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    SUGGESTION_CACHE_USERS: int = 500
+    SUGGESTION_CACHE_PER_USER: int = 500
+    SUGGESTION_CACHE_TTL_SECONDS: float = 600.0
+    TRANSACTION_PARTITION_YEARS_AHEAD: int = 1
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_LEADER_CHECK_SECONDS: float = 15.0
     GOOGLE_API_KEY: str
 
+    # Receipt scanning
+    RECEIPT_SCANNER_BACKEND: Literal["gemini", "fake"] = "gemini"
+    RECEIPT_SCAN_WORKERS: int = 2
+    RECEIPT_QUEUE_LIMIT: int = 50
+    RECEIPT_JOB_TTL_SECONDS: int = 900
+    RECEIPT_CACHE_MAX_ENTRIES: int = 256
+    RECEIPT_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    RECEIPT_IMAGE_MAX_EDGE: int = 1600
+    RECEIPT_IMAGE_QUALITY: int = 80
+    RECEIPT_IMAGE_FORMAT: Literal["WEBP", "JPEG"] = "WEBP"
+    RECEIPT_IMAGE_GRAYSCALE: bool = True
+
+    # Exports
+    EXPORT_CSV_CHUNK_ROWS: int = 500
+    RENDER_POOL_WORKERS: int = 2
+    RENDER_QUEUE_LIMIT: int = 8
+    RENDER_TIMEOUT_SECONDS: float = 60.0
+
     # Mail settings
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
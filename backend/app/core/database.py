@@ -1,24 +1,222 @@
+import asyncio
 import asyncpg
-from typing import AsyncGenerator
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
 from .config import settings
+from .exceptions import AppException
+from .metrics import metrics
+
+logger = logging.getLogger("fintrack.database")
 
 pool: asyncpg.Pool = None
 
+# Optional read-replica pool (DATABASE_READ_URL); None means reads use `pool`
+read_pool: Optional[asyncpg.Pool] = None
+
+# Throttle for the "pool nearly exhausted" warning
+_last_saturation_warning = 0.0
+
+
+async def init_connection(conn: asyncpg.Connection) -> None:
+    """Per-connection setup run by the pool for every new connection."""
+    # Decode json/jsonb columns to Python objects (and encode them back)
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(
+            typename,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog",
+        )
+
+
+async def _create(dsn: str) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        dsn,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_MAX_SIZE,
+        max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        command_timeout=settings.DB_COMMAND_TIMEOUT,
+        init=init_connection,
+        server_settings={"application_name": "finance-tracking-api"},
+    )
+
 
 async def create_pool():
-    global pool
-    print(f"DEBUG: create_pool connecting to {settings.DATABASE_URL}")
-    pool = await asyncpg.create_pool(settings.DATABASE_URL, min_size=5, max_size=20)
-    print("Database pool created")
+    global pool, read_pool
+    pool = await _create(settings.DATABASE_URL)
+    logger.info(
+        f"Database pool created (min={settings.DB_POOL_MIN_SIZE}, "
+        f"max={settings.DB_POOL_MAX_SIZE})"
+    )
+    if settings.DATABASE_READ_URL:
+        read_pool = await _create(settings.DATABASE_READ_URL)
+        logger.info("Read replica pool created")
 
 
 async def close_pool():
-    global pool
+    global pool, read_pool
+    if read_pool:
+        await read_pool.close()
+        read_pool = None
+        logger.info("Read replica pool closed")
     if pool:
         await pool.close()
-        print("Database pool closed")
+        logger.info("Database pool closed")
+
+
+def _in_use() -> int:
+    return pool.get_size() - pool.get_idle_size()
+
 
+metrics.register_gauge("db.pool.size", lambda: pool.get_size())
+metrics.register_gauge("db.pool.idle", lambda: pool.get_idle_size())
+metrics.register_gauge("db.pool.in_use", _in_use)
+metrics.register_gauge("db.pool.max_size", lambda: pool.get_max_size())
 
-async def get_db_conn() -> AsyncGenerator[asyncpg.Connection, None]:
-    async with pool.acquire() as conn:
+
+def _check_saturation() -> None:
+    """Warn (at most once a minute) when the pool is close to exhaustion."""
+    global _last_saturation_warning
+    max_size = pool.get_max_size()
+    in_use = _in_use()
+    if in_use < max_size * settings.DB_POOL_WARN_UTILIZATION:
+        return
+    metrics.inc("db.pool.saturated")
+    now = time.monotonic()
+    if now - _last_saturation_warning >= 60:
+        _last_saturation_warning = now
+        logger.warning(f"Database pool near exhaustion: {in_use}/{max_size} connections in use")
+
+
+async def _acquire_timed(replica: bool = False) -> asyncpg.Connection:
+    """
+    Acquire a pooled connection, recording how long we waited for it.
+
+    Raises:
+        AppException: 503 if no connection frees up within
+            DB_POOL_ACQUIRE_TIMEOUT seconds.
+    """
+    target = read_pool if replica else pool
+    prefix = "db.replica_pool" if replica else "db.pool"
+    started = time.perf_counter()
+    try:
+        conn = await target.acquire(timeout=settings.DB_POOL_ACQUIRE_TIMEOUT)
+    except asyncio.TimeoutError:
+        metrics.inc(f"{prefix}.acquire_timeouts")
+        logger.error(
+            f"Timed out after {settings.DB_POOL_ACQUIRE_TIMEOUT}s waiting for a "
+            f"database connection ({target.get_max_size()} in use)"
+        )
+        raise AppException(
+            "Service is busy, please retry shortly",
+            "DB_POOL_EXHAUSTED",
+            status_code=503,
+        ) from None
+    metrics.observe(f"{prefix}.acquire_seconds", time.perf_counter() - started)
+    if not replica:
+        _check_saturation()
+    return conn
+
+
+@asynccontextmanager
+async def acquire(replica: bool = False) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Acquire a connection outside of request scope (background jobs,
+    streaming responses that outlive the handler).
+
+    ``replica=True`` uses the read replica when one is configured.
+    """
+    replica = replica and read_pool is not None
+    conn = await _acquire_timed(replica)
+    try:
         yield conn
+    finally:
+        await (read_pool if replica else pool).release(conn)
+
+
+class _LazyTransaction:
+    def __init__(self, session: "DBSession", kwargs: dict):
+        self._session = session
+        self._kwargs = kwargs
+        self._tx = None
+
+    async def __aenter__(self):
+        conn = await self._session._ensure()
+        self._tx = conn.transaction(**self._kwargs)
+        return await self._tx.__aenter__()
+
+    async def __aexit__(self, *exc_info):
+        return await self._tx.__aexit__(*exc_info)
+
+
+class DBSession:
+    """
+    Request-scoped handle on a pooled connection.
+
+    Stands in for ``asyncpg.Connection`` in repositories, but only acquires
+    from the pool on the first query, so requests that never reach the
+    database (cache hits, validation errors) never take a connection. The
+    connection goes back to the pool when the handler returns, or earlier
+    via ``release()`` once a handler is done with the database, e.g.
+    before a long render.
+    """
+
+    def __init__(self, replica: bool = False):
+        self.replica = replica
+        self._conn: Optional[asyncpg.Connection] = None
+
+    @property
+    def acquired(self) -> bool:
+        return self._conn is not None
+
+    async def _ensure(self) -> asyncpg.Connection:
+        if self._conn is None:
+            self._conn = await _acquire_timed(self.replica)
+        return self._conn
+
+    async def release(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await (read_pool if self.replica else pool).release(conn)
+
+    async def execute(self, query: str, *args: Any, **kwargs: Any) -> str:
+        return await (await self._ensure()).execute(query, *args, **kwargs)
+
+    async def executemany(self, command: str, args, **kwargs: Any) -> None:
+        return await (await self._ensure()).executemany(command, args, **kwargs)
+
+    async def fetch(self, query: str, *args: Any, **kwargs: Any):
+        return await (await self._ensure()).fetch(query, *args, **kwargs)
+
+    async def fetchrow(self, query: str, *args: Any, **kwargs: Any):
+        return await (await self._ensure()).fetchrow(query, *args, **kwargs)
+
+    async def fetchval(self, query: str, *args: Any, **kwargs: Any):
+        return await (await self._ensure()).fetchval(query, *args, **kwargs)
+
+    def transaction(self, **kwargs: Any) -> _LazyTransaction:
+        return _LazyTransaction(self, kwargs)
+
+    def cursor(self, query: str, *args: Any, **kwargs: Any):
+        # Cursors only live inside a transaction, which has already acquired
+        if self._conn is None:
+            raise RuntimeError("cursor() requires an open transaction")
+        return self._conn.cursor(query, *args, **kwargs)
+
+
+async def get_db_conn() -> AsyncGenerator[DBSession, None]:
+    """
+    Per-request DB session. Declare it as
+    ``Depends(get_db_conn, scope="function")`` so the connection is returned
+    to the pool when the handler returns rather than after the response
+    has been sent.
+    """
+    session = DBSession()
+    try:
+        yield session
+    finally:
+        await session.release()
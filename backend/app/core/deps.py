@@ -1,8 +1,29 @@
+from typing import AsyncGenerator
+
 from fastapi import Depends, HTTPException, status
 
+from . import database
+from .database import DBSession, get_db_conn
+from .config import settings
+from .response_cache import response_cache
 from .security import get_current_user
 
 
+async def use_replica_for(user_id: int) -> bool:
+    """
+    Whether this user's reads may be served by the replica right now.
+
+    Not within READ_REPLICA_PIN_SECONDS of their last write: the window
+    starts when the write's repository bumps the user's shared generation
+    (after commit), so it holds across workers and only for real writes.
+    """
+    if database.read_pool is None:
+        return False
+    return not await response_cache.written_within(
+        user_id, settings.READ_REPLICA_PIN_SECONDS
+    )
+
+
 async def get_current_active_user(
     current_user: dict = Depends(get_current_user)
 ) -> dict:
@@ -14,6 +35,29 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_read_conn(
+    current_user: dict = Depends(get_current_user),
+    conn: DBSession = Depends(get_db_conn, scope="function"),
+) -> AsyncGenerator[DBSession, None]:
+    """
+    DB session for read-only endpoints.
+
+    Served by the read replica when DATABASE_READ_URL is set, unless the
+    user wrote within the last READ_REPLICA_PIN_SECONDS, in which case the
+    primary session is used so they see their own changes. Declare it as
+    ``Depends(get_read_conn, scope="function")``.
+    """
+    if not await use_replica_for(current_user["id"]):
+        yield conn
+        return
+
+    session = DBSession(replica=True)
+    try:
+        yield session
+    finally:
+        await session.release()
+
+
 async def get_current_active_superuser(
     current_user: dict = Depends(get_current_active_user)
 ) -> dict:
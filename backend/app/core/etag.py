@@ -0,0 +1,73 @@
+"""
+Conditional GET support for per-user read endpoints.
+
+The ETag is derived from the user's response-cache data version (which
+every committed write bumps) plus the request path and query, so it can
+be computed, and a matching ``If-None-Match`` answered with 304, with one
+counter lookup and before the handler runs any query. The version lives in
+Postgres (``cache_generations``), so every API worker computes the same tag
+and a write handled by one worker invalidates tags served by the others.
+"""
+
+import hashlib
+
+from fastapi import Depends, Request, Response
+from fastapi.responses import Response as PlainResponse
+
+from .metrics import metrics
+from .response_cache import response_cache
+from .security import get_current_user
+
+
+class NotModified(Exception):
+    """Raised by ``conditional_get`` when the client's copy is current."""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+        super().__init__(etag)
+
+
+async def not_modified_handler(request: Request, exc: NotModified):
+    return PlainResponse(
+        status_code=304,
+        headers={"ETag": exc.etag, "Cache-Control": "private, no-cache"},
+    )
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2) against an If-None-Match value."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+) -> None:
+    """
+    Tag the response with a weak ETag, or short-circuit with 304.
+
+    Add it to a route with ``dependencies=[Depends(conditional_get)]``. Only
+    use it on endpoints whose payload depends solely on data that bumps the
+    response-cache version.
+    """
+    version = await response_cache.data_version(current_user["id"])
+    query = "&".join(sorted(request.url.query.split("&")))
+    digest = hashlib.sha1(
+        f"{current_user['id']}:{version}:{request.url.path}?{query}".encode()
+    ).hexdigest()[:20]
+    etag = f'W/"{digest}"'
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        metrics.inc("http.not_modified", path=request.scope["route"].path)
+        raise NotModified(etag)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
@@ -5,19 +5,25 @@ Features:
 - Structured JSON output (one JSON object per line)
 - Automatic PII/sensitive data redaction
 - Request correlation via ContextVar (no argument passing needed)
-- Non-blocking async-safe logging
+- Non-blocking: callers only enqueue records; formatting, redaction and
+  file/stdout I/O run on a background QueueListener thread
 """
 
+import atexit
 import json
 import logging
 import logging.config
 import logging.handlers
+import queue
 import re
+import sys
 import traceback
 from contextvars import ContextVar
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+from .metrics import metrics
 
 # ==============================================================================
 # LOG FILE CONFIGURATION
@@ -27,6 +33,9 @@ LOG_DIR = Path(__file__).parent.parent.parent / "logs"
 LOG_FILE = LOG_DIR / "app.log"
 LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
 LOG_BACKUP_COUNT = 5
+# Records waiting for the listener thread; beyond this new records are dropped
+# (and counted as ``logging.dropped``) rather than stalling the event loop
+LOG_QUEUE_SIZE = 10_000
 
 # ==============================================================================
 # REQUEST CONTEXT
@@ -140,13 +149,13 @@ class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format the log record as a JSON string."""
         log_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "message": record.getMessage(),
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
-            "request_id": request_id_ctx.get(),
+            "request_id": getattr(record, "request_id", None) or request_id_ctx.get(),
             "logger": record.name,
         }
 
@@ -182,6 +191,7 @@ class JSONFormatter(logging.Formatter):
                 "threadName",
                 "taskName",
                 "message",
+                "request_id",
             }
         }
         if extra_fields:
@@ -201,100 +211,159 @@ class JSONFormatter(logging.Formatter):
         }
 
 
+# ==============================================================================
+# QUEUE HANDLER
+# ==============================================================================
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the background listener without formatting them.
+
+    The stock QueueHandler formats the record on the calling thread; here
+    that work (JSON encoding, PII regexes) is left to the listener, and only
+    the request ID is captured since the ContextVar is not visible from the
+    listener thread. Message args are rendered later, so they must not be
+    mutated after the logging call.
+
+    When the queue is full the record is dropped and counted instead of
+    blocking the caller.
+    """
+
+    def __init__(self, queue: queue.Queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.__dict__.setdefault("request_id", request_id_ctx.get())
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            metrics.inc("logging.dropped")
+
+
 # ==============================================================================
 # LOGGING SETUP
 # ==============================================================================
 
 
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
 def setup_logging(level: str = "INFO") -> logging.Logger:
     """
     Configure centralized structured JSON logging.
 
+    Every logger writes to a single bounded queue; a QueueListener thread
+    applies the PII filter, formats and writes to stdout and the rotating
+    log file. Only ``fintrack.*`` records go to the file.
+
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
 
     Returns:
         The main application logger instance
     """
+    global _listener
+    stop_logging()
+    level = level.upper()
+
+    # Ensure log directory exists
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+    console = logging.StreamHandler(sys.stdout)
+    log_file = logging.handlers.RotatingFileHandler(
+        str(LOG_FILE),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    for handler in (console, log_file):
+        handler.setLevel(level)
+        handler.setFormatter(JSONFormatter())
+        handler.addFilter(PIIFilter())
+    log_file.addFilter(logging.Filter("fintrack"))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
     log_config = {
         "version": 1,
         "disable_existing_loggers": False,
-        "filters": {
-            "pii_filter": {
-                "()": PIIFilter,
-            },
-        },
-        "formatters": {
-            "json": {
-                "()": JSONFormatter,
-            },
-        },
         "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": level.upper(),
-                "formatter": "json",
-                "filters": ["pii_filter"],
-                "stream": "ext://sys.stdout",
-            },
-            "file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "level": level.upper(),
-                "formatter": "json",
-                "filters": ["pii_filter"],
-                "filename": str(LOG_FILE),
-                "maxBytes": LOG_MAX_BYTES,
-                "backupCount": LOG_BACKUP_COUNT,
-                "encoding": "utf-8",
+            "queue": {
+                "()": LogQueueHandler,
+                "queue": log_queue,
             },
         },
         "loggers": {
             # Main application logger
             "fintrack": {
-                "level": level.upper(),
-                "handlers": ["console", "file"],
+                "level": level,
+                "handlers": ["queue"],
                 "propagate": False,
             },
             # Silence noisy third-party loggers
             "uvicorn": {
                 "level": "WARNING",
-                "handlers": ["console"],
+                "handlers": ["queue"],
                 "propagate": False,
             },
             "uvicorn.access": {
                 "level": "WARNING",
-                "handlers": ["console"],
+                "handlers": ["queue"],
                 "propagate": False,
             },
             "uvicorn.error": {
                 "level": "WARNING",
-                "handlers": ["console"],
+                "handlers": ["queue"],
                 "propagate": False,
             },
             "asyncpg": {
                 "level": "WARNING",
-                "handlers": ["console"],
+                "handlers": ["queue"],
                 "propagate": False,
             },
             "httpx": {
                 "level": "WARNING",
-                "handlers": ["console"],
+                "handlers": ["queue"],
                 "propagate": False,
             },
         },
         "root": {
             "level": "INFO",
-            "handlers": ["console"],
+            "handlers": ["queue"],
         },
     }
 
-    # Ensure log directory exists
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-
     logging.config.dictConfig(log_config)
 
+    _listener = logging.handlers.QueueListener(
+        log_queue, console, log_file, respect_handler_level=True
+    )
+    _listener.start()
+
     return logging.getLogger("fintrack")
 
 
+def stop_logging() -> None:
+    """
+    Write out any queued records and stop the listener thread.
+
+    Runs at interpreter exit. Loggers keep their queue handler, so records
+    logged after this are never written until ``setup_logging()`` runs again.
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
 # Initialize the logger on module import
 logger = setup_logging()
+atexit.register(stop_logging)
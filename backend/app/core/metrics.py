@@ -0,0 +1,117 @@
+"""
+Minimal in-process metrics registry.
+
+Counters, histograms and callback gauges kept in memory and exposed as a
+JSON snapshot at ``GET /admin/metrics``. Values are per process and reset
+on restart; this is for spotting trends (cache hit rate, pool pressure),
+not long-term storage.
+
+Usage:
+    from backend.app.core.metrics import metrics
+
+    metrics.inc("receipt_cache.hit", tier="memory")
+    metrics.observe("db.pool.acquire_seconds", elapsed)
+    metrics.register_gauge("db.pool.in_use", lambda: pool.get_size() - pool.get_idle_size())
+"""
+
+import bisect
+import threading
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _key(name: str, labels: Dict[str, str]) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{rendered}}}"
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        # The last count is the overflow bucket, reported as +Inf below
+        for bound, n in zip(self.buckets, self.counts[:-1], strict=True):
+            cumulative += n
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "avg": self.sum / self.count if self.count else 0.0,
+            "buckets": buckets,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: Optional[Sequence[float]] = None,
+        **labels: str,
+    ) -> None:
+        """Record ``value`` in a histogram; ``buckets`` applies on first use."""
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(buckets or DEFAULT_BUCKETS)
+                self._histograms[key] = histogram
+            histogram.observe(value)
+
+    def register_gauge(self, name: str, fn: Callable[[], float]) -> None:
+        """Register a callback sampled at snapshot time."""
+        with self._lock:
+            self._gauges[name] = fn
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: h.snapshot() for k, h in self._histograms.items()}
+            gauges = dict(self._gauges)
+
+        sampled = {}
+        for name, fn in gauges.items():
+            try:
+                sampled[name] = fn()
+            except Exception:
+                sampled[name] = None
+
+        return {"counters": counters, "gauges": sampled, "histograms": histograms}
+
+
+metrics = MetricsRegistry()
@@ -3,7 +3,7 @@ Request correlation and logging middleware for FastAPI.
 
 Features:
 - Automatic request ID generation/propagation (X-Request-ID header)
-- Structured JSON logging for request lifecycle events
+- One structured JSON log record per request
 - Exception handling with full stack trace logging
 - PII-safe logging (skips body for auth endpoints)
 """
@@ -31,7 +31,7 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     Responsibilities:
     1. Extract or generate X-Request-ID for request correlation
     2. Store request ID in ContextVar for global access
-    3. Log request_started and request_finished events
+    3. Log a single request_finished (or request_error) event per request
     4. Handle unhandled exceptions with full stack trace
     5. Add X-Request-ID to response headers
     """
@@ -47,24 +47,11 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         client_ip = request.client.host if request.client else "unknown"
         method = request.method
         path = request.url.path
+        query_params = str(request.query_params) if request.query_params else None
 
         start_time = time.perf_counter()
 
         try:
-            # Log request start
-            logger.info(
-                "Request started",
-                extra={
-                    "event": "request_started",
-                    "method": method,
-                    "path": path,
-                    "client_ip": client_ip,
-                    "query_params": (
-                        str(request.query_params) if request.query_params else None
-                    ),
-                },
-            )
-
             # Process the request
             response = await call_next(request)
 
@@ -81,6 +68,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     "method": method,
                     "path": path,
                     "status_code": response.status_code,
+                    "client_ip": client_ip,
+                    "query_params": query_params,
                     "process_time_ms": round(process_time_ms, 2),
                 },
             )
@@ -101,6 +90,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     "event": "request_error",
                     "method": method,
                     "path": path,
+                    "client_ip": client_ip,
+                    "query_params": query_params,
                     "process_time_ms": round(process_time_ms, 2),
                     "error_type": type(exc).__name__,
                     "error_message": str(exc),
@@ -0,0 +1,68 @@
+"""
+Opaque keyset (cursor) pagination helpers.
+
+A cursor encodes the sort key of the last row on a page, e.g.
+``(transaction_date, id)``, so the next page can be fetched with a row
+comparison (``WHERE (t.transaction_date, t.id) < ($n, $m)``) that walks the
+matching composite index instead of scanning and discarding OFFSET rows.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Optional, Tuple
+
+
+def encode_cursor(*values) -> str:
+    """Encode sort-key values (dates, datetimes, ints, strs) as an opaque cursor."""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_payload(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(payload, list):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def _decode_pair(
+    cursor: Optional[str], parse: Callable[[str], Any]
+) -> Optional[Tuple[Any, int]]:
+    if not cursor:
+        return None
+    payload = _decode_payload(cursor)
+    try:
+        key, row_id = payload
+        return parse(key), int(row_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def decode_date_id_cursor(cursor: Optional[str]) -> Optional[Tuple[date, int]]:
+    """
+    Decode a ``(date, id)`` cursor.
+
+    Returns None for an empty cursor (first page).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    return _decode_pair(cursor, date.fromisoformat)
+
+
+def decode_datetime_id_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode a ``(datetime, id)`` cursor, e.g. ``(created_at, id)``.
+
+    Returns None for an empty cursor (first page).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    return _decode_pair(cursor, datetime.fromisoformat)
@@ -0,0 +1,209 @@
+"""
+Per-user versioned response cache.
+
+Every user has a generation counter that is bumped after any committed
+write to their transactions, wallets or categories (plus a global
+generation for admin changes to shared categories). Cached payloads are
+keyed by (user, endpoint, params, generation), so a write never has to
+find and delete stale entries: it bumps the counter and old keys simply
+stop being requested and age out of the LRU.
+
+Storage goes through ``CacheBackend``. ``PostgresCacheBackend`` keeps the
+counters in the ``cache_generations`` table, so a write handled by one API
+worker changes the version every other worker reads. Payloads stay in
+process memory: since their keys carry the generation, a worker can only
+ever miss on a newer version, never serve an outdated one.
+"""
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Sequence
+
+import asyncpg
+
+from . import database
+from .cache import TTLCache
+from .config import settings
+from .metrics import metrics
+
+
+class CacheBackend(ABC):
+    # Prefixed to versions; a backend whose counters can restart sets a
+    # fresh value per start so versions (and ETags) never repeat
+    epoch: str = ""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    async def get_counters(
+        self, keys: Sequence[str], conn: Optional[asyncpg.Connection] = None
+    ) -> List[int]:
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str, conn: Optional[asyncpg.Connection] = None) -> int:
+        ...
+
+    @abstractmethod
+    async def changed_within(
+        self, key: str, seconds: float, conn: Optional[asyncpg.Connection] = None
+    ) -> bool:
+        ...
+
+
+@asynccontextmanager
+async def _connection(
+    conn: Optional[asyncpg.Connection],
+) -> AsyncIterator[asyncpg.Connection]:
+    if conn is not None:
+        yield conn
+        return
+    async with database.acquire() as acquired:
+        yield acquired
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    Counters in Postgres, shared by all workers; payloads in process memory.
+
+    Counter calls use ``conn`` when given (writers pass the connection that
+    made the change, so the bump cannot fail for want of a pool slot after
+    the write committed) and otherwise borrow a pool connection briefly.
+    """
+
+    epoch = "pg"
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._values: TTLCache[Any] = TTLCache(max_entries, ttl)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._values.get(key)
+
+    async def set(self, key: str, value: Any) -> None:
+        self._values.set(key, value)
+
+    async def get_counters(
+        self, keys: Sequence[str], conn: Optional[asyncpg.Connection] = None
+    ) -> List[int]:
+        async with _connection(conn) as c:
+            rows = await c.fetch(
+                "SELECT scope, generation FROM cache_generations WHERE scope = ANY($1::text[])",
+                list(keys),
+            )
+        found = {row["scope"]: row["generation"] for row in rows}
+        return [found.get(key, 0) for key in keys]
+
+    async def incr(self, key: str, conn: Optional[asyncpg.Connection] = None) -> int:
+        async with _connection(conn) as c:
+            return await c.fetchval(
+                """
+                INSERT INTO cache_generations AS g (scope, generation, changed_at)
+                VALUES ($1, 1, clock_timestamp())
+                ON CONFLICT (scope) DO UPDATE
+                SET generation = g.generation + 1, changed_at = EXCLUDED.changed_at
+                RETURNING generation
+                """,
+                key,
+            )
+
+    async def changed_within(
+        self, key: str, seconds: float, conn: Optional[asyncpg.Connection] = None
+    ) -> bool:
+        async with _connection(conn) as c:
+            return await c.fetchval(
+                """
+                SELECT EXISTS (
+                    SELECT 1 FROM cache_generations
+                    WHERE scope = $1
+                      AND changed_at > clock_timestamp() - make_interval(secs => $2)
+                )
+                """,
+                key,
+                seconds,
+            )
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class ResponseCache:
+    GLOBAL_KEY = "gen:global"
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+
+    async def data_version(
+        self, user_id: int, conn: Optional[asyncpg.Connection] = None
+    ) -> str:
+        """Opaque token that changes whenever the user's data may have."""
+        global_gen, user_gen = await self.backend.get_counters(
+            [self.GLOBAL_KEY, f"gen:user:{user_id}"], conn
+        )
+        return f"{self.backend.epoch}.{global_gen}.{user_gen}"
+
+    async def bump(self, user_id: int, conn: Optional[asyncpg.Connection] = None) -> None:
+        """
+        Invalidate everything cached for ``user_id``. Call after the write,
+        on the connection that made it.
+        """
+        await self.backend.incr(f"gen:user:{user_id}", conn)
+
+    async def written_within(
+        self, user_id: int, seconds: float, conn: Optional[asyncpg.Connection] = None
+    ) -> bool:
+        """
+        Whether the user's generation was bumped in the last ``seconds``.
+
+        Bumps happen right after each write, so this is also the write clock
+        for read-your-writes routing to the replica.
+        """
+        return await self.backend.changed_within(f"gen:user:{user_id}", seconds, conn)
+
+    async def bump_global(self, conn: Optional[asyncpg.Connection] = None) -> None:
+        """Invalidate every user's cache, e.g. after shared category changes."""
+        await self.backend.incr(self.GLOBAL_KEY, conn)
+
+    async def get_or_compute(
+        self,
+        user_id: int,
+        endpoint: str,
+        params: dict,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Return the cached payload for this request, computing it on a miss.
+
+        The version is read before computing, so a write that commits while
+        we query stores the result under the already-outdated version.
+        """
+        version = await self.data_version(user_id)
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        key = f"resp:{user_id}:{endpoint}:{version}:{digest}"
+
+        cached = await self.backend.get(key)
+        if cached is not None:
+            metrics.inc("response_cache.hit", endpoint=endpoint)
+            return cached
+
+        metrics.inc("response_cache.miss", endpoint=endpoint)
+        value = await compute()
+        await self.backend.set(key, value)
+        return value
+
+
+response_cache = ResponseCache(
+    PostgresCacheBackend(
+        max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+        ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+    )
+)
@@ -0,0 +1,52 @@
+"""
+orjson-backed JSON responses.
+
+``FastJSONResponse`` is the application's default response class. orjson
+serializes dates, datetimes and UUIDs natively; ``_default`` adds the types
+our rows carry that it does not know (``Decimal``, ``asyncpg.Record``).
+
+Routes with a ``response_model`` are still serialized by pydantic (FastAPI
+dumps them straight to JSON bytes). Large list endpoints that do not need
+per-row validation can return ``raw_json(...)`` with repository rows as-is,
+which skips both model construction and ``jsonable_encoder``.
+"""
+
+from decimal import Decimal
+from typing import Any, Optional
+
+import asyncpg
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        # Matches the float() conversions the routers have always done
+        return float(obj)
+    if isinstance(obj, asyncpg.Record):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def raw_json(
+    content: Any, response: Optional[Response] = None, status_code: int = 200
+) -> FastJSONResponse:
+    """
+    Serialize ``content`` directly, bypassing response-model validation.
+
+    FastAPI drops headers set by dependencies (e.g. ``ETag``) when a route
+    returns a ``Response`` itself, so pass the route's ``response`` to carry
+    them over.
+    """
+    result = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        for name, value in response.headers.items():
+            if name != "content-length":
+                result.headers[name] = value
+    return result
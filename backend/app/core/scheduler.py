@@ -0,0 +1,300 @@
+"""
+In-process scheduler for periodic maintenance jobs.
+
+Jobs run on the API's event loop, either every ``interval`` seconds or on a
+five-field cron expression (``"minute hour day month weekday"``, UTC), with
+optional random ``jitter`` added to each run and a per-run ``timeout``.
+
+Several uvicorn workers each run a scheduler; one of them becomes leader by
+holding a Postgres session advisory lock on a dedicated connection, opened
+outside the request pool so it never takes a slot from request handling.
+Jobs marked ``leader_only`` (the default) run only on the leader, so
+database upkeep happens once per cluster rather than once per worker. If
+the leader dies its connection closes, the lock is released and another
+worker takes over at its next leadership check.
+
+Usage:
+    scheduler.add_job("reap_tokens", reaper.reap, interval=3600, jitter=60)
+    scheduler.add_job("partitions", maintain, cron="15 0 * * *", run_at_start=True)
+    scheduler.start()          # lifespan startup
+    await scheduler.shutdown() # lifespan shutdown
+
+Run status is reported by ``snapshot()`` (``GET /admin/jobs``).
+"""
+
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import asyncpg
+
+from .config import settings
+from .logging_config import logger
+from .metrics import metrics
+
+_LEADER_LOCK_KEY = "fintrack_scheduler_leader"
+_LEADER_CONNECT_TIMEOUT = 10.0
+
+
+class CronSchedule:
+    """A standard five-field cron expression evaluated in UTC."""
+
+    # Weekday 0 and 7 are both Sunday
+    _RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse(f, lo, hi) for f, (lo, hi) in zip(fields, self._RANGES, strict=True)
+        )
+        self.weekdays = {v % 7 for v in weekdays}
+        # Cron ORs day-of-month and day-of-week when both are restricted
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(spec: str, lo: int, hi: int) -> Set[int]:
+        values = set()
+        for part in spec.split(","):
+            base, _, step = part.partition("/")
+            if base == "*":
+                start, end = lo, hi
+            elif "-" in base:
+                start, end = (int(v) for v in base.split("-", 1))
+            else:
+                start = end = int(base)
+            if not lo <= start <= end <= hi or (step and int(step) < 1):
+                raise ValueError(f"Invalid cron field: {part!r}")
+            values.update(range(start, end + 1, int(step or 1)))
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first matching minute strictly after ``moment`` (aware, UTC)."""
+        candidate = moment.astimezone(timezone.utc).replace(second=0, microsecond=0)
+        candidate += timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never fires: {self.expression!r}")
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], Awaitable[object]]
+    interval: Optional[float] = None
+    cron: Optional[CronSchedule] = None
+    jitter: float = 0.0
+    timeout: float = 300.0
+    leader_only: bool = True
+    run_at_start: bool = False
+    # Run status
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    running: bool = False
+    last_started: Optional[datetime] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    last_result: Optional[str] = None
+    next_run: Optional[datetime] = None
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def seconds_until_next(self, first: bool) -> float:
+        now = datetime.now(timezone.utc)
+        if first and self.run_at_start:
+            delay = 0.0
+        elif self.cron is not None:
+            delay = (self.cron.next_after(now) - now).total_seconds()
+        else:
+            delay = self.interval
+        delay += random.uniform(0, self.jitter) if self.jitter else 0.0
+        self.next_run = now + timedelta(seconds=delay)
+        return delay
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "schedule": self.cron.expression if self.cron else f"every {self.interval:g}s",
+            "leader_only": self.leader_only,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started": self.last_started,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "last_result": self.last_result,
+            "next_run": self.next_run,
+        }
+
+
+class Scheduler:
+    def __init__(self, leader_check_interval: float = 15.0):
+        self.leader_check_interval = leader_check_interval
+        self.jobs: Dict[str, Job] = {}
+        self.is_leader = False
+        self._leader_conn: Optional[asyncpg.Connection] = None
+        self._leader_known = asyncio.Event()
+        self._leader_task: Optional[asyncio.Task] = None
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[object]],
+        interval: Optional[float] = None,
+        cron: Optional[str] = None,
+        jitter: float = 0.0,
+        timeout: float = 300.0,
+        leader_only: bool = True,
+        run_at_start: bool = False,
+    ) -> Job:
+        if (interval is None) == (cron is None):
+            raise ValueError("A job needs exactly one of interval or cron")
+        if name in self.jobs:
+            raise ValueError(f"Job {name!r} is already registered")
+        job = Job(
+            name=name,
+            func=func,
+            interval=interval,
+            cron=CronSchedule(cron) if cron else None,
+            jitter=jitter,
+            timeout=timeout,
+            leader_only=leader_only,
+            run_at_start=run_at_start,
+        )
+        self.jobs[name] = job
+        return job
+
+    async def run_job(self, job: Job) -> None:
+        """Run one job now, recording its status; never raises."""
+        if job.leader_only and not self.is_leader:
+            job.skipped += 1
+            return
+        job.running = True
+        job.last_started = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(job.func(), timeout=job.timeout)
+            job.last_error = None
+            job.last_result = None if result is None else str(result)
+        except asyncio.TimeoutError:
+            job.failures += 1
+            job.last_error = f"Timed out after {job.timeout:g}s"
+            metrics.inc("scheduler.job.failures", job=job.name)
+            logger.error(f"Scheduled job {job.name} timed out after {job.timeout:g}s")
+        except Exception as exc:
+            job.failures += 1
+            job.last_error = f"{type(exc).__name__}: {exc}"
+            metrics.inc("scheduler.job.failures", job=job.name)
+            logger.error(f"Scheduled job {job.name} failed: {exc}")
+        finally:
+            job.running = False
+            job.runs += 1
+            job.last_duration = time.perf_counter() - started
+            metrics.observe("scheduler.job.seconds", job.last_duration, job=job.name)
+
+    async def _job_loop(self, job: Job) -> None:
+        await self._leader_known.wait()
+        first = True
+        while True:
+            await asyncio.sleep(job.seconds_until_next(first))
+            first = False
+            await self.run_job(job)
+
+    async def check_leadership(self) -> bool:
+        """Try to become (or confirm still being) the leader."""
+        try:
+            if self._leader_conn is None:
+                self._leader_conn = await asyncpg.connect(
+                    settings.DATABASE_URL, timeout=_LEADER_CONNECT_TIMEOUT
+                )
+            if self.is_leader:
+                await self._leader_conn.fetchval("SELECT 1", timeout=_LEADER_CONNECT_TIMEOUT)
+            else:
+                self.is_leader = await self._leader_conn.fetchval(
+                    "SELECT pg_try_advisory_lock(hashtext($1))",
+                    _LEADER_LOCK_KEY,
+                    timeout=_LEADER_CONNECT_TIMEOUT,
+                )
+                if self.is_leader:
+                    logger.info(f"Scheduler leadership acquired by worker {os.getpid()}")
+                else:
+                    # Followers do not keep a connection open
+                    await self._release_leader_conn()
+        except Exception as exc:
+            if self.is_leader:
+                logger.warning(f"Scheduler leadership lost: {exc}")
+            self.is_leader = False
+            await self._release_leader_conn(terminate=True)
+        return self.is_leader
+
+    async def _release_leader_conn(self, terminate: bool = False) -> None:
+        conn, self._leader_conn = self._leader_conn, None
+        if conn is None:
+            return
+        if terminate:
+            conn.terminate()
+            return
+        try:
+            # Closing the session also releases the advisory lock
+            await conn.close(timeout=_LEADER_CONNECT_TIMEOUT)
+        except Exception:
+            conn.terminate()
+
+    async def _leadership_loop(self) -> None:
+        while True:
+            await self.check_leadership()
+            self._leader_known.set()
+            await asyncio.sleep(self.leader_check_interval)
+
+    def start(self) -> None:
+        self._leader_known = asyncio.Event()
+        self._leader_task = asyncio.create_task(self._leadership_loop(), name="scheduler-leader")
+        for job in self.jobs.values():
+            job._task = asyncio.create_task(self._job_loop(job), name=f"job-{job.name}")
+
+    async def shutdown(self) -> None:
+        tasks: List[asyncio.Task] = [job._task for job in self.jobs.values() if job._task]
+        if self._leader_task:
+            tasks.append(self._leader_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job._task = None
+            job.next_run = None
+        self._leader_task = None
+        self.is_leader = False
+        await self._release_leader_conn()
+
+    def snapshot(self) -> dict:
+        return {
+            "worker_pid": os.getpid(),
+            "is_leader": self.is_leader,
+            "jobs": [job.snapshot() for job in self.jobs.values()],
+        }
+
+
+scheduler = Scheduler(leader_check_interval=settings.SCHEDULER_LEADER_CHECK_SECONDS)
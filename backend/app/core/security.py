@@ -8,10 +8,10 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-import asyncpg
-
+from .cache import TTLCache
 from .config import settings
-from .database import get_db_conn
+from .database import DBSession, get_db_conn
+from .metrics import metrics
 
 pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=12, deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
@@ -89,8 +89,26 @@ def hash_token(token: str) -> str:
     return hashlib.sha256(token.encode()).hexdigest()
 
 
+# --- Principal Cache ---
+
+# Authenticated user rows keyed by user id. Entries live for a few seconds
+# so steady-state requests authenticate without touching the database;
+# writes that change a user's row call invalidate_principal() right away,
+# and the TTL bounds staleness on other worker processes.
+principal_cache: TTLCache[dict] = TTLCache(
+    settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+    settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop a cached principal after its users row changed."""
+    principal_cache.delete(int(user_id))
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), conn: asyncpg.Connection = Depends(get_db_conn)
+    token: str = Depends(oauth2_scheme),
+    conn: DBSession = Depends(get_db_conn, scope="function"),
 ) -> dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -106,12 +124,24 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
 
+    user_id = int(user_id)
+
+    user = principal_cache.get(user_id)
+    if user is not None:
+        metrics.inc("auth.principal_cache.hit")
+        return dict(user)
+
+    # The session is lazy, so only a miss takes a connection (which the
+    # handler then reuses)
+    metrics.inc("auth.principal_cache.miss")
     user = await conn.fetchrow(
         "SELECT id, email, username, is_superuser, is_active, created_at FROM users WHERE id = $1",
-        int(user_id),
+        user_id,
     )
 
     if user is None:
         raise credentials_exception
 
+    user = dict(user)
+    principal_cache.set(user_id, user)
     return dict(user)
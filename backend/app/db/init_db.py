@@ -1,10 +1,11 @@
 import asyncio
 import asyncpg
 import os
-from pathlib import Path
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 
+from .migrate import apply_migrations
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -40,14 +41,12 @@ async def init_database():
     conn = await asyncpg.connect(DATABASE_URL)
     
     try:
-        # Read and execute schema.sql
-        schema_path = Path(__file__).parent / "schema.sql"
-        with open(schema_path, "r") as f:
-            schema_sql = f.read()
-        
-        print("Creating tables...")
-        await conn.execute(schema_sql)
-        print("Tables created successfully!")
+        print("Applying migrations...")
+        applied = await apply_migrations(conn)
+        if applied:
+            print(f"Applied {len(applied)} migration(s): {', '.join(m.title for m in applied)}")
+        else:
+            print("Schema is up to date.")
         
         # Check if categories table is empty
         count = await conn.fetchval("SELECT COUNT(*) FROM categories WHERE user_id IS NULL")
@@ -67,6 +66,29 @@ async def init_database():
         else:
             print(f"Categories already exist ({count} global categories found). Skipping seed.")
         
+        # Backfill analytics rollups for databases that predate them
+        needs_backfill = await conn.fetchval(
+            """
+            SELECT EXISTS (SELECT 1 FROM transactions)
+               AND NOT EXISTS (SELECT 1 FROM daily_user_category_totals)
+            """
+        )
+        if needs_backfill:
+            print("Backfilling daily analytics rollups...")
+            await conn.execute(
+                """
+                INSERT INTO daily_user_category_totals
+                    (user_id, day, wallet_id, category_id, type, is_system, total, txn_count)
+                SELECT t.user_id, t.transaction_date, t.wallet_id, t.category_id, t.type,
+                       c.is_system, SUM(t.amount), COUNT(*)
+                FROM transactions t
+                JOIN categories c ON t.category_id = c.id
+                GROUP BY t.user_id, t.transaction_date, t.wallet_id, t.category_id, t.type, c.is_system
+                ON CONFLICT DO NOTHING
+                """
+            )
+            print("Rollups backfilled! Use backend.app.db.rebuild_rollups to rebuild later.")
+
         # Check if superuser exists
         superuser = await conn.fetchrow(
             "SELECT id FROM users WHERE email = $1",
@@ -0,0 +1,343 @@
+"""
+Apply the numbered SQL migrations in ``app/db/migrations``.
+
+Usage:
+    python -m backend.app.db.migrate                 # apply everything pending
+    python -m backend.app.db.migrate --target 3      # stop after version 3
+    python -m backend.app.db.migrate plan            # dry run: show what would run
+    python -m backend.app.db.migrate status          # applied versions and timings
+    python -m backend.app.db.migrate --allow-changed # apply despite edited files
+
+Migration files are named ``NNNN_description.sql`` and are split into steps
+by ``-- step: <label>`` lines; each step is timed. By default a migration
+runs in a single transaction together with its ``schema_migrations`` row.
+
+A file containing ``-- migrate: no-transaction`` instead runs each step on
+its own in autocommit mode. That is required for ``CREATE INDEX
+CONCURRENTLY``, which must then be the only statement in its step. Such a
+migration is only recorded once every step has succeeded, so after a
+failure it is re-run from the start; write its steps to be idempotent
+(``IF NOT EXISTS``). An index left INVALID by an interrupted
+``CREATE INDEX CONCURRENTLY IF NOT EXISTS`` is dropped before the step is
+retried, since ``IF NOT EXISTS`` would otherwise skip it.
+
+Applied migrations must not be edited: ``up`` refuses to run while an
+applied file's checksum differs from the one recorded, since the edit would
+otherwise be skipped silently. Put the change in a new migration instead.
+
+Note that ``CONCURRENTLY`` is not available on a partitioned table such as
+``transactions``: build the index concurrently on each partition, then
+create it ``ON ONLY transactions`` and attach the partition indexes.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import asyncpg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+logger = logging.getLogger("fintrack.migrations")
+
+_FILENAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+_STEP = re.compile(r"^--\s*step:\s*(.+?)\s*$", re.MULTILINE)
+_NO_TRANSACTION = re.compile(r"^--\s*migrate:\s*no-transaction\s*$", re.MULTILINE)
+_CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)",
+    re.IGNORECASE,
+)
+
+# Held for the whole run so two deploys cannot apply the same migration
+_LOCK_KEY = "schema_migrations"
+
+
+class MigrationError(Exception):
+    pass
+
+
+@dataclass
+class Step:
+    label: str
+    sql: str
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    transactional: bool
+    steps: List[Step]
+    checksum: str
+
+    @property
+    def title(self) -> str:
+        return f"{self.version:04d}_{self.name}"
+
+
+def _is_blank(sql: str) -> bool:
+    return all(
+        not line.strip() or line.strip().startswith("--") for line in sql.splitlines()
+    )
+
+
+def parse_migration(path: Path) -> Migration:
+    match = _FILENAME.match(path.name)
+    if not match:
+        raise ValueError(f"Migration file name must look like 0001_name.sql: {path.name}")
+
+    text = path.read_text()
+    markers = list(_STEP.finditer(text))
+    steps = []
+    if markers and not _is_blank(text[: markers[0].start()]):
+        steps.append(Step("main", text[: markers[0].start()]))
+    elif not markers:
+        steps.append(Step("main", text))
+    for i, marker in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+        steps.append(Step(marker.group(1), text[marker.end():end]))
+
+    return Migration(
+        version=int(match.group(1)),
+        name=match.group(2),
+        transactional=not _NO_TRANSACTION.search(text),
+        steps=[step for step in steps if not _is_blank(step.sql)],
+        checksum=hashlib.sha256(text.encode()).hexdigest(),
+    )
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations = sorted(
+        (parse_migration(path) for path in directory.glob("*.sql")),
+        key=lambda m: m.version,
+    )
+    seen = set()
+    for migration in migrations:
+        if migration.version in seen:
+            raise ValueError(f"Duplicate migration version {migration.version}")
+        seen.add(migration.version)
+    return migrations
+
+
+async def _ensure_table(conn: asyncpg.Connection) -> None:
+    await conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            duration_ms INTEGER NOT NULL
+        )
+        """
+    )
+
+
+async def applied_migrations(conn: asyncpg.Connection) -> Dict[int, dict]:
+    exists = await conn.fetchval("SELECT to_regclass('schema_migrations') IS NOT NULL")
+    if not exists:
+        return {}
+    rows = await conn.fetch(
+        "SELECT version, name, checksum, applied_at, duration_ms "
+        "FROM schema_migrations ORDER BY version"
+    )
+    return {row["version"]: dict(row) for row in rows}
+
+
+async def pending_migrations(
+    conn: asyncpg.Connection,
+    directory: Path = MIGRATIONS_DIR,
+    target: Optional[int] = None,
+) -> List[Migration]:
+    applied = await applied_migrations(conn)
+    return [
+        m for m in load_migrations(directory)
+        if m.version not in applied and (target is None or m.version <= target)
+    ]
+
+
+async def changed_migrations(
+    conn: asyncpg.Connection, directory: Path = MIGRATIONS_DIR
+) -> List[Migration]:
+    """Applied migrations whose file no longer matches the recorded checksum."""
+    applied = await applied_migrations(conn)
+    return [
+        m for m in load_migrations(directory)
+        if m.version in applied and applied[m.version]["checksum"].strip() != m.checksum
+    ]
+
+
+async def _drop_invalid_index(conn: asyncpg.Connection, sql: str) -> None:
+    for name in _CONCURRENT_INDEX.findall(sql):
+        invalid = await conn.fetchval(
+            """
+            SELECT NOT i.indisvalid
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = $1 AND c.relnamespace = current_schema()::regnamespace
+            """,
+            name,
+        )
+        if invalid:
+            logger.warning(f"  dropping invalid index {name} left by an earlier attempt")
+            await conn.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+async def _run_steps(conn: asyncpg.Connection, migration: Migration) -> None:
+    for step in migration.steps:
+        if not migration.transactional:
+            await _drop_invalid_index(conn, step.sql)
+        started = time.perf_counter()
+        await conn.execute(step.sql)
+        logger.info(f"  {step.label}: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+async def _apply_one(conn: asyncpg.Connection, migration: Migration) -> float:
+    mode = "" if migration.transactional else " (no transaction)"
+    logger.info(f"Applying {migration.title}{mode}")
+    started = time.perf_counter()
+
+    async def record() -> None:
+        await conn.execute(
+            """
+            INSERT INTO schema_migrations (version, name, checksum, duration_ms)
+            VALUES ($1, $2, $3, $4)
+            """,
+            migration.version,
+            migration.name,
+            migration.checksum,
+            round((time.perf_counter() - started) * 1000),
+        )
+
+    if migration.transactional:
+        async with conn.transaction():
+            await _run_steps(conn, migration)
+            await record()
+    else:
+        await _run_steps(conn, migration)
+        await record()
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Applied {migration.title} in {elapsed * 1000:.0f} ms")
+    return elapsed
+
+
+async def apply_migrations(
+    conn: asyncpg.Connection,
+    directory: Path = MIGRATIONS_DIR,
+    target: Optional[int] = None,
+    lock_timeout: Optional[str] = "10s",
+    allow_changed: bool = False,
+) -> List[Migration]:
+    """
+    Apply pending migrations in version order; returns the ones applied.
+
+    ``lock_timeout`` bounds how long DDL waits behind running queries, so a
+    migration fails fast instead of queueing every other query behind its
+    lock. Pass None for no limit (e.g. on an empty database).
+
+    Raises MigrationError if an applied file has been edited since, unless
+    ``allow_changed`` is set, in which case it only logs a warning.
+    """
+    await conn.execute("SELECT pg_advisory_lock(hashtext($1))", _LOCK_KEY)
+    try:
+        await _ensure_table(conn)
+        changed = ", ".join(m.title for m in await changed_migrations(conn, directory))
+        if changed and not allow_changed:
+            raise MigrationError(
+                f"Applied migrations changed since they ran: {changed}. "
+                "Revert the edit and add a new migration, or pass --allow-changed."
+            )
+        if changed:
+            logger.warning(f"Applied migrations changed since they ran: {changed}")
+        if lock_timeout:
+            await conn.execute(f"SET lock_timeout = '{lock_timeout}'")
+        pending = await pending_migrations(conn, directory, target)
+        for migration in pending:
+            await _apply_one(conn, migration)
+        return pending
+    finally:
+        # Must not mask the migration's own error; on a broken connection the
+        # session lock is gone with it anyway
+        try:
+            await conn.execute("RESET lock_timeout")
+            await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", _LOCK_KEY)
+        except Exception as exc:
+            logger.warning(f"Could not release the migration lock: {exc}")
+
+
+def format_plan(migrations: List[Migration]) -> str:
+    if not migrations:
+        return "Database is up to date."
+    lines = []
+    for migration in migrations:
+        mode = "transaction" if migration.transactional else "no transaction"
+        lines.append(f"{migration.title} ({mode})")
+        for step in migration.steps:
+            first = next(
+                line.strip() for line in step.sql.splitlines()
+                if line.strip() and not line.strip().startswith("--")
+            )
+            lines.append(f"  - {step.label}: {first[:70]}")
+    return "\n".join(lines)
+
+
+async def main(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(DATABASE_URL)
+    try:
+        if args.command == "plan":
+            print(format_plan(await pending_migrations(conn, target=args.target)))
+        elif args.command == "status":
+            applied = await applied_migrations(conn)
+            files = {m.version: m for m in load_migrations()}
+            for version in sorted(set(applied) | set(files)):
+                row, migration = applied.get(version), files.get(version)
+                title = migration.title if migration else f"{version:04d}_{row['name']}"
+                if row is None:
+                    state = "pending"
+                elif migration is None:
+                    state = "applied, file missing"
+                elif row["checksum"] != migration.checksum:
+                    state = "applied, file changed since"
+                else:
+                    state = "applied"
+                when = f" {row['applied_at']:%Y-%m-%d %H:%M} {row['duration_ms']} ms" if row else ""
+                print(f"{title:<40} {state}{when}")
+        else:
+            applied = await apply_migrations(
+                conn,
+                target=args.target,
+                lock_timeout=args.lock_timeout,
+                allow_changed=args.allow_changed,
+            )
+            print(f"Applied {len(applied)} migration(s).")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", nargs="?", default="up", choices=["up", "plan", "status"])
+    parser.add_argument("--target", type=int, default=None, help="Highest version to apply")
+    parser.add_argument(
+        "--lock-timeout", default="10s",
+        help="Give up on DDL that waits this long for a lock (default 10s)",
+    )
+    parser.add_argument(
+        "--allow-changed", action="store_true",
+        help="Apply pending migrations even if applied files were edited",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,217 @@
+-- Baseline: the schema as it stood when migrations were introduced (formerly
+-- app/db/schema.sql). Every statement is idempotent, so databases created
+-- from schema.sql are simply recorded as being at version 1.
+
+-- step: core tables
+-- Users table
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    username VARCHAR(100) NOT NULL,
+    password_hash VARCHAR(255),
+    google_id VARCHAR(255),
+    picture TEXT,
+    is_superuser BOOLEAN DEFAULT FALSE,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (google_id)
+);
+
+-- Wallets table
+CREATE TABLE IF NOT EXISTS wallets (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    name VARCHAR(100) NOT NULL,
+    balance NUMERIC(15, 2) DEFAULT 0.00,
+    icon VARCHAR(50) DEFAULT 'wallet',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Categories table (Global if user_id IS NULL, Private if user_id IS NOT NULL)
+CREATE TABLE IF NOT EXISTS categories (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    name VARCHAR(100) NOT NULL,
+    type VARCHAR(10) NOT NULL CHECK (type IN ('INCOME', 'EXPENSE')),
+    icon VARCHAR(50) DEFAULT 'default',
+    is_system BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (user_id, name, type)
+);
+
+-- step: transactions
+-- Transactions table, range-partitioned by year on transaction_date (the
+-- partition key must be part of the primary key). Yearly partitions are
+-- created by ensure_transaction_partition() below; rows outside every
+-- yearly partition land in transactions_default. Databases created before
+-- partitioning are converted with `python -m backend.app.db.partitions migrate`.
+CREATE TABLE IF NOT EXISTS transactions (
+    id SERIAL,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    wallet_id INTEGER NOT NULL REFERENCES wallets(id) ON DELETE CASCADE,
+    category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE RESTRICT,
+    amount NUMERIC(15, 2) NOT NULL,
+    type VARCHAR(10) NOT NULL CHECK (type IN ('INCOME', 'EXPENSE')),
+    transaction_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, transaction_date)
+) PARTITION BY RANGE (transaction_date);
+
+-- Create the partition for one calendar year, moving any of that year's rows
+-- out of the default partition first. Returns false if it already exists.
+CREATE OR REPLACE FUNCTION ensure_transaction_partition(p_year INTEGER)
+RETURNS BOOLEAN AS $$
+DECLARE
+    part_name TEXT := format('transactions_y%s', p_year);
+    lo DATE := make_date(p_year, 1, 1);
+    hi DATE := make_date(p_year + 1, 1, 1);
+    moved INTEGER;
+BEGIN
+    IF to_regclass(part_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    -- Serialize concurrent callers (several app processes starting at once)
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_transaction_partition'));
+    IF to_regclass(part_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    CREATE TEMP TABLE IF NOT EXISTS _partition_move (LIKE transactions) ON COMMIT DROP;
+    TRUNCATE _partition_move;
+    IF to_regclass('transactions_default') IS NOT NULL THEN
+        WITH gone AS (
+            DELETE FROM transactions_default
+            WHERE transaction_date >= lo AND transaction_date < hi
+            RETURNING id, user_id, wallet_id, category_id, amount, type,
+                      transaction_date, description, created_at
+        )
+        INSERT INTO _partition_move (id, user_id, wallet_id, category_id, amount, type,
+                                     transaction_date, description, created_at)
+        SELECT * FROM gone;
+    END IF;
+
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF transactions FOR VALUES FROM (%L) TO (%L)',
+        part_name, lo, hi
+    );
+
+    INSERT INTO transactions (id, user_id, wallet_id, category_id, amount, type,
+                              transaction_date, description, created_at)
+    SELECT id, user_id, wallet_id, category_id, amount, type,
+           transaction_date, description, created_at
+    FROM _partition_move;
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    IF moved > 0 THEN
+        RAISE NOTICE 'Moved % rows from transactions_default to %', moved, part_name;
+    END IF;
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    -- Skipped on a database that still has the unpartitioned table
+    IF EXISTS (
+        SELECT 1 FROM pg_class WHERE oid = to_regclass('transactions') AND relkind = 'p'
+    ) THEN
+        CREATE TABLE IF NOT EXISTS transactions_default PARTITION OF transactions DEFAULT;
+        PERFORM ensure_transaction_partition(y)
+        FROM generate_series(
+            EXTRACT(YEAR FROM CURRENT_DATE)::int - 1,
+            EXTRACT(YEAR FROM CURRENT_DATE)::int + 1
+        ) AS y;
+    END IF;
+END;
+$$;
+
+-- step: daily rollups
+-- Per-user daily aggregates, maintained by TransactionRepository in the same
+-- DB transaction as every write. Analytics read from here instead of raw rows.
+CREATE TABLE IF NOT EXISTS daily_user_category_totals (
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    wallet_id INTEGER NOT NULL REFERENCES wallets(id) ON DELETE CASCADE,
+    category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    type VARCHAR(10) NOT NULL CHECK (type IN ('INCOME', 'EXPENSE')),
+    is_system BOOLEAN NOT NULL DEFAULT FALSE,
+    total NUMERIC(20, 2) NOT NULL DEFAULT 0,
+    txn_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day, wallet_id, category_id, type)
+);
+
+-- step: receipt cache and refresh tokens
+-- Receipt OCR results keyed by SHA-256 of the image bytes + prompt version,
+-- so re-uploading the same photo does not spend another Gemini call.
+CREATE TABLE IF NOT EXISTS receipt_scan_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    result JSONB NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_receipt_scan_cache_expires ON receipt_scan_cache(expires_at);
+
+-- Refresh tokens table for JWT rotation
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    token_hash VARCHAR(64) NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    is_revoked BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    user_agent VARCHAR(255),
+    ip_address VARCHAR(45)
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_refresh_tokens_hash ON refresh_tokens(token_hash);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_user ON refresh_tokens(user_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires ON refresh_tokens(expires_at);
+
+-- step: indexes
+-- Indexes for better query performance
+CREATE INDEX IF NOT EXISTS idx_wallets_user_id ON wallets(user_id);
+CREATE INDEX IF NOT EXISTS idx_categories_user_id ON categories(user_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_id ON transactions(user_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_wallet_id ON transactions(wallet_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date);
+
+-- Optimized indices for new features
+-- Matches the (transaction_date DESC, id DESC) keyset used for cursor pagination
+-- and supersedes the former (user_id, transaction_date DESC) index.
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date_id ON transactions(user_id, transaction_date DESC, id DESC);
+DROP INDEX IF EXISTS idx_transactions_user_date;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_transactions_description_trgm ON transactions USING GIN (description gin_trgm_ops);
+
+-- step: full-text search
+-- Full-text search over descriptions: Indonesian stemming for words, plus the
+-- 'simple' config so merchant names and codes also match verbatim.
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('indonesian', coalesce(description, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS idx_transactions_search ON transactions USING GIN (search_vector);
+-- Lets category-name matches be resolved to ids and probed per user
+CREATE INDEX IF NOT EXISTS idx_transactions_user_category ON transactions(user_id, category_id);
+
+-- step: description suggestions
+-- Autocomplete index: one row per distinct (user, category, description),
+-- maintained by TransactionRepository alongside every write. Backfill with
+-- `python -m backend.app.db.rebuild_suggestions`.
+CREATE TABLE IF NOT EXISTS description_suggestions (
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    category_id INTEGER NOT NULL REFERENCES categories(id) ON DELETE CASCADE,
+    normalized TEXT NOT NULL,
+    description TEXT NOT NULL,
+    use_count INTEGER NOT NULL DEFAULT 0,
+    last_used DATE NOT NULL,
+    PRIMARY KEY (user_id, category_id, normalized)
+);
+
+CREATE INDEX IF NOT EXISTS idx_description_suggestions_prefix
+    ON description_suggestions(user_id, normalized text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_description_suggestions_category_prefix
+    ON description_suggestions(user_id, category_id, normalized text_pattern_ops);
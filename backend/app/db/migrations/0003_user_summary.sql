@@ -0,0 +1,86 @@
+-- Per-user aggregates for the admin user list (wallet count, transaction
+-- count, last activity), kept current by statement-level triggers like
+-- platform_stats. Decrements only UPDATE existing rows, so deleting a user
+-- (which cascades to their wallets and transactions) never re-creates one.
+
+-- step: table
+CREATE TABLE IF NOT EXISTS user_summary (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    wallet_count INTEGER NOT NULL DEFAULT 0,
+    transaction_count BIGINT NOT NULL DEFAULT 0,
+    last_activity_at TIMESTAMP WITH TIME ZONE
+);
+
+-- The admin list pages by (created_at, id), which needs a non-null key
+UPDATE users SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+ALTER TABLE users ALTER COLUMN created_at SET NOT NULL;
+
+-- step: trigger functions
+CREATE OR REPLACE FUNCTION user_summary_wallets() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_summary AS s (user_id, wallet_count)
+        SELECT user_id, COUNT(*) FROM new_rows GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET wallet_count = s.wallet_count + EXCLUDED.wallet_count;
+    ELSE
+        UPDATE user_summary s
+        SET wallet_count = s.wallet_count - d.n
+        FROM (SELECT user_id, COUNT(*) AS n FROM old_rows GROUP BY user_id) d
+        WHERE s.user_id = d.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION user_summary_transactions() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_summary AS s (user_id, transaction_count, last_activity_at)
+        SELECT user_id, COUNT(*), MAX(created_at) FROM new_rows GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET transaction_count = s.transaction_count + EXCLUDED.transaction_count,
+            last_activity_at = GREATEST(s.last_activity_at, EXCLUDED.last_activity_at);
+    ELSE
+        UPDATE user_summary s
+        SET transaction_count = s.transaction_count - d.n
+        FROM (SELECT user_id, COUNT(*) AS n FROM old_rows GROUP BY user_id) d
+        WHERE s.user_id = d.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- step: backfill and triggers
+LOCK TABLE wallets, transactions IN SHARE MODE;
+
+DELETE FROM user_summary;
+INSERT INTO user_summary (user_id, wallet_count, transaction_count, last_activity_at)
+SELECT u.id,
+       (SELECT COUNT(*) FROM wallets w WHERE w.user_id = u.id),
+       COALESCE(t.n, 0),
+       t.last_at
+FROM users u
+LEFT JOIN (
+    SELECT user_id, COUNT(*) AS n, MAX(created_at) AS last_at
+    FROM transactions
+    GROUP BY user_id
+) t ON t.user_id = u.id;
+
+DROP TRIGGER IF EXISTS user_summary_wallets_insert ON wallets;
+CREATE TRIGGER user_summary_wallets_insert
+    AFTER INSERT ON wallets REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_summary_wallets();
+DROP TRIGGER IF EXISTS user_summary_wallets_delete ON wallets;
+CREATE TRIGGER user_summary_wallets_delete
+    AFTER DELETE ON wallets REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_summary_wallets();
+
+DROP TRIGGER IF EXISTS user_summary_transactions_insert ON transactions;
+CREATE TRIGGER user_summary_transactions_insert
+    AFTER INSERT ON transactions REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_summary_transactions();
+DROP TRIGGER IF EXISTS user_summary_transactions_delete ON transactions;
+CREATE TRIGGER user_summary_transactions_delete
+    AFTER DELETE ON transactions REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION user_summary_transactions();
@@ -0,0 +1,24 @@
+-- migrate: no-transaction
+-- Indexes for the paginated admin user list, built without blocking signups.
+
+-- step: keyset index
+-- Covers the listed columns, so a page is an index-only scan of `limit` rows
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_id
+    ON users (created_at DESC, id DESC)
+    INCLUDE (email, username, is_active, is_superuser);
+
+-- step: inactive users
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_inactive_created_id
+    ON users (created_at DESC, id DESC) WHERE NOT is_active;
+
+-- step: superusers
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_superuser_created_id
+    ON users (created_at DESC, id DESC) WHERE is_superuser;
+
+-- step: email prefix
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_prefix
+    ON users (lower(email) text_pattern_ops);
+
+-- step: username prefix
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_username_prefix
+    ON users (lower(username) text_pattern_ops);
@@ -0,0 +1,7 @@
+-- migrate: no-transaction
+-- Lets the token reaper find revoked rows without scanning the table; expired
+-- rows are found through idx_refresh_tokens_expires.
+
+-- step: revoked tokens
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_revoked
+    ON refresh_tokens (id) WHERE is_revoked;
@@ -0,0 +1,68 @@
+-- Deleting a transaction (directly or through a wallet/user cascade) now also
+-- removes the user's activity bucket for the hour it was created in, unless
+-- another live transaction from that hour remains. Active-user counts then
+-- reflect live transactions, as the pre-counter query did.
+
+-- step: trigger function
+CREATE OR REPLACE FUNCTION platform_stats_transactions() RETURNS TRIGGER AS $$
+DECLARE
+    d RECORD;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) AS n,
+               COALESCE(SUM(amount) FILTER (WHERE type = 'INCOME'), 0) AS income,
+               COALESCE(SUM(amount) FILTER (WHERE type = 'EXPENSE'), 0) AS expense
+        INTO d FROM new_rows;
+
+        INSERT INTO user_activity_hourly (hour, user_id)
+        SELECT DISTINCT date_trunc('hour', CURRENT_TIMESTAMP), user_id FROM new_rows
+        ON CONFLICT DO NOTHING;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT -COUNT(*) AS n,
+               -COALESCE(SUM(amount) FILTER (WHERE type = 'INCOME'), 0) AS income,
+               -COALESCE(SUM(amount) FILTER (WHERE type = 'EXPENSE'), 0) AS expense
+        INTO d FROM old_rows;
+
+        -- Only rows inside the 48 hour retention window can still have a
+        -- bucket, so deleting older history never reaches the NOT EXISTS probe
+        DELETE FROM user_activity_hourly a
+        USING (
+            SELECT DISTINCT date_trunc('hour', created_at) AS hour, user_id
+            FROM old_rows
+            WHERE created_at >= CURRENT_TIMESTAMP - INTERVAL '48 hours'
+        ) gone
+        WHERE a.hour = gone.hour
+          AND a.user_id = gone.user_id
+          AND NOT EXISTS (
+              SELECT 1 FROM transactions t
+              WHERE t.user_id = gone.user_id
+                AND t.created_at >= gone.hour
+                AND t.created_at < gone.hour + INTERVAL '1 hour'
+          );
+    ELSE
+        SELECT 0 AS n,
+               COALESCE(SUM(sign * amount) FILTER (WHERE type = 'INCOME'), 0) AS income,
+               COALESCE(SUM(sign * amount) FILTER (WHERE type = 'EXPENSE'), 0) AS expense
+        INTO d
+        FROM (
+            SELECT 1 AS sign, type, amount FROM new_rows
+            UNION ALL
+            SELECT -1, type, amount FROM old_rows
+        ) changes;
+    END IF;
+
+    IF d.n <> 0 OR d.income <> 0 OR d.expense <> 0 THEN
+        PERFORM platform_stats_add(0, d.n, d.income, d.expense);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- step: drop buckets left by earlier deletes
+DELETE FROM user_activity_hourly a
+WHERE NOT EXISTS (
+    SELECT 1 FROM transactions t
+    WHERE t.user_id = a.user_id
+      AND t.created_at >= a.hour
+      AND t.created_at < a.hour + INTERVAL '1 hour'
+);
@@ -0,0 +1,11 @@
+-- Generation counters behind the response cache and ETags, shared by every
+-- API worker. A write bumps its user's row (or 'global'), so all workers see
+-- the new version at once. Cached payloads stay in process memory and are
+-- keyed by generation, so they need no cross-worker invalidation.
+
+-- step: table
+CREATE TABLE IF NOT EXISTS cache_generations (
+    scope TEXT PRIMARY KEY,
+    generation BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,19 @@
+-- Receipt scan job state, so any API worker can answer a poll for a job
+-- accepted by another. Uploads themselves stay in the accepting worker's
+-- memory queue; only status and results are stored here.
+
+-- step: table
+CREATE TABLE IF NOT EXISTS receipt_scan_jobs (
+    id TEXT PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL CHECK (status IN ('queued', 'processing', 'done', 'failed')),
+    result JSONB,
+    error TEXT,
+    error_status SMALLINT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_receipt_scan_jobs_finished ON receipt_scan_jobs(finished_at);
+CREATE INDEX IF NOT EXISTS idx_receipt_scan_jobs_unfinished
+    ON receipt_scan_jobs(created_at) WHERE finished_at IS NULL;
@@ -0,0 +1,218 @@
+"""
+Yearly partitions of the ``transactions`` table.
+
+Usage:
+    python -m backend.app.db.partitions migrate            # one-off: convert the old heap table
+    python -m backend.app.db.partitions maintain [--years-ahead N]
+    python -m backend.app.db.partitions list
+    python -m backend.app.db.partitions detach --year 2019
+
+``maintain`` also runs as a scheduled job, at startup and daily. It
+pre-creates partitions for the coming years and splits any year that has
+collected rows in ``transactions_default`` (e.g. back-dated entries) into
+its own partition.
+
+A detached year becomes a standalone ``transactions_yYYYY`` table that can
+be dumped and dropped. Its totals stay in ``daily_user_category_totals`` and
+``platform_stats``, so analytics and admin stats keep counting it; a rollup
+rebuild would drop them.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from typing import List
+
+import asyncpg
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+logger = logging.getLogger("fintrack.partitions")
+
+_COLUMNS = (
+    "id, user_id, wallet_id, category_id, amount, type, "
+    "transaction_date, description, created_at"
+)
+
+
+async def is_partitioned(conn: asyncpg.Connection) -> bool:
+    relkind = await conn.fetchval(
+        "SELECT relkind::text FROM pg_class WHERE oid = to_regclass('transactions')"
+    )
+    return relkind == "p"
+
+
+async def list_partitions(conn: asyncpg.Connection) -> List[dict]:
+    rows = await conn.fetch(
+        """
+        SELECT c.relname AS name,
+               pg_get_expr(c.relpartbound, c.oid) AS bounds,
+               c.reltuples::bigint AS approx_rows
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'transactions'::regclass
+        ORDER BY c.relname
+        """
+    )
+    return [dict(row) for row in rows]
+
+
+async def ensure_partitions(conn: asyncpg.Connection, years_ahead: int = 1) -> List[int]:
+    """
+    Create missing yearly partitions; returns the years created.
+
+    Covers last year through ``years_ahead`` years from now, plus every year
+    that currently has rows in the default partition.
+    """
+    this_year = date.today().year
+    years = set(range(this_year - 1, this_year + years_ahead + 1))
+    stray = await conn.fetch(
+        "SELECT DISTINCT EXTRACT(YEAR FROM transaction_date)::int AS year FROM transactions_default"
+    )
+    years.update(row["year"] for row in stray)
+
+    created = []
+    for year in sorted(years):
+        async with conn.transaction():
+            if await conn.fetchval("SELECT ensure_transaction_partition($1)", year):
+                created.append(year)
+    return created
+
+
+async def detach_partition(conn: asyncpg.Connection, year: int) -> str:
+    """Detach a year's partition so it can be archived; returns its table name."""
+    name = f"transactions_y{year}"
+    if await conn.fetchval("SELECT to_regclass($1)", name) is None:
+        raise ValueError(f"No partition for {year}")
+    await conn.execute(f"ALTER TABLE transactions DETACH PARTITION {name}")
+    return name
+
+
+async def migrate_to_partitioned(conn: asyncpg.Connection) -> int:
+    """
+    Convert an unpartitioned ``transactions`` table in place.
+
+    Runs in one transaction holding an ACCESS EXCLUSIVE lock, so the table
+    is unavailable while rows are copied. Returns the number of rows moved.
+    """
+    if await is_partitioned(conn):
+        return 0
+
+    baseline = (Path(__file__).parent / "migrations" / "0001_baseline.sql").read_text()
+
+    async with conn.transaction():
+        await conn.execute("LOCK TABLE transactions IN ACCESS EXCLUSIVE MODE")
+        await conn.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+
+        # Recreated on the new table once the rows are copied, so the copy
+        # itself does not fire them (e.g. the platform_stats counters)
+        triggers = await conn.fetch(
+            """
+            SELECT pg_get_triggerdef(oid) AS ddl FROM pg_trigger
+            WHERE tgrelid = 'transactions_unpartitioned'::regclass AND NOT tgisinternal
+            """
+        )
+
+        # Free the index and constraint names for the new table
+        await conn.execute(
+            "ALTER TABLE transactions_unpartitioned DROP CONSTRAINT IF EXISTS transactions_pkey"
+        )
+        for row in await conn.fetch(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'transactions_unpartitioned'"
+        ):
+            await conn.execute(f'DROP INDEX IF EXISTS "{row["indexname"]}"')
+
+        # Later migrations may have replaced the baseline's partition function
+        partition_fn = await conn.fetchval(
+            "SELECT pg_get_functiondef(to_regprocedure('ensure_transaction_partition(integer)'))"
+        )
+
+        # Creates the partitioned table, its indexes and the default partition
+        await conn.execute(baseline)
+        if partition_fn:
+            await conn.execute(partition_fn)
+
+        await conn.execute(
+            """
+            SELECT ensure_transaction_partition(y)
+            FROM (
+                SELECT DISTINCT EXTRACT(YEAR FROM transaction_date)::int AS y
+                FROM transactions_unpartitioned
+            ) years
+            """
+        )
+        result = await conn.execute(
+            f"INSERT INTO transactions ({_COLUMNS}) "
+            f"SELECT {_COLUMNS} FROM transactions_unpartitioned"
+        )
+        moved = int(result.split()[-1])
+
+        sequence = await conn.fetchval("SELECT pg_get_serial_sequence('transactions', 'id')")
+        await conn.execute(
+            "SELECT setval($1, COALESCE((SELECT MAX(id) FROM transactions), 0) + 1, false)",
+            sequence,
+        )
+        for trigger in triggers:
+            await conn.execute(
+                trigger["ddl"].replace(" ON public.transactions_unpartitioned ", " ON transactions ")
+            )
+        await conn.execute("DROP TABLE transactions_unpartitioned")
+        # The new serial got a suffixed name while the old sequence existed
+        if sequence != "public.transactions_id_seq":
+            await conn.execute(f"ALTER SEQUENCE {sequence} RENAME TO transactions_id_seq")
+
+    return moved
+
+
+async def run_partition_maintenance(years_ahead: int) -> List[int]:
+    """Scheduled job: keep future partitions in place; returns the years created."""
+    from ..core import database
+
+    async with database.acquire() as conn:
+        if not await is_partitioned(conn):
+            logger.warning(
+                "transactions is not partitioned; run "
+                "`python -m backend.app.db.partitions migrate`"
+            )
+            return []
+        created = await ensure_partitions(conn, years_ahead)
+    if created:
+        logger.info(f"Created transaction partitions for {created}")
+    return created
+
+
+async def main(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(DATABASE_URL)
+    try:
+        if args.command == "migrate":
+            print("Converting transactions to a partitioned table...")
+            moved = await migrate_to_partitioned(conn)
+            print(f"Done: {moved} rows moved.")
+        elif args.command == "maintain":
+            created = await ensure_partitions(conn, args.years_ahead)
+            print(f"Created partitions for: {created or 'nothing to do'}")
+        elif args.command == "detach":
+            name = await detach_partition(conn, args.year)
+            print(f"Detached {name}; archive it with pg_dump -t {name}, then DROP TABLE {name}.")
+        for part in await list_partitions(conn):
+            print(f"  {part['name']:<24} {part['bounds']:<50} ~{part['approx_rows']} rows")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="Convert the unpartitioned table")
+    maintain = sub.add_parser("maintain", help="Create missing partitions")
+    maintain.add_argument("--years-ahead", type=int, default=1)
+    sub.add_parser("list", help="Show partitions")
+    detach = sub.add_parser("detach", help="Detach a year for archiving")
+    detach.add_argument("--year", type=int, required=True)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,40 @@
+"""
+Rebuild ``daily_user_category_totals`` from the raw ``transactions`` table.
+
+Usage:
+    python -m backend.app.db.rebuild_rollups            # every user
+    python -m backend.app.db.rebuild_rollups --user 42  # a single user
+"""
+
+import argparse
+import asyncio
+import os
+
+import asyncpg
+from dotenv import load_dotenv
+
+from ..repositories.rollup_repo import RollupRepository
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+async def rebuild_rollups(user_id: int = None):
+    print("Connecting to database...")
+    conn = await asyncpg.connect(DATABASE_URL)
+
+    try:
+        scope = f"user {user_id}" if user_id is not None else "all users"
+        print(f"Rebuilding daily rollups for {scope}...")
+        rows = await RollupRepository(conn).rebuild(user_id)
+        print(f"Rollup rebuilt: {rows} aggregate rows written.")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user", type=int, default=None, help="Only rebuild this user id")
+    args = parser.parse_args()
+    asyncio.run(rebuild_rollups(args.user))
@@ -0,0 +1,40 @@
+"""
+Rebuild ``description_suggestions`` from the raw ``transactions`` table.
+
+Usage:
+    python -m backend.app.db.rebuild_suggestions            # every user
+    python -m backend.app.db.rebuild_suggestions --user 42  # a single user
+"""
+
+import argparse
+import asyncio
+import os
+
+import asyncpg
+from dotenv import load_dotenv
+
+from ..repositories.suggestion_repo import SuggestionRepository
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+async def rebuild_suggestions(user_id: int = None):
+    print("Connecting to database...")
+    conn = await asyncpg.connect(DATABASE_URL)
+
+    try:
+        scope = f"user {user_id}" if user_id is not None else "all users"
+        print(f"Rebuilding description suggestions for {scope}...")
+        rows = await SuggestionRepository(conn).rebuild(user_id)
+        print(f"Suggestions rebuilt: {rows} rows written.")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user", type=int, default=None, help="Only rebuild this user id")
+    args = parser.parse_args()
+    asyncio.run(rebuild_suggestions(args.user))
@@ -4,6 +4,14 @@ from datetime import date
 
 
 class AnalyticsRepository:
+    """
+    Analytics queries served from ``daily_user_category_totals``.
+
+    The rollup holds at most one row per (day, wallet, category, type), so a
+    date range costs a handful of pre-aggregated rows rather than a scan of
+    every raw transaction in it.
+    """
+
     def __init__(self, conn: asyncpg.Connection):
         self.conn = conn
 
@@ -16,16 +24,16 @@ class AnalyticsRepository:
     ) -> List[dict]:
         rows = await self.conn.fetch(
             """
-            SELECT c.name, c.icon, SUM(t.amount) as total
-            FROM transactions t
-            JOIN categories c ON t.category_id = c.id
-            WHERE t.user_id = $1
-              AND t.type = $2
-              AND t.transaction_date >= $3
-              AND t.transaction_date <= $4
-              AND NOT c.is_system
+            SELECT c.name, c.icon, SUM(r.total) as total
+            FROM daily_user_category_totals r
+            JOIN categories c ON r.category_id = c.id
+            WHERE r.user_id = $1
+              AND r.type = $2
+              AND r.day >= $3
+              AND r.day <= $4
+              AND NOT r.is_system
             GROUP BY c.id, c.name, c.icon
-            HAVING SUM(t.amount) > 0
+            HAVING SUM(r.total) > 0
             ORDER BY total DESC
             """,
             user_id, trans_type, start_date, end_date
@@ -41,17 +49,16 @@ class AnalyticsRepository:
     ) -> List[dict]:
         rows = await self.conn.fetch(
             """
-            SELECT w.name, w.icon, SUM(t.amount) as total
-            FROM transactions t
-            JOIN wallets w ON t.wallet_id = w.id
-            JOIN categories c ON t.category_id = c.id
-            WHERE t.user_id = $1
-              AND t.type = $2
-              AND t.transaction_date >= $3
-              AND t.transaction_date <= $4
-              AND NOT c.is_system
+            SELECT w.name, w.icon, SUM(r.total) as total
+            FROM daily_user_category_totals r
+            JOIN wallets w ON r.wallet_id = w.id
+            WHERE r.user_id = $1
+              AND r.type = $2
+              AND r.day >= $3
+              AND r.day <= $4
+              AND NOT r.is_system
             GROUP BY w.id, w.name, w.icon
-            HAVING SUM(t.amount) > 0
+            HAVING SUM(r.total) > 0
             ORDER BY total DESC
             """,
             user_id, trans_type, start_date, end_date
@@ -67,14 +74,14 @@ class AnalyticsRepository:
     ) -> List[dict]:
         rows = await self.conn.fetch(
             """
-            SELECT transaction_date, SUM(amount) as total
-            FROM transactions
+            SELECT day AS transaction_date, SUM(total) as total
+            FROM daily_user_category_totals
             WHERE user_id = $1
               AND type = $2
-              AND transaction_date >= $3
-              AND transaction_date <= $4
-            GROUP BY transaction_date
-            ORDER BY transaction_date ASC
+              AND day >= $3
+              AND day <= $4
+            GROUP BY day
+            ORDER BY day ASC
             """,
             user_id, trans_type, start_date, end_date
         )
@@ -88,15 +95,14 @@ class AnalyticsRepository:
     ) -> dict:
         row = await self.conn.fetchrow(
             """
-            SELECT 
-                COALESCE(SUM(CASE WHEN t.type = 'INCOME' AND NOT c.is_system THEN t.amount ELSE 0 END), 0) as total_income,
-                COALESCE(SUM(CASE WHEN t.type = 'EXPENSE' AND NOT c.is_system THEN t.amount ELSE 0 END), 0) as total_expense,
-                COUNT(*) as transaction_count
-            FROM transactions t
-            JOIN categories c ON t.category_id = c.id
-            WHERE t.user_id = $1
-              AND t.transaction_date >= $2
-              AND t.transaction_date <= $3
+            SELECT
+                COALESCE(SUM(CASE WHEN type = 'INCOME' AND NOT is_system THEN total ELSE 0 END), 0) as total_income,
+                COALESCE(SUM(CASE WHEN type = 'EXPENSE' AND NOT is_system THEN total ELSE 0 END), 0) as total_expense,
+                COALESCE(SUM(txn_count), 0)::BIGINT as transaction_count
+            FROM daily_user_category_totals
+            WHERE user_id = $1
+              AND day >= $2
+              AND day <= $3
             """,
             user_id, start_date, end_date
         )
@@ -111,17 +117,16 @@ class AnalyticsRepository:
         """Fetch daily totals for Income and Expense, excluding system categories."""
         rows = await self.conn.fetch(
             """
-            SELECT 
-                t.transaction_date::DATE as day, 
-                t.type, 
-                SUM(t.amount) as total
-            FROM transactions t
-            JOIN categories c ON t.category_id = c.id
-            WHERE t.user_id = $1
-              AND t.transaction_date >= $2
-              AND t.transaction_date <= $3
-              AND NOT c.is_system
-            GROUP BY day, t.type
+            SELECT
+                day,
+                type,
+                SUM(total) as total
+            FROM daily_user_category_totals
+            WHERE user_id = $1
+              AND day >= $2
+              AND day <= $3
+              AND NOT is_system
+            GROUP BY day, type
             ORDER BY day ASC
             """,
             user_id, start_date, end_date
@@ -139,27 +144,27 @@ class AnalyticsRepository:
         """Compare expenses between two months using FILTER clause."""
         rows = await self.conn.fetch(
             """
-            SELECT 
+            SELECT
                 c.name as category,
-                COALESCE(SUM(t.amount) FILTER (
-                    WHERE t.transaction_date >= $2 AND t.transaction_date <= $3
+                COALESCE(SUM(r.total) FILTER (
+                    WHERE r.day >= $2 AND r.day <= $3
                 ), 0) as current_total,
-                COALESCE(SUM(t.amount) FILTER (
-                    WHERE t.transaction_date >= $4 AND t.transaction_date <= $5
+                COALESCE(SUM(r.total) FILTER (
+                    WHERE r.day >= $4 AND r.day <= $5
                 ), 0) as prev_total
-            FROM transactions t
-            JOIN categories c ON t.category_id = c.id
-            WHERE t.user_id = $1
-              AND t.type = 'EXPENSE'
-              AND NOT c.is_system
+            FROM daily_user_category_totals r
+            JOIN categories c ON r.category_id = c.id
+            WHERE r.user_id = $1
+              AND r.type = 'EXPENSE'
+              AND NOT r.is_system
               AND (
-                  (t.transaction_date >= $2 AND t.transaction_date <= $3) OR
-                  (t.transaction_date >= $4 AND t.transaction_date <= $5)
+                  (r.day >= $2 AND r.day <= $3) OR
+                  (r.day >= $4 AND r.day <= $5)
               )
             GROUP BY c.name
-            HAVING 
-                SUM(t.amount) FILTER (WHERE t.transaction_date >= $2 AND t.transaction_date <= $3) > 0 OR
-                SUM(t.amount) FILTER (WHERE t.transaction_date >= $4 AND t.transaction_date <= $5) > 0
+            HAVING
+                SUM(r.total) FILTER (WHERE r.day >= $2 AND r.day <= $3) > 0 OR
+                SUM(r.total) FILTER (WHERE r.day >= $4 AND r.day <= $5) > 0
             ORDER BY current_total DESC
             """,
             user_id, current_start, current_end, prev_start, prev_end
@@ -1,6 +1,8 @@
 import asyncpg
 from typing import Optional, List
 
+from ..core.response_cache import response_cache
+
 
 class CategoryRepository:
     def __init__(self, conn: asyncpg.Connection):
@@ -42,6 +44,7 @@ class CategoryRepository:
             """,
             user_id, name, category_type, icon
         )
+        await response_cache.bump(user_id, self.conn)
         return dict(row)
 
     async def get_by_id(self, category_id: int) -> Optional[dict]:
@@ -62,4 +65,7 @@ class CategoryRepository:
             """,
             category_id, user_id
         )
-        return result == "DELETE 1"
+        if result == "DELETE 1":
+            await response_cache.bump(user_id, self.conn)
+            return True
+        return False
@@ -0,0 +1,43 @@
+from typing import Optional
+
+import asyncpg
+
+
+class ReceiptCacheRepository:
+    """Persistent tier of the receipt scan cache (``receipt_scan_cache``)."""
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def get(self, cache_key: str) -> Optional[dict]:
+        """Get a non-expired cached scan result."""
+        return await self.conn.fetchval(
+            """
+            SELECT result FROM receipt_scan_cache
+            WHERE cache_key = $1 AND expires_at > NOW()
+            """,
+            cache_key,
+        )
+
+    async def put(self, cache_key: str, result: dict, ttl_seconds: int) -> None:
+        """Insert or refresh a cached scan result."""
+        await self.conn.execute(
+            """
+            INSERT INTO receipt_scan_cache (cache_key, result, expires_at)
+            VALUES ($1, $2, NOW() + make_interval(secs => $3))
+            ON CONFLICT (cache_key) DO UPDATE
+            SET result = EXCLUDED.result,
+                created_at = CURRENT_TIMESTAMP,
+                expires_at = EXCLUDED.expires_at
+            """,
+            cache_key,
+            result,
+            float(ttl_seconds),
+        )
+
+    async def delete_expired(self) -> int:
+        """Delete expired entries. Returns the number of rows removed."""
+        result = await self.conn.execute(
+            "DELETE FROM receipt_scan_cache WHERE expires_at <= NOW()"
+        )
+        return int(result.split()[-1])
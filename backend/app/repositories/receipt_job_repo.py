@@ -0,0 +1,104 @@
+from typing import Optional, Sequence
+
+import asyncpg
+
+
+class ReceiptJobRepository:
+    """Status and results of receipt scan jobs (``receipt_scan_jobs``)."""
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def create(
+        self,
+        job_id: str,
+        user_id: int,
+        status: str = "queued",
+        result: Optional[dict] = None,
+    ) -> None:
+        await self.conn.execute(
+            """
+            INSERT INTO receipt_scan_jobs (id, user_id, status, result, finished_at)
+            VALUES ($1, $2, $3::varchar, $4, CASE WHEN $3::varchar IN ('done', 'failed') THEN NOW() END)
+            """,
+            job_id,
+            user_id,
+            status,
+            result,
+        )
+
+    async def get(self, job_id: str, user_id: int) -> Optional[dict]:
+        row = await self.conn.fetchrow(
+            """
+            SELECT id, user_id, status, result, error, error_status
+            FROM receipt_scan_jobs
+            WHERE id = $1 AND user_id = $2
+            """,
+            job_id,
+            user_id,
+        )
+        return dict(row) if row else None
+
+    async def mark_processing(self, job_id: str) -> None:
+        await self.conn.execute(
+            "UPDATE receipt_scan_jobs SET status = 'processing' WHERE id = $1 AND status = 'queued'",
+            job_id,
+        )
+
+    async def finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[dict] = None,
+        error: Optional[str] = None,
+        error_status: Optional[int] = None,
+    ) -> None:
+        await self.conn.execute(
+            """
+            UPDATE receipt_scan_jobs
+            SET status = $2, result = $3, error = $4, error_status = $5, finished_at = NOW()
+            WHERE id = $1
+            """,
+            job_id,
+            status,
+            result,
+            error,
+            error_status,
+        )
+
+    async def fail_unfinished(
+        self,
+        error: str,
+        error_status: int,
+        job_ids: Optional[Sequence[str]] = None,
+        older_than_seconds: Optional[float] = None,
+    ) -> int:
+        """
+        Mark queued/processing jobs failed, either the given ids or those
+        created more than ``older_than_seconds`` ago. Returns rows updated.
+        """
+        result = await self.conn.execute(
+            """
+            UPDATE receipt_scan_jobs
+            SET status = 'failed', error = $1, error_status = $2, finished_at = NOW()
+            WHERE finished_at IS NULL
+              AND ($3::text[] IS NULL OR id = ANY($3::text[]))
+              AND ($4::float8 IS NULL OR created_at < NOW() - make_interval(secs => $4))
+            """,
+            error,
+            error_status,
+            list(job_ids) if job_ids is not None else None,
+            older_than_seconds,
+        )
+        return int(result.split()[-1])
+
+    async def delete_expired(self, ttl_seconds: float) -> int:
+        """Delete jobs finished more than ``ttl_seconds`` ago. Returns rows removed."""
+        result = await self.conn.execute(
+            """
+            DELETE FROM receipt_scan_jobs
+            WHERE finished_at < NOW() - make_interval(secs => $1)
+            """,
+            float(ttl_seconds),
+        )
+        return int(result.split()[-1])
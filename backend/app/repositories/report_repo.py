@@ -1,5 +1,5 @@
 import asyncpg
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import date
 
 
@@ -8,28 +8,80 @@ class ReportRepository:
         self.conn = conn
 
     async def get_report_data(
-        self, user_id: int, start_date: date, end_date: date
+        self,
+        user_id: int,
+        start_date: date,
+        end_date: date,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, int]] = None,
     ) -> List[dict]:
-        rows = await self.conn.fetch(
-            """
+        """
+        Fetch report rows newest first.
+
+        ``limit`` and ``after`` (the ``(transaction_date, id)`` of the last
+        row already seen) enable keyset pagination.
+        """
+        query = """
             SELECT 
+                t.id,
                 t.transaction_date,
                 w.name AS wallet_name,
                 c.name AS category_name,
                 t.type,
-                t.description,
+                COALESCE(t.description, '') AS description,
                 t.amount
             FROM transactions t
             JOIN wallets w ON t.wallet_id = w.id
             JOIN categories c ON t.category_id = c.id
             WHERE t.user_id = $1 
               AND t.transaction_date BETWEEN $2 AND $3
-            ORDER BY t.transaction_date DESC, t.created_at DESC
-            """,
-            user_id, start_date, end_date
-        )
+        """
+        params = [user_id, start_date, end_date]
+
+        if after is not None:
+            query += " AND (t.transaction_date, t.id) < ($4, $5)"
+            params.extend(after)
+
+        query += " ORDER BY t.transaction_date DESC, t.id DESC"
+
+        if limit is not None:
+            query += f" LIMIT ${len(params) + 1}"
+            params.append(limit)
+
+        rows = await self.conn.fetch(query, *params)
         return [dict(row) for row in rows]
 
+    async def stream_report_data(
+        self, user_id: int, start_date: date, end_date: date, prefetch: int = 500
+    ) -> AsyncIterator[asyncpg.Record]:
+        """
+        Yield report rows from a server-side cursor, newest first.
+
+        Rows are pulled from Postgres ``prefetch`` at a time, so memory stays
+        bounded regardless of the date range.
+        """
+        async with self.conn.transaction(readonly=True):
+            async for row in self.conn.cursor(
+                """
+                SELECT 
+                    t.transaction_date,
+                    w.name AS wallet_name,
+                    c.name AS category_name,
+                    t.type,
+                    t.description,
+                    t.amount
+                FROM transactions t
+                JOIN wallets w ON t.wallet_id = w.id
+                JOIN categories c ON t.category_id = c.id
+                WHERE t.user_id = $1 
+                  AND t.transaction_date BETWEEN $2 AND $3
+                ORDER BY t.transaction_date DESC, t.id DESC
+                """,
+                user_id, start_date, end_date,
+                prefetch=prefetch
+            ):
+                yield row
+
     async def get_report_summary(
         self, user_id: int, start_date: date, end_date: date
     ) -> dict:
@@ -0,0 +1,99 @@
+import asyncpg
+from typing import Iterable, Optional, Tuple
+from decimal import Decimal
+from datetime import date
+
+# (day, wallet_id, category_id, type, amount_delta, count_delta)
+RollupDelta = Tuple[date, int, int, str, Decimal, int]
+
+
+class RollupRepository:
+    """
+    Maintains ``daily_user_category_totals``, the per-user daily aggregate
+    that analytics read instead of re-scanning ``transactions``.
+
+    Writers call ``apply_deltas`` inside the same DB transaction as the
+    change to ``transactions`` so the rollup can never drift from the rows
+    it summarizes.
+    """
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def apply_deltas(self, user_id: int, deltas: Iterable[RollupDelta]) -> None:
+        """Add signed amount/count deltas to the rollup in a single statement."""
+        merged = {}
+        for day, wallet_id, category_id, trans_type, amount, count in deltas:
+            key = (day, wallet_id, category_id, trans_type)
+            total, txn_count = merged.get(key, (Decimal("0"), 0))
+            merged[key] = (total + amount, txn_count + count)
+
+        if not merged:
+            return
+
+        keys = list(merged)
+        await self.conn.execute(
+            """
+            INSERT INTO daily_user_category_totals AS r
+                (user_id, day, wallet_id, category_id, type, is_system, total, txn_count)
+            SELECT $1, d.day, d.wallet_id, d.category_id, d.type, c.is_system, d.total, d.txn_count
+            FROM unnest($2::date[], $3::int[], $4::int[], $5::varchar[], $6::numeric[], $7::int[])
+                 AS d(day, wallet_id, category_id, type, total, txn_count)
+            JOIN categories c ON c.id = d.category_id
+            ON CONFLICT (user_id, day, wallet_id, category_id, type) DO UPDATE
+            SET total = r.total + EXCLUDED.total,
+                txn_count = r.txn_count + EXCLUDED.txn_count
+            """,
+            user_id,
+            [k[0] for k in keys],
+            [k[1] for k in keys],
+            [k[2] for k in keys],
+            [k[3] for k in keys],
+            [merged[k][0] for k in keys],
+            [merged[k][1] for k in keys],
+        )
+
+        if any(count < 0 for _, count in merged.values()):
+            await self.conn.execute(
+                """
+                DELETE FROM daily_user_category_totals
+                WHERE user_id = $1 AND day = ANY($2::date[]) AND txn_count <= 0
+                """,
+                user_id,
+                list({k[0] for k in keys}),
+            )
+
+    async def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recompute the rollup from ``transactions`` for one user or everyone.
+
+        Takes an EXCLUSIVE lock on the rollup so concurrent writers queue
+        behind the rebuild instead of applying deltas to rows being replaced.
+        Reads are not blocked. Returns the number of rollup rows written.
+        """
+        async with self.conn.transaction():
+            await self.conn.execute(
+                "LOCK TABLE daily_user_category_totals IN EXCLUSIVE MODE"
+            )
+            if user_id is None:
+                await self.conn.execute("DELETE FROM daily_user_category_totals")
+            else:
+                await self.conn.execute(
+                    "DELETE FROM daily_user_category_totals WHERE user_id = $1",
+                    user_id,
+                )
+
+            result = await self.conn.execute(
+                """
+                INSERT INTO daily_user_category_totals
+                    (user_id, day, wallet_id, category_id, type, is_system, total, txn_count)
+                SELECT t.user_id, t.transaction_date, t.wallet_id, t.category_id, t.type,
+                       c.is_system, SUM(t.amount), COUNT(*)
+                FROM transactions t
+                JOIN categories c ON t.category_id = c.id
+                WHERE $1::int IS NULL OR t.user_id = $1
+                GROUP BY t.user_id, t.transaction_date, t.wallet_id, t.category_id, t.type, c.is_system
+                """,
+                user_id,
+            )
+            return int(result.split()[-1]) if result.startswith("INSERT") else 0
@@ -0,0 +1,49 @@
+import asyncpg
+
+
+class PlatformStatsRepository:
+    """
+    Reads the platform-wide counters behind the admin dashboard.
+
+    ``platform_stats`` and ``user_activity_hourly`` are maintained by
+    triggers on ``users`` and ``transactions`` (migration 0002), so reads
+    cost the same however many transactions the platform holds.
+    """
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def get_stats(self, active_hours: int = 24) -> dict:
+        """
+        Totals plus the number of users who recorded a transaction in the
+        last ``active_hours`` hours (at hour granularity, so up to one hour
+        more than that).
+        """
+        row = await self.conn.fetchrow(
+            """
+            SELECT
+                COALESCE(SUM(user_count), 0)::bigint AS total_users,
+                COALESCE(SUM(transaction_count), 0)::bigint AS total_transactions,
+                COALESCE(SUM(total_income), 0) AS total_income,
+                COALESCE(SUM(total_expense), 0) AS total_expense,
+                (
+                    SELECT COUNT(DISTINCT user_id)
+                    FROM user_activity_hourly
+                    WHERE hour >= date_trunc('hour', CURRENT_TIMESTAMP - make_interval(hours => $1))
+                ) AS active_users
+            FROM platform_stats
+            """,
+            active_hours
+        )
+        return dict(row)
+
+    async def prune_activity(self, keep_hours: int = 48) -> int:
+        """Delete activity buckets older than ``keep_hours``; returns rows removed."""
+        result = await self.conn.execute(
+            """
+            DELETE FROM user_activity_hourly
+            WHERE hour < date_trunc('hour', CURRENT_TIMESTAMP - make_interval(hours => $1))
+            """,
+            keep_hours
+        )
+        return int(result.split()[-1])
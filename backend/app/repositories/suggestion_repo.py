@@ -0,0 +1,161 @@
+import asyncpg
+from typing import Iterable, List, Optional, Tuple
+from datetime import date
+
+# (description, category_id, count_delta, used_on)
+SuggestionDelta = Tuple[Optional[str], int, int, date]
+
+
+def normalize_description(description: Optional[str]) -> str:
+    """Case- and whitespace-insensitive key for a description."""
+    return " ".join((description or "").split()).lower()
+
+
+class SuggestionRepository:
+    """
+    Maintains ``description_suggestions``, one row per distinct
+    (user, category, normalized description) with how often and how
+    recently it was used.
+
+    Like the daily rollup, writers call ``apply_deltas`` inside the same DB
+    transaction as the change to ``transactions``.
+    """
+
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+
+    async def apply_deltas(self, user_id: int, deltas: Iterable[SuggestionDelta]) -> None:
+        merged = {}
+        for description, category_id, count, used_on in deltas:
+            normalized = normalize_description(description)
+            if not normalized:
+                continue
+            key = (category_id, normalized)
+            _, total, last_used = merged.get(key, (None, 0, used_on))
+            display = " ".join(description.split())
+            merged[key] = (display, total + count, max(last_used, used_on))
+
+        if not merged:
+            return
+
+        keys = list(merged)
+        await self.conn.execute(
+            """
+            INSERT INTO description_suggestions AS s
+                (user_id, category_id, normalized, description, use_count, last_used)
+            SELECT $1, d.category_id, d.normalized, d.description, d.use_count, d.last_used
+            FROM unnest($2::int[], $3::text[], $4::text[], $5::int[], $6::date[])
+                 AS d(category_id, normalized, description, use_count, last_used)
+            ON CONFLICT (user_id, category_id, normalized) DO UPDATE
+            SET use_count = s.use_count + EXCLUDED.use_count,
+                -- Removals keep the existing spelling and recency
+                description = CASE WHEN EXCLUDED.use_count > 0
+                                   THEN EXCLUDED.description ELSE s.description END,
+                last_used = CASE WHEN EXCLUDED.use_count > 0
+                                 THEN GREATEST(s.last_used, EXCLUDED.last_used)
+                                 ELSE s.last_used END
+            """,
+            user_id,
+            [k[0] for k in keys],
+            [k[1] for k in keys],
+            [merged[k][0] for k in keys],
+            [merged[k][1] for k in keys],
+            [merged[k][2] for k in keys],
+        )
+
+        if any(merged[k][1] < 0 for k in keys):
+            await self.conn.execute(
+                """
+                DELETE FROM description_suggestions
+                WHERE user_id = $1 AND normalized = ANY($2::text[]) AND use_count <= 0
+                """,
+                user_id,
+                list({k[1] for k in keys}),
+            )
+
+    async def search_prefix(
+        self,
+        user_id: int,
+        prefix: str,
+        limit: int,
+        category_id: Optional[int] = None,
+    ) -> List[str]:
+        """Most used descriptions starting with ``prefix`` (already normalized)."""
+        pattern = (
+            prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        )
+        if category_id is not None:
+            rows = await self.conn.fetch(
+                """
+                SELECT description
+                FROM description_suggestions
+                WHERE user_id = $1 AND category_id = $2 AND normalized LIKE $3
+                ORDER BY use_count DESC, last_used DESC
+                LIMIT $4
+                """,
+                user_id, category_id, pattern, limit
+            )
+        else:
+            rows = await self.conn.fetch(
+                """
+                SELECT MAX(description) AS description
+                FROM description_suggestions
+                WHERE user_id = $1 AND normalized LIKE $2
+                GROUP BY normalized
+                ORDER BY SUM(use_count) DESC, MAX(last_used) DESC
+                LIMIT $3
+                """,
+                user_id, pattern, limit
+            )
+        return [row["description"] for row in rows]
+
+    async def get_top(self, user_id: int, limit: int) -> List[dict]:
+        """The user's ``limit`` most used suggestion rows, for the memory cache."""
+        rows = await self.conn.fetch(
+            """
+            SELECT category_id, normalized, description, use_count, last_used
+            FROM description_suggestions
+            WHERE user_id = $1
+            ORDER BY use_count DESC, last_used DESC
+            LIMIT $2
+            """,
+            user_id, limit
+        )
+        return [dict(row) for row in rows]
+
+    async def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recompute suggestions from ``transactions`` for one user or everyone.
+        Returns the number of suggestion rows written.
+        """
+        async with self.conn.transaction():
+            await self.conn.execute(
+                "LOCK TABLE description_suggestions IN EXCLUSIVE MODE"
+            )
+            if user_id is None:
+                await self.conn.execute("DELETE FROM description_suggestions")
+            else:
+                await self.conn.execute(
+                    "DELETE FROM description_suggestions WHERE user_id = $1", user_id
+                )
+
+            result = await self.conn.execute(
+                """
+                INSERT INTO description_suggestions
+                    (user_id, category_id, normalized, description, use_count, last_used)
+                SELECT user_id, category_id, normalized,
+                       (ARRAY_AGG(display ORDER BY transaction_date DESC, id DESC))[1],
+                       COUNT(*), MAX(transaction_date)
+                FROM (
+                    SELECT user_id, category_id, id, transaction_date,
+                           regexp_replace(btrim(description), '\\s+', ' ', 'g') AS display,
+                           lower(regexp_replace(btrim(description), '\\s+', ' ', 'g')) AS normalized
+                    FROM transactions
+                    WHERE ($1::int IS NULL OR user_id = $1)
+                      AND description IS NOT NULL AND btrim(description) <> ''
+                ) t
+                GROUP BY user_id, category_id, normalized
+                """,
+                user_id,
+            )
+            return int(result.split()[-1])
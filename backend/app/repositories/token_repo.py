@@ -55,13 +55,32 @@ class RefreshTokenRepository:
         # Extract count from "UPDATE N"
         return int(result.split()[1]) if result.startswith("UPDATE") else 0
     
-    async def cleanup_expired(self) -> int:
-        """Remove expired tokens from the database."""
+    async def delete_expired_batch(self, limit: int) -> int:
+        """
+        Delete up to ``limit`` expired or revoked tokens.
+
+        Rows locked by a concurrent refresh are skipped rather than waited
+        on, so each batch is a short transaction that never blocks logins.
+        """
         result = await self.conn.execute("""
-            DELETE FROM refresh_tokens 
-            WHERE expires_at < NOW() OR is_revoked = TRUE
-        """)
+            DELETE FROM refresh_tokens
+            WHERE id IN (
+                SELECT id FROM refresh_tokens
+                WHERE expires_at < NOW() OR is_revoked = TRUE
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+        """, limit)
         return int(result.split()[1]) if result.startswith("DELETE") else 0
+
+    async def cleanup_expired(self, batch_size: int = 1000) -> int:
+        """Remove all expired and revoked tokens, one batch at a time."""
+        total = 0
+        while True:
+            deleted = await self.delete_expired_batch(batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
     
     async def get_active_sessions(self, user_id: int) -> list:
         """Get all active sessions for a user."""
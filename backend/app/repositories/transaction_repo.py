@@ -1,12 +1,18 @@
 import asyncpg
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
 from decimal import Decimal
 from datetime import date
 
+from ..core.response_cache import response_cache
+from .rollup_repo import RollupRepository
+from .suggestion_repo import SuggestionRepository
+
 
 class TransactionRepository:
     def __init__(self, conn: asyncpg.Connection):
         self.conn = conn
+        self.rollup_repo = RollupRepository(conn)
+        self.suggestion_repo = SuggestionRepository(conn)
 
     async def create(
         self,
@@ -64,7 +70,123 @@ class TransactionRepository:
                     wallet_id,
                 )
 
-            return dict(row)
+            await self.rollup_repo.apply_deltas(
+                user_id,
+                [(transaction_date, wallet_id, category_id, trans_type, amount, 1)],
+            )
+            await self.suggestion_repo.apply_deltas(
+                user_id, [(description, category_id, 1, transaction_date)]
+            )
+
+            created = dict(row)
+
+        # Only after commit: a concurrent read must not re-cache the old state
+        await response_cache.bump(user_id, self.conn)
+        return created
+
+    async def bulk_create(self, user_id: int, items: List[dict]) -> List[dict]:
+        """
+        Create many transactions with a constant number of round trips.
+
+        Each item holds the ``create`` arguments (``wallet_id``,
+        ``category_id``, ``amount``, ``trans_type``, ``transaction_date``,
+        ``description``). Touched wallets are locked once, balances are
+        checked in item order, all rows go in with one ``unnest`` INSERT and
+        each wallet gets a single balance UPDATE. Returns rows in item order.
+        """
+        async with self.conn.transaction():
+            wallet_ids = sorted({item["wallet_id"] for item in items})
+            wallets = await self.conn.fetch(
+                """
+                SELECT id, balance
+                FROM wallets
+                WHERE id = ANY($1::int[]) AND user_id = $2
+                ORDER BY id
+                FOR UPDATE
+                """,
+                wallet_ids,
+                user_id,
+            )
+            balances = {w["id"]: w["balance"] for w in wallets}
+            deltas = {wallet_id: Decimal("0") for wallet_id in balances}
+
+            for idx, item in enumerate(items):
+                wallet_id = item["wallet_id"]
+                if wallet_id not in balances:
+                    raise ValueError(f"Item {idx + 1}: Wallet not found")
+                running = balances[wallet_id] + deltas[wallet_id]
+                if item["trans_type"] == "EXPENSE":
+                    if running < item["amount"]:
+                        raise ValueError(
+                            f"Item {idx + 1}: Insufficient balance in wallet"
+                        )
+                    deltas[wallet_id] -= item["amount"]
+                else:
+                    deltas[wallet_id] += item["amount"]
+
+            rows = await self.conn.fetch(
+                """
+                INSERT INTO transactions (user_id, wallet_id, category_id, amount, type, transaction_date, description)
+                SELECT $1, d.wallet_id, d.category_id, d.amount, d.type, d.transaction_date, d.description
+                FROM unnest($2::int[], $3::int[], $4::numeric[], $5::varchar[], $6::date[], $7::text[])
+                     WITH ORDINALITY AS d(wallet_id, category_id, amount, type, transaction_date, description, ord)
+                ORDER BY d.ord
+                RETURNING id, user_id, wallet_id, category_id, amount, type, transaction_date, description, created_at
+                """,
+                user_id,
+                [item["wallet_id"] for item in items],
+                [item["category_id"] for item in items],
+                [item["amount"] for item in items],
+                [item["trans_type"] for item in items],
+                [item["transaction_date"] for item in items],
+                [item["description"] for item in items],
+            )
+
+            changed = [wallet_id for wallet_id, delta in deltas.items() if delta]
+            if changed:
+                await self.conn.execute(
+                    """
+                    UPDATE wallets w
+                    SET balance = w.balance + d.delta
+                    FROM unnest($1::int[], $2::numeric[]) AS d(id, delta)
+                    WHERE w.id = d.id
+                    """,
+                    changed,
+                    [deltas[wallet_id] for wallet_id in changed],
+                )
+
+            await self.rollup_repo.apply_deltas(
+                user_id,
+                [
+                    (
+                        item["transaction_date"],
+                        item["wallet_id"],
+                        item["category_id"],
+                        item["trans_type"],
+                        item["amount"],
+                        1,
+                    )
+                    for item in items
+                ],
+            )
+            await self.suggestion_repo.apply_deltas(
+                user_id,
+                [
+                    (
+                        item["description"],
+                        item["category_id"],
+                        1,
+                        item["transaction_date"],
+                    )
+                    for item in items
+                ],
+            )
+
+            # Sequence values follow the ORDER BY above, so id order is item order
+            created = sorted((dict(row) for row in rows), key=lambda row: row["id"])
+
+        await response_cache.bump(user_id, self.conn)
+        return created
 
     async def get_by_user(
         self,
@@ -77,7 +199,14 @@ class TransactionRepository:
         wallet_id: Optional[int] = None,
         category_id: Optional[int] = None,
         search: Optional[str] = None,
+        after: Optional[Tuple[date, int]] = None,
     ) -> List[dict]:
+        """
+        List a user's transactions newest first.
+
+        Pass ``after`` (the ``(transaction_date, id)`` of the last row already
+        seen) for keyset pagination; ``offset`` is then ignored.
+        """
         base_query = """
             SELECT t.id, t.user_id, t.wallet_id, t.category_id, t.amount, t.type,
                    t.transaction_date, t.description, t.created_at,
@@ -106,7 +235,12 @@ class TransactionRepository:
             param_idx += 1
 
         if search:
-            base_query += f" AND (t.description ILIKE ${param_idx} OR c.name ILIKE ${param_idx})"
+            # Resolve the category side to ids first so both branches of the
+            # OR can use an index (trigram on description, user/category btree)
+            base_query += (
+                f" AND (t.description ILIKE ${param_idx}"
+                f" OR t.category_id IN (SELECT id FROM categories WHERE name ILIKE ${param_idx}))"
+            )
             params.append(f"%{search}%")
             param_idx += 1
 
@@ -120,15 +254,131 @@ class TransactionRepository:
             params.append(end_date)
             param_idx += 1
 
+        if after is not None:
+            base_query += f" AND (t.transaction_date, t.id) < (${param_idx}, ${param_idx + 1})"
+            params.extend(after)
+            param_idx += 2
+
         base_query += " ORDER BY t.transaction_date DESC, t.id DESC"
 
         if limit is not None:
-            base_query += f" LIMIT ${param_idx} OFFSET ${param_idx + 1}"
-            params.extend([limit, offset])
+            if after is not None:
+                base_query += f" LIMIT ${param_idx}"
+                params.append(limit)
+            else:
+                base_query += f" LIMIT ${param_idx} OFFSET ${param_idx + 1}"
+                params.extend([limit, offset])
 
         rows = await self.conn.fetch(base_query, *params)
         return [dict(row) for row in rows]
 
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        limit: int = 20,
+        trans_type: Optional[str] = None,
+        wallet_id: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Relevance-ranked search over a user's transactions.
+
+        A row matches when its description matches the full-text query
+        (Indonesian stemming or verbatim tokens), is a fuzzy trigram match
+        for it (typos, partial words), or its category name contains it.
+        Rows are ordered by relevance weighted towards recent dates, and
+        carry an HTML-escaped ``highlight`` with matches wrapped in <mark>.
+        """
+        # Category names are matched as a substring; escape LIKE wildcards
+        pattern = (
+            "%"
+            + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            + "%"
+        )
+        filters = ""
+        params: list = [user_id, query, limit, pattern]
+        if trans_type:
+            params.append(trans_type)
+            filters += f" AND t.type = ${len(params)}"
+        if wallet_id:
+            params.append(wallet_id)
+            filters += f" AND t.wallet_id = ${len(params)}"
+
+        rows = await self.conn.fetch(
+            f"""
+            WITH q AS (
+                SELECT websearch_to_tsquery('indonesian', $2)
+                       || websearch_to_tsquery('simple', $2) AS tsq
+            ),
+            matched_categories AS (
+                SELECT id FROM categories
+                WHERE (user_id IS NULL OR user_id = $1)
+                  AND (name ILIKE $4 OR $2 <% name)
+            ),
+            hits AS (
+                SELECT t.id,
+                       ts_rank_cd(t.search_vector, q.tsq)
+                         + 0.5 * word_similarity($2, coalesce(t.description, ''))
+                         + CASE WHEN t.category_id IN (SELECT id FROM matched_categories)
+                                THEN 0.3 ELSE 0 END AS relevance,
+                       1.0 / (1 + GREATEST(CURRENT_DATE - t.transaction_date, 0) / 30.0) AS recency
+                FROM transactions t, q
+                WHERE t.user_id = $1
+                  AND (t.search_vector @@ q.tsq
+                       OR $2 <% t.description
+                       OR t.category_id IN (SELECT id FROM matched_categories))
+                  {filters}
+            ),
+            top AS (
+                SELECT id, relevance * (0.75 + 0.25 * recency) AS rank
+                FROM hits
+                ORDER BY rank DESC, id DESC
+                LIMIT $3
+            )
+            SELECT t.id, t.user_id, t.wallet_id, t.category_id, t.amount, t.type,
+                   t.transaction_date, t.description, t.created_at,
+                   c.name AS category_name, w.name AS wallet_name,
+                   top.rank::float8 AS rank,
+                   ts_headline(
+                       'simple',
+                       replace(replace(replace(coalesce(t.description, ''),
+                           '&', '&amp;'), '<', '&lt;'), '>', '&gt;'),
+                       q.tsq,
+                       'StartSel=<mark>, StopSel=</mark>, HighlightAll=true'
+                   ) AS highlight
+            FROM top
+            JOIN transactions t ON t.id = top.id
+            JOIN categories c ON t.category_id = c.id
+            JOIN wallets w ON t.wallet_id = w.id
+            CROSS JOIN q
+            ORDER BY top.rank DESC, t.id DESC
+            """,
+            *params,
+        )
+        return [dict(row) for row in rows]
+
+    async def iter_by_user(
+        self, user_id: int, batch_size: int = 500, **filters
+    ) -> AsyncIterator[List[dict]]:
+        """
+        Yield every matching transaction in keyset-paged batches.
+
+        Accepts the same filters as ``get_by_user``. Each batch is a bounded
+        index range scan, so long exports never degrade into deep OFFSETs.
+        """
+        after = None
+        while True:
+            batch = await self.get_by_user(
+                user_id, limit=batch_size, after=after, **filters
+            )
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            last = batch[-1]
+            after = (last["transaction_date"], last["id"])
+
     async def get_summary(self, user_id: int) -> dict:
         row = await self.conn.fetchrow(
             """
@@ -252,12 +502,30 @@ class TransactionRepository:
                 f"[IN] {transfer_desc}",
             )
 
-            return {
+            await self.rollup_repo.apply_deltas(
+                user_id,
+                [
+                    (transaction_date, source_wallet_id, category_id, "EXPENSE", amount, 1),
+                    (transaction_date, dest_wallet_id, category_id, "INCOME", amount, 1),
+                ],
+            )
+            await self.suggestion_repo.apply_deltas(
+                user_id,
+                [
+                    (out_record["description"], category_id, 1, transaction_date),
+                    (in_record["description"], category_id, 1, transaction_date),
+                ],
+            )
+
+            result = {
                 "out_transaction": dict(out_record),
                 "in_transaction": dict(in_record),
                 "amount": float(amount),
             }
 
+        await response_cache.bump(user_id, self.conn)
+        return result
+
     async def update(
         self,
         transaction_id: int,
@@ -380,46 +648,46 @@ class TransactionRepository:
                 user_id,
             )
 
-            return dict(row) if row else None
-
-    async def get_distinct_descriptions(
-        self, user_id: int, category_id: Optional[int] = None, search_term: Optional[str] = None
-    ) -> list[str]:
-        """
-        Fetch unique descriptions for a user for autocomplete suggestions.
-        Optionally filter by category_id or search_term for context-aware suggestions.
-        Ordered by usage frequency and recency.
-        """
-        query = """
-            SELECT description 
-            FROM transactions 
-            WHERE user_id = $1 
-              AND description IS NOT NULL 
-              AND description != ''
-        """
-        params = [user_id]
-        param_idx = 2
-
-        if category_id is not None:
-            query += f" AND category_id = ${param_idx}"
-            params.append(category_id)
-            param_idx += 1
-
-        if search_term is not None:
-            query += f" AND description ILIKE ${param_idx}"
-            params.append(f"%{search_term}%")
-            param_idx += 1
+            await self.rollup_repo.apply_deltas(
+                user_id,
+                [
+                    (
+                        old_trans["transaction_date"],
+                        old_wallet_id,
+                        old_trans["category_id"],
+                        old_type,
+                        -old_amount,
+                        -1,
+                    ),
+                    (new_date, new_wallet_id, new_category_id, new_type, new_amount, 1),
+                ],
+            )
+            await self.suggestion_repo.apply_deltas(
+                user_id,
+                [
+                    (
+                        old_trans["description"],
+                        old_trans["category_id"],
+                        -1,
+                        old_trans["transaction_date"],
+                    ),
+                    (new_desc, new_category_id, 1, new_date),
+                ],
+            )
 
-        query += " GROUP BY description ORDER BY COUNT(id) DESC, MAX(transaction_date) DESC"
+            updated = dict(row) if row else None
 
-        rows = await self.conn.fetch(query, *params)
-        return [row["description"] for row in rows]
+        await response_cache.bump(user_id, self.conn)
+        return updated
 
     async def delete(self, transaction_id: int, user_id: int) -> bool:
         async with self.conn.transaction():
             # Get transaction details first
             trans = await self.conn.fetchrow(
-                "SELECT wallet_id, amount, type FROM transactions WHERE id = $1 AND user_id = $2",
+                """
+                SELECT wallet_id, category_id, amount, type, transaction_date, description
+                FROM transactions WHERE id = $1 AND user_id = $2
+                """,
                 transaction_id,
                 user_id,
             )
@@ -454,4 +722,23 @@ class TransactionRepository:
                 user_id,
             )
 
-            return result == "DELETE 1"
+            await self.rollup_repo.apply_deltas(
+                user_id,
+                [
+                    (
+                        trans["transaction_date"],
+                        trans["wallet_id"],
+                        trans["category_id"],
+                        trans["type"],
+                        -trans["amount"],
+                        -1,
+                    )
+                ],
+            )
+            await self.suggestion_repo.apply_deltas(
+                user_id,
+                [(trans["description"], trans["category_id"], -1, trans["transaction_date"])],
+            )
+
+        await response_cache.bump(user_id, self.conn)
+        return result == "DELETE 1"
@@ -1,5 +1,6 @@
 import asyncpg
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 
 class UserRepository:
@@ -54,3 +55,62 @@ class UserRepository:
             hashed_password, user_id
         )
         return result == "UPDATE 1"
+
+    async def list_for_admin(
+        self,
+        limit: int = 25,
+        after: Optional[Tuple[datetime, int]] = None,
+        search: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        is_superuser: Optional[bool] = None,
+        include_stats: bool = False,
+    ) -> List[dict]:
+        """
+        Page through users newest first, keyed on ``(created_at, id)``.
+
+        ``search`` is a case-insensitive prefix of the email or username.
+        With ``include_stats`` each row also carries the counts kept in
+        ``user_summary``, looked up by primary key for the page only.
+        """
+        columns = "u.id, u.email, u.username, u.is_superuser, u.is_active, u.created_at"
+        joins = ""
+        if include_stats:
+            columns += (
+                ", COALESCE(s.wallet_count, 0) AS wallet_count"
+                ", COALESCE(s.transaction_count, 0) AS transaction_count"
+                ", s.last_activity_at"
+            )
+            joins = " LEFT JOIN user_summary s ON s.user_id = u.id"
+
+        query = f"SELECT {columns} FROM users u{joins} WHERE TRUE"
+        params = []
+        param_idx = 1
+
+        # Literal TRUE/FALSE (not a parameter) so the partial indexes apply
+        if is_active is not None:
+            query += " AND u.is_active" if is_active else " AND NOT u.is_active"
+        if is_superuser is not None:
+            query += " AND u.is_superuser" if is_superuser else " AND NOT u.is_superuser"
+
+        if search:
+            pattern = (
+                search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                + "%"
+            )
+            query += (
+                f" AND (lower(u.email) LIKE ${param_idx}"
+                f" OR lower(u.username) LIKE ${param_idx})"
+            )
+            params.append(pattern)
+            param_idx += 1
+
+        if after is not None:
+            query += f" AND (u.created_at, u.id) < (${param_idx}, ${param_idx + 1})"
+            params.extend(after)
+            param_idx += 2
+
+        query += f" ORDER BY u.created_at DESC, u.id DESC LIMIT ${param_idx}"
+        params.append(limit)
+
+        rows = await self.conn.fetch(query, *params)
+        return [dict(row) for row in rows]
@@ -2,6 +2,9 @@ import asyncpg
 from typing import Optional, List
 from decimal import Decimal
 
+from ..core.response_cache import response_cache
+from .suggestion_repo import SuggestionRepository
+
 
 class WalletRepository:
     def __init__(self, conn: asyncpg.Connection):
@@ -16,6 +19,7 @@ class WalletRepository:
             """,
             user_id, name, balance, icon
         )
+        await response_cache.bump(user_id, self.conn)
         return dict(row)
 
     async def get_by_user(self, user_id: int) -> List[dict]:
@@ -58,14 +62,39 @@ class WalletRepository:
                 """,
                 amount, wallet_id
             )
-        return dict(row) if row else None
+        if not row:
+            return None
+        await response_cache.bump(row["user_id"], self.conn)
+        return dict(row)
 
     async def delete(self, wallet_id: int, user_id: int) -> bool:
-        result = await self.conn.execute(
-            """
-            DELETE FROM wallets
-            WHERE id = $1 AND user_id = $2
-            """,
-            wallet_id, user_id
-        )
-        return result == "DELETE 1"
+        async with self.conn.transaction():
+            # The FK cascade removes the wallet's transactions but not their
+            # description suggestions, which have no wallet column
+            used = await self.conn.fetch(
+                """
+                SELECT category_id, description, COUNT(*) AS n,
+                       MAX(transaction_date) AS last_used
+                FROM transactions
+                WHERE wallet_id = $1 AND user_id = $2 AND description IS NOT NULL
+                GROUP BY category_id, description
+                """,
+                wallet_id, user_id
+            )
+            result = await self.conn.execute(
+                """
+                DELETE FROM wallets
+                WHERE id = $1 AND user_id = $2
+                """,
+                wallet_id, user_id
+            )
+            if result == "DELETE 1" and used:
+                await SuggestionRepository(self.conn).apply_deltas(
+                    user_id,
+                    [(r["description"], r["category_id"], -r["n"], r["last_used"]) for r in used],
+                )
+        if result == "DELETE 1":
+            # Deleting a wallet cascades to its transactions
+            await response_cache.bump(user_id, self.conn)
+            return True
+        return False
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime, timedelta, timezone
+from typing import Optional
 import asyncpg
 
 from ..core.database import get_db_conn
-from ..core.deps import get_current_active_superuser
-from ..schemas.user import UserResponse
+from ..core.deps import get_current_active_superuser, get_read_conn
+from ..core.metrics import metrics
+from ..core.pagination import decode_datetime_id_cursor, encode_cursor
+from ..core.response_cache import response_cache
+from ..core.scheduler import scheduler
+from ..core.security import invalidate_principal
+from ..repositories.stats_repo import PlatformStatsRepository
+from ..repositories.user_repo import UserRepository
+from ..schemas.user import AdminUserPage
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -20,66 +26,79 @@ class CategoryCreate(BaseModel):
 @router.get("/stats")
 async def get_admin_stats(
     current_user: dict = Depends(get_current_active_superuser),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function")
 ):
-    # Total users
-    total_users = await conn.fetchval("SELECT COUNT(*) FROM users")
-    
-    # Total transactions
-    total_transactions = await conn.fetchval("SELECT COUNT(*) FROM transactions")
-    
-    # Active users in last 24 hours (users who made transactions)
-    yesterday = datetime.now(timezone.utc) - timedelta(hours=24)
-    active_users_24h = await conn.fetchval(
-        """
-        SELECT COUNT(DISTINCT user_id) 
-        FROM transactions 
-        WHERE created_at >= $1
-        """,
-        yesterday
-    )
-    
-    # Total income/expense
-    totals = await conn.fetchrow(
-        """
-        SELECT 
-            COALESCE(SUM(CASE WHEN type = 'INCOME' THEN amount ELSE 0 END), 0) as total_income,
-            COALESCE(SUM(CASE WHEN type = 'EXPENSE' THEN amount ELSE 0 END), 0) as total_expense
-        FROM transactions
-        """
-    )
+    # Trigger-maintained counters: constant cost regardless of platform size
+    stats = await PlatformStatsRepository(conn).get_stats(active_hours=24)
     
     return {
-        "total_users": total_users,
-        "total_transactions": total_transactions,
-        "active_users_24h": active_users_24h,
-        "total_income": float(totals["total_income"]),
-        "total_expense": float(totals["total_expense"])
+        "total_users": stats["total_users"],
+        "total_transactions": stats["total_transactions"],
+        "active_users_24h": stats["active_users"],
+        "total_income": float(stats["total_income"]),
+        "total_expense": float(stats["total_expense"])
     }
 
 
-@router.get("/users", response_model=List[UserResponse])
+@router.get("/metrics")
+async def get_metrics(
+    current_user: dict = Depends(get_current_active_superuser),
+):
+    """In-process counters, gauges and histograms for this API worker."""
+    return metrics.snapshot()
+
+
+@router.get("/jobs")
+async def get_scheduled_jobs(
+    current_user: dict = Depends(get_current_active_superuser),
+):
+    """Scheduled maintenance jobs and their last-run status on this worker."""
+    return scheduler.snapshot()
+
+
+@router.get("/users", response_model=AdminUserPage)
 async def get_all_users(
+    limit: int = Query(default=25, ge=1, le=100, description="Users per page"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    q: Optional[str] = Query(
+        default=None, max_length=255, description="Email or username prefix (case-insensitive)"
+    ),
+    is_active: Optional[bool] = Query(default=None),
+    is_superuser: Optional[bool] = Query(default=None),
+    include_stats: bool = Query(
+        default=False, description="Add wallet/transaction counts and last activity"
+    ),
     current_user: dict = Depends(get_current_active_superuser),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
-    users = await conn.fetch(
-        """
-        SELECT 
-            u.id, u.email, u.username, u.is_superuser, u.is_active, u.created_at
-        FROM users u
-        ORDER BY u.created_at DESC
-        """
+    try:
+        after = decode_datetime_id_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+
+    users = await UserRepository(conn).list_for_admin(
+        limit=limit,
+        after=after,
+        search=q.strip() if q else None,
+        is_active=is_active,
+        is_superuser=is_superuser,
+        include_stats=include_stats,
     )
-    
-    return [UserResponse(**dict(user)) for user in users]
+
+    next_cursor = None
+    if len(users) == limit:
+        last = users[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return {"items": users, "next_cursor": next_cursor}
 
 
 @router.patch("/users/{user_id}/toggle-status")
 async def toggle_user_status(
     user_id: int,
     current_user: dict = Depends(get_current_active_superuser),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     # Prevent admin from deactivating themselves
     if user_id == current_user["id"]:
@@ -113,6 +132,7 @@ async def toggle_user_status(
         "UPDATE users SET is_active = $1 WHERE id = $2",
         new_status, user_id
     )
+    invalidate_principal(user_id)
     
     return {
         "id": user_id,
@@ -124,7 +144,7 @@ async def toggle_user_status(
 @router.get("/categories")
 async def get_global_categories(
     current_user: dict = Depends(get_current_active_superuser),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     categories = await conn.fetch(
         """
@@ -151,7 +171,7 @@ async def get_global_categories(
 async def create_global_category(
     category: CategoryCreate,
     current_user: dict = Depends(get_current_active_superuser),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     if category.type not in ["INCOME", "EXPENSE"]:
         raise HTTPException(
@@ -182,6 +202,8 @@ async def create_global_category(
         """,
         category.name, category.type, category.icon
     )
+    # Global categories appear in every user's category list
+    await response_cache.bump_global(conn)
     
     return {
         "id": row["id"],
@@ -196,7 +218,7 @@ async def create_global_category(
 async def delete_global_category(
     category_id: int,
     current_user: dict = Depends(get_current_active_superuser),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     # Check if category exists and is global
     category = await conn.fetchrow(
@@ -232,3 +254,4 @@ async def delete_global_category(
         "DELETE FROM categories WHERE id = $1",
         category_id
     )
+    await response_cache.bump_global(conn)
@@ -1,37 +1,33 @@
 from fastapi import APIRouter, Depends, Query
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, List, Literal, Optional, Tuple
 from datetime import date, datetime
 from calendar import monthrange
+import asyncio
 import asyncpg
 
-from ..core.database import get_db_conn
+from ..core.database import acquire
+from ..core.deps import get_read_conn, use_replica_for
+from ..core.etag import conditional_get
+from ..core.response_cache import response_cache
 from ..core.security import get_current_user
 from ..repositories.analytics_repo import AnalyticsRepository
 
-router = APIRouter(prefix="/analytics", tags=["Analytics"])
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+    dependencies=[Depends(conditional_get)],
+)
 
 
-@router.get("/category-breakdown")
-async def get_category_breakdown(
-    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
-    type: Optional[str] = Query("EXPENSE", description="Transaction type: INCOME or EXPENSE"),
-    current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
-    analytics_repo = AnalyticsRepository(conn)
-    
-    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    trans_type = type.upper() if type else "EXPENSE"
-    
-    breakdown = await analytics_repo.get_category_breakdown(
-        current_user["id"],
-        start,
-        end,
-        trans_type
+# --- Payload builders, shared by the single endpoints and /dashboard ---
+
+
+async def _category_breakdown(
+    conn: asyncpg.Connection, user_id: int, start: date, end: date, trans_type: str
+) -> List[dict]:
+    breakdown = await AnalyticsRepository(conn).get_category_breakdown(
+        user_id, start, end, trans_type
     )
-    
     return [
         {
             "name": item["name"],
@@ -42,27 +38,12 @@ async def get_category_breakdown(
     ]
 
 
-@router.get("/wallet-breakdown")
-async def get_wallet_breakdown(
-    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
-    type: Optional[str] = Query("EXPENSE", description="Transaction type: INCOME or EXPENSE"),
-    current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
-    analytics_repo = AnalyticsRepository(conn)
-    
-    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    trans_type = type.upper() if type else "EXPENSE"
-    
-    breakdown = await analytics_repo.get_wallet_breakdown(
-        current_user["id"],
-        start,
-        end,
-        trans_type
+async def _wallet_breakdown(
+    conn: asyncpg.Connection, user_id: int, start: date, end: date, trans_type: str
+) -> List[dict]:
+    breakdown = await AnalyticsRepository(conn).get_wallet_breakdown(
+        user_id, start, end, trans_type
     )
-    
     return [
         {
             "name": item["name"],
@@ -73,24 +54,10 @@ async def get_wallet_breakdown(
     ]
 
 
-@router.get("/period-summary")
-async def get_period_summary(
-    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
-    current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
-    analytics_repo = AnalyticsRepository(conn)
-    
-    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    
-    summary = await analytics_repo.get_period_summary(
-        current_user["id"],
-        start,
-        end
-    )
-    
+async def _period_summary(
+    conn: asyncpg.Connection, user_id: int, start: date, end: date
+) -> dict:
+    summary = await AnalyticsRepository(conn).get_period_summary(user_id, start, end)
     return {
         "total_income": float(summary["total_income"]),
         "total_expense": float(summary["total_expense"]),
@@ -99,27 +66,12 @@ async def get_period_summary(
     }
 
 
-@router.get("/daily-totals")
-async def get_daily_totals(
-    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
-    type: Optional[str] = Query("EXPENSE", description="Transaction type: INCOME or EXPENSE"),
-    current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
-    analytics_repo = AnalyticsRepository(conn)
-    
-    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    trans_type = type.upper() if type else "EXPENSE"
-    
-    totals = await analytics_repo.get_daily_totals(
-        current_user["id"],
-        start,
-        end,
-        trans_type
+async def _daily_totals(
+    conn: asyncpg.Connection, user_id: int, start: date, end: date, trans_type: str
+) -> List[dict]:
+    totals = await AnalyticsRepository(conn).get_daily_totals(
+        user_id, start, end, trans_type
     )
-    
     return [
         {
             "date": item["transaction_date"].isoformat(),
@@ -129,25 +81,10 @@ async def get_daily_totals(
     ]
 
 
-@router.get("/trend")
-async def get_cash_flow_trend(
-    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
-    current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
-    """Get daily income/expense trend for line chart visualization."""
-    analytics_repo = AnalyticsRepository(conn)
-    
-    start = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end = datetime.strptime(end_date, "%Y-%m-%d").date()
-    
-    trend = await analytics_repo.get_cash_flow_trend(
-        current_user["id"],
-        start,
-        end
-    )
-    
+async def _cash_flow_trend(
+    conn: asyncpg.Connection, user_id: int, start: date, end: date
+) -> List[dict]:
+    trend = await AnalyticsRepository(conn).get_cash_flow_trend(user_id, start, end)
     return [
         {
             "day": item["day"].isoformat(),
@@ -158,37 +95,29 @@ async def get_cash_flow_trend(
     ]
 
 
-@router.get("/comparison")
-async def get_monthly_comparison(
-    month: int = Query(..., ge=1, le=12, description="Month (1-12)"),
-    year: int = Query(..., ge=2000, le=2100, description="Year"),
-    current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
-    """Compare expenses between selected month and previous month."""
-    analytics_repo = AnalyticsRepository(conn)
-    
+async def _monthly_comparison(
+    conn: asyncpg.Connection, user_id: int, month: int, year: int
+) -> List[dict]:
     # Current month range
     current_start = date(year, month, 1)
     current_end = date(year, month, monthrange(year, month)[1])
-    
+
     # Previous month range (handle year rollover)
     if month == 1:
         prev_year, prev_month = year - 1, 12
     else:
         prev_year, prev_month = year, month - 1
-    
+
     prev_start = date(prev_year, prev_month, 1)
     prev_end = date(prev_year, prev_month, monthrange(prev_year, prev_month)[1])
-    
-    comparison = await analytics_repo.get_monthly_comparison(
-        current_user["id"],
+
+    comparison = await AnalyticsRepository(conn).get_monthly_comparison(
+        user_id,
         current_start,
         current_end,
         prev_start,
         prev_end
     )
-    
     return [
         {
             "category": item["category"],
@@ -197,3 +126,184 @@ async def get_monthly_comparison(
         }
         for item in comparison
     ]
+
+
+def _parse_range(start_date: str, end_date: str) -> Tuple[date, date]:
+    return (
+        datetime.strptime(start_date, "%Y-%m-%d").date(),
+        datetime.strptime(end_date, "%Y-%m-%d").date(),
+    )
+
+
+# --- Single-widget endpoints ---
+
+
+@router.get("/category-breakdown")
+async def get_category_breakdown(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    type: Optional[str] = Query("EXPENSE", description="Transaction type: INCOME or EXPENSE"),
+    current_user: dict = Depends(get_current_user),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function")
+):
+    start, end = _parse_range(start_date, end_date)
+    trans_type = type.upper() if type else "EXPENSE"
+
+    return await response_cache.get_or_compute(
+        current_user["id"],
+        "category-breakdown",
+        {"start": start, "end": end, "type": trans_type},
+        lambda: _category_breakdown(conn, current_user["id"], start, end, trans_type),
+    )
+
+
+@router.get("/wallet-breakdown")
+async def get_wallet_breakdown(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    type: Optional[str] = Query("EXPENSE", description="Transaction type: INCOME or EXPENSE"),
+    current_user: dict = Depends(get_current_user),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function")
+):
+    start, end = _parse_range(start_date, end_date)
+    trans_type = type.upper() if type else "EXPENSE"
+
+    return await response_cache.get_or_compute(
+        current_user["id"],
+        "wallet-breakdown",
+        {"start": start, "end": end, "type": trans_type},
+        lambda: _wallet_breakdown(conn, current_user["id"], start, end, trans_type),
+    )
+
+
+@router.get("/period-summary")
+async def get_period_summary(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    current_user: dict = Depends(get_current_user),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function")
+):
+    start, end = _parse_range(start_date, end_date)
+
+    return await response_cache.get_or_compute(
+        current_user["id"],
+        "period-summary",
+        {"start": start, "end": end},
+        lambda: _period_summary(conn, current_user["id"], start, end),
+    )
+
+
+@router.get("/daily-totals")
+async def get_daily_totals(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    type: Optional[str] = Query("EXPENSE", description="Transaction type: INCOME or EXPENSE"),
+    current_user: dict = Depends(get_current_user),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function")
+):
+    start, end = _parse_range(start_date, end_date)
+    trans_type = type.upper() if type else "EXPENSE"
+
+    return await response_cache.get_or_compute(
+        current_user["id"],
+        "daily-totals",
+        {"start": start, "end": end, "type": trans_type},
+        lambda: _daily_totals(conn, current_user["id"], start, end, trans_type),
+    )
+
+
+@router.get("/trend")
+async def get_cash_flow_trend(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    current_user: dict = Depends(get_current_user),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function")
+):
+    """Get daily income/expense trend for line chart visualization."""
+    start, end = _parse_range(start_date, end_date)
+
+    return await response_cache.get_or_compute(
+        current_user["id"],
+        "trend",
+        {"start": start, "end": end},
+        lambda: _cash_flow_trend(conn, current_user["id"], start, end),
+    )
+
+
+@router.get("/comparison")
+async def get_monthly_comparison(
+    month: int = Query(..., ge=1, le=12, description="Month (1-12)"),
+    year: int = Query(..., ge=2000, le=2100, description="Year"),
+    current_user: dict = Depends(get_current_user),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function")
+):
+    """Compare expenses between selected month and previous month."""
+    return await response_cache.get_or_compute(
+        current_user["id"],
+        "comparison",
+        {"month": month, "year": year},
+        lambda: _monthly_comparison(conn, current_user["id"], month, year),
+    )
+
+
+# --- Combined dashboard ---
+
+
+@router.get("/dashboard")
+async def get_dashboard(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    type: Optional[str] = Query("EXPENSE", description="Transaction type: INCOME or EXPENSE"),
+    group_by: Literal["category", "wallet"] = Query("category", description="Breakdown grouping"),
+    month: Optional[int] = Query(None, ge=1, le=12, description="Month to compare with the previous one"),
+    year: Optional[int] = Query(None, ge=2000, le=2100, description="Year of `month`"),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Everything the analysis page needs in one request.
+
+    Each widget shares its cache entry with the matching single endpoint.
+    Misses run concurrently, each on its own pooled connection, so wall time
+    is the slowest query rather than the sum of all of them.
+    """
+    user_id = current_user["id"]
+    start, end = _parse_range(start_date, end_date)
+    trans_type = type.upper() if type else "EXPENSE"
+    replica = await use_replica_for(user_id)
+
+    def widget(
+        endpoint: str,
+        params: dict,
+        build: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Awaitable[Any]:
+        async def compute():
+            async with acquire(replica=replica) as conn:
+                return await build(conn, user_id, *args)
+
+        return response_cache.get_or_compute(user_id, endpoint, params, compute)
+
+    range_params = {"start": start, "end": end}
+    typed_params = {"start": start, "end": end, "type": trans_type}
+    if group_by == "wallet":
+        breakdown = widget("wallet-breakdown", typed_params, _wallet_breakdown, start, end, trans_type)
+    else:
+        breakdown = widget("category-breakdown", typed_params, _category_breakdown, start, end, trans_type)
+
+    parts = [
+        breakdown,
+        widget("period-summary", range_params, _period_summary, start, end),
+        widget("trend", range_params, _cash_flow_trend, start, end),
+    ]
+    if month is not None and year is not None:
+        parts.append(
+            widget("comparison", {"month": month, "year": year}, _monthly_comparison, month, year)
+        )
+
+    results = await asyncio.gather(*parts)
+    return {
+        "breakdown": results[0],
+        "summary": results[1],
+        "trend": results[2],
+        "comparison": results[3] if len(results) > 3 else [],
+    }
@@ -15,6 +15,7 @@ from ..core.security import (
     limiter,
     create_password_reset_token,
     verify_password_reset_token,
+    invalidate_principal,
 )
 from ..schemas.user import (
     UserCreate,
@@ -46,7 +47,7 @@ REFRESH_COOKIE_PATH = "/"
 async def register(
     request: Request,
     user_data: UserCreate,
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     _ = request.client  # touch request to satisfy rate limiter usage
     user_repo = UserRepository(conn)
@@ -86,7 +87,7 @@ async def login(
     request: Request,
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     user_repo = UserRepository(conn)
     token_repo = RefreshTokenRepository(conn)
@@ -157,7 +158,7 @@ async def refresh_access_token(
     request: Request,
     response: Response,
     refresh_token: str = Cookie(None, alias=REFRESH_COOKIE_NAME),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     if not refresh_token:
         raise HTTPException(
@@ -220,7 +221,7 @@ async def refresh_access_token(
 async def logout(
     response: Response,
     refresh_token: str = Cookie(None, alias=REFRESH_COOKIE_NAME),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     if refresh_token:
         token_repo = RefreshTokenRepository(conn)
@@ -245,7 +246,7 @@ async def logout(
 async def logout_all_devices(
     response: Response,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     token_repo = RefreshTokenRepository(conn)
     revoked_count = await token_repo.revoke_all_for_user(current_user["id"])
@@ -278,7 +279,7 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 )
 async def get_sessions(
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     token_repo = RefreshTokenRepository(conn)
     sessions = await token_repo.get_active_sessions(current_user["id"])
@@ -294,7 +295,7 @@ async def get_sessions(
 async def forgot_password(
     request: Request,
     data: ForgotPasswordRequest,
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     """Request password reset. Always returns success for security."""
     _ = request.client  # touch request for rate limiter
@@ -321,7 +322,7 @@ async def forgot_password(
     description="Reset password using valid reset token.",
 )
 async def reset_password(
-    data: ResetPasswordRequest, conn: asyncpg.Connection = Depends(get_db_conn)
+    data: ResetPasswordRequest, conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     """Reset user password with valid token."""
     # Verify the token
@@ -346,5 +347,6 @@ async def reset_password(
     await conn.execute(
         "UPDATE users SET password_hash = $1 WHERE id = $2", new_hash, user["id"]
     )
+    invalidate_principal(user["id"])
 
     return {"message": "Password reset successfully"}
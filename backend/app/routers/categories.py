@@ -3,6 +3,7 @@ from typing import List, Optional
 import asyncpg
 
 from ..core.database import get_db_conn
+from ..core.etag import conditional_get
 from ..core.security import get_current_user
 from ..schemas.category import CategoryCreate, CategoryResponse
 from ..repositories.category_repo import CategoryRepository
@@ -10,11 +11,11 @@ from ..repositories.category_repo import CategoryRepository
 router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
-@router.get("", response_model=List[CategoryResponse])
+@router.get("", response_model=List[CategoryResponse], dependencies=[Depends(conditional_get)])
 async def get_categories(
     type: Optional[str] = None,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     category_repo = CategoryRepository(conn)
     
@@ -30,7 +31,7 @@ async def get_categories(
 async def create_category(
     category_data: CategoryCreate,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     category_repo = CategoryRepository(conn)
     
@@ -53,7 +54,7 @@ async def create_category(
 async def delete_category(
     category_id: int,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     category_repo = CategoryRepository(conn)
     
@@ -3,11 +3,17 @@ Receipts Router - Receipt scanning endpoints using AI vision.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+import asyncio
+import time
 import magic
 
+from ..core.metrics import metrics
 from ..core.security import get_current_user
+from ..services.image_preprocess import pipeline_version, preprocess_receipt_image
 from ..services.ocr_service import ReceiptScanner, get_receipt_scanner
-from ..schemas.receipt import ReceiptScanResponse, ReceiptItem
+from ..services.receipt_cache import ReceiptScanCache, get_receipt_scan_cache
+from ..services.receipt_jobs import ReceiptJob, ReceiptJobQueue, get_receipt_jobs
+from ..schemas.receipt import ReceiptScanJob, ReceiptScanResponse, ReceiptItem
 
 router = APIRouter(prefix="/receipts", tags=["Receipts"])
 
@@ -19,42 +25,75 @@ ALLOWED_MIME_TYPES = {
     "image/webp": "image/webp",
 }
 
+# Histogram buckets (bytes) for upload sizes before/after pre-processing
+IMAGE_SIZE_BUCKETS = (
+    50_000, 100_000, 250_000, 500_000, 1_000_000, 2_000_000, 3_000_000, 5_000_000,
+)
+
+
+def _job_response(job: ReceiptJob) -> ReceiptScanJob:
+    """Map a job and its raw scanner output to the response model."""
+    result = None
+    if job.result is not None:
+        items = [
+            ReceiptItem(
+                name=item.get("name", "Unknown"),
+                price=item.get("price", 0),
+                category_guess=item.get("category_guess"),
+            )
+            for item in job.result.get("items", [])
+        ]
+        result = ReceiptScanResponse(
+            receipt_date=job.result.get("date"),
+            total_amount=job.result.get("total_amount"),
+            items=items,
+        )
+
+    return ReceiptScanJob(
+        job_id=job.id,
+        status=job.status,
+        result=result,
+        error=job.error,
+        error_status=job.error_status,
+    )
+
 
 @router.post(
     "/scan",
-    response_model=ReceiptScanResponse,
-    status_code=status.HTTP_200_OK,
+    response_model=ReceiptScanJob,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Scan a receipt image",
     description="""
     Upload a receipt image to extract structured data using AI vision.
     
     **Supported formats:** JPEG, PNG, WebP
     
-    **Returns:** Date, total amount, and list of items with prices and category guesses.
+    **Returns:** A queued scan job. Poll `GET /receipts/jobs/{job_id}` until its
+    status is `done` (date, total amount and items) or `failed`.
     
     **Error Codes:**
     - 400: Invalid file type
     - 413: Payload too large (Max 5MB)
     - 415: Unsupported Media Type (Invalid Magic Bytes)
-    - 429: Daily AI quota exceeded (use manual input)
-    - 500: AI processing failed
+    - 503: Scan queue is full, retry later
     """,
     responses={
-        200: {"description": "Receipt scanned successfully"},
+        202: {"description": "Receipt accepted for scanning"},
         400: {"description": "Invalid file type"},
         413: {"description": "Payload Too Large"},
         415: {"description": "Unsupported Media Type"},
-        429: {"description": "Daily AI Quota Exceeded"},
-        500: {"description": "AI Processing Failed"},
+        503: {"description": "Scan Queue Full"},
     },
 )
 async def scan_receipt(
     file: UploadFile = File(..., description="Receipt image file (JPEG, PNG, WebP)"),
     current_user: dict = Depends(get_current_user),
     scanner: ReceiptScanner = Depends(get_receipt_scanner),
-) -> ReceiptScanResponse:
+    jobs: ReceiptJobQueue = Depends(get_receipt_jobs),
+    cache: ReceiptScanCache = Depends(get_receipt_scan_cache),
+) -> ReceiptScanJob:
     """
-    Scan a receipt image and extract structured data.
+    Validate a receipt image and queue it for scanning.
 
     Uses Google Gemini Flash Vision to:
     - Extract item names and prices
@@ -95,21 +134,54 @@ async def scan_receipt(
     # Get the correct MIME type for Gemini
     mime_type = ALLOWED_MIME_TYPES[content_type]
 
-    # Scan the receipt
-    result = await scanner.scan_image(image_bytes, mime_type)
+    # Identical uploads are answered from the scan cache without a Gemini call.
+    # The key is computed on the original bytes, before pre-processing.
+    cache_key = cache.make_key(
+        image_bytes, f"{scanner.cache_version}:{pipeline_version()}"
+    )
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return _job_response(await jobs.complete(current_user["id"], cached))
 
-    # Map result to response model
-    items = [
-        ReceiptItem(
-            name=item.get("name", "Unknown"),
-            price=item.get("price", 0),
-            category_guess=item.get("category_guess"),
-        )
-        for item in result.get("items", [])
-    ]
+    # Orient, downscale, grayscale and re-encode off the event loop
+    started = time.perf_counter()
+    processed_bytes, processed_mime = await asyncio.to_thread(
+        preprocess_receipt_image, image_bytes, mime_type
+    )
+    metrics.observe("receipt_image.preprocess_seconds", time.perf_counter() - started)
+    metrics.observe("receipt_image.original_bytes", len(image_bytes), buckets=IMAGE_SIZE_BUCKETS)
+    metrics.observe("receipt_image.processed_bytes", len(processed_bytes), buckets=IMAGE_SIZE_BUCKETS)
 
-    return ReceiptScanResponse(
-        receipt_date=result.get("date"),
-        total_amount=result.get("total_amount"),
-        items=items,
+    job = await jobs.submit(
+        current_user["id"],
+        processed_bytes,
+        processed_mime,
+        scanner,
+        cache_key=cache_key,
     )
+    return _job_response(job)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=ReceiptScanJob,
+    summary="Get receipt scan job status",
+    description="""
+    Poll a receipt scan job created by `POST /receipts/scan`.
+    
+    When `status` is `failed`, `error_status` carries the original error code
+    (429 when the daily AI quota is exceeded, 500 for processing failures).
+    """,
+    responses={404: {"description": "Job not found or expired"}},
+)
+async def get_scan_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user),
+    jobs: ReceiptJobQueue = Depends(get_receipt_jobs),
+) -> ReceiptScanJob:
+    job = await jobs.get(job_id, current_user["id"])
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Scan job not found"
+        )
+    return _job_response(job)
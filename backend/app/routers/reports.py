@@ -1,80 +1,114 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
 from datetime import date
-from io import BytesIO, StringIO
+from typing import AsyncIterator, Optional
+from io import StringIO
 import csv
-import xlsxwriter
 import asyncpg
 
-from ..core.database import get_db_conn
+from ..core.config import settings
+from ..core import database
+from ..core.database import DBSession
+from ..core.deps import get_read_conn, use_replica_for
+from ..core.etag import conditional_get
+from ..core.pagination import decode_date_id_cursor, encode_cursor
+from ..core.responses import raw_json
 from ..core.security import get_current_user
 from ..repositories.report_repo import ReportRepository
+from ..services.render_service import RenderService, get_render_service
+from ..services.renderers import render_report_excel
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
 
-@router.get("/list")
+@router.get("/list", dependencies=[Depends(conditional_get)])
 async def get_report_list(
+    response: Response,
     start_date: date = Query(...),
     end_date: date = Query(...),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; omit for the full range"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor"),
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function")
 ):
+    try:
+        after = decode_date_id_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
     repo = ReportRepository(conn)
-    data = await repo.get_report_data(current_user["id"], start_date, end_date)
+    data = await repo.get_report_data(
+        current_user["id"], start_date, end_date, limit=limit, after=after
+    )
     summary = await repo.get_report_summary(current_user["id"], start_date, end_date)
+
+    next_cursor = None
+    if limit is not None and len(data) == limit:
+        next_cursor = encode_cursor(data[-1]["transaction_date"], data[-1]["id"])
+    
+    # Rows go to orjson as fetched rather than being rebuilt field by field
+    return raw_json(
+        {
+            "transactions": data,
+            "summary": {
+                "total_transactions": summary["total_transactions"],
+                "total_income": summary["total_income"],
+                "total_expense": summary["total_expense"]
+            },
+            "next_cursor": next_cursor
+        },
+        response,
+    )
+
+
+async def _iter_csv(user_id: int, start_date: date, end_date: date) -> AsyncIterator[str]:
+    """
+    Yield the CSV export in chunks of EXPORT_CSV_CHUNK_ROWS rows.
+
+    The body is streamed after the handler returns, so it holds its own
+    connection for the duration of the stream.
+    """
+    chunk_rows = max(settings.EXPORT_CSV_CHUNK_ROWS, 1)
+    output = StringIO()
+    writer = csv.writer(output)
     
-    return {
-        "transactions": [
-            {
-                "transaction_date": str(row["transaction_date"]),
-                "wallet_name": row["wallet_name"],
-                "category_name": row["category_name"],
-                "type": row["type"],
-                "description": row["description"] or "",
-                "amount": float(row["amount"])
-            }
-            for row in data
-        ],
-        "summary": {
-            "total_transactions": summary["total_transactions"],
-            "total_income": float(summary["total_income"]),
-            "total_expense": float(summary["total_expense"])
-        }
-    }
+    writer.writerow(["Date", "Wallet", "Category", "Type", "Description", "Amount"])
+    pending = 0
+    
+    async with database.acquire(replica=await use_replica_for(user_id)) as conn:
+        repo = ReportRepository(conn)
+        async for row in repo.stream_report_data(user_id, start_date, end_date, prefetch=chunk_rows):
+            writer.writerow([
+                row["transaction_date"].strftime("%d/%m/%Y"),
+                row["wallet_name"],
+                row["category_name"],
+                row["type"],
+                row["description"] or "",
+                float(row["amount"])
+            ])
+            pending += 1
+            
+            if pending >= chunk_rows:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+                pending = 0
+    
+    remainder = output.getvalue()
+    if remainder:
+        yield remainder
 
 
 @router.get("/export/csv")
 async def export_csv(
     start_date: date = Query(...),
     end_date: date = Query(...),
-    current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    current_user: dict = Depends(get_current_user)
 ):
-    repo = ReportRepository(conn)
-    data = await repo.get_report_data(current_user["id"], start_date, end_date)
-    
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    writer.writerow(["Date", "Wallet", "Category", "Type", "Description", "Amount"])
-    
-    for row in data:
-        writer.writerow([
-            row["transaction_date"].strftime("%d/%m/%Y"),
-            row["wallet_name"],
-            row["category_name"],
-            row["type"],
-            row["description"] or "",
-            float(row["amount"])
-        ])
-    
-    output.seek(0)
-    
     filename = f"transactions_{start_date}_{end_date}.csv"
     
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _iter_csv(current_user["id"], start_date, end_date),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
@@ -85,116 +119,39 @@ async def export_excel(
     start_date: date = Query(...),
     end_date: date = Query(...),
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: DBSession = Depends(get_read_conn, scope="function"),
+    renderer: RenderService = Depends(get_render_service)
 ):
     repo = ReportRepository(conn)
     data = await repo.get_report_data(current_user["id"], start_date, end_date)
     summary = await repo.get_report_summary(current_user["id"], start_date, end_date)
     
-    output = BytesIO()
-    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-    worksheet = workbook.add_worksheet("Transactions")
-    
-    # Formats
-    header_format = workbook.add_format({
-        'bold': True,
-        'align': 'center',
-        'valign': 'vcenter',
-        'bg_color': '#D9D9D9',
-        'border': 1,
-        'border_color': '#000000'
-    })
-    
-    date_format = workbook.add_format({
-        'num_format': 'dd/mm/yyyy',
-        'align': 'center',
-        'border': 1
-    })
-    
-    text_format = workbook.add_format({
-        'align': 'left',
-        'border': 1
-    })
-    
-    text_center_format = workbook.add_format({
-        'align': 'center',
-        'border': 1
-    })
-    
-    currency_income_format = workbook.add_format({
-        'num_format': '_("Rp"* #,##0_);_("Rp"* (#,##0);_("Rp"* "-"_);_(@_)',
-        'align': 'right',
-        'border': 1,
-        'font_color': '#006400'
-    })
-    
-    currency_expense_format = workbook.add_format({
-        'num_format': '_("Rp"* #,##0_);_("Rp"* (#,##0);_("Rp"* "-"_);_(@_)',
-        'align': 'right',
-        'border': 1,
-        'font_color': '#8B0000'
-    })
-    
-    title_format = workbook.add_format({
-        'bold': True,
-        'font_size': 14,
-        'align': 'left'
-    })
-    
-    summary_label_format = workbook.add_format({
-        'bold': True,
-        'align': 'right'
-    })
-    
-    summary_value_format = workbook.add_format({
-        'num_format': '_("Rp"* #,##0_);_("Rp"* (#,##0);_("Rp"* "-"_);_(@_)',
-        'bold': True
-    })
-    
-    # Title
-    worksheet.write(0, 0, f"Transaction Report: {start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}", title_format)
-    
-    # Summary
-    worksheet.write(2, 0, "Total Income:", summary_label_format)
-    worksheet.write(2, 1, float(summary["total_income"]), summary_value_format)
-    worksheet.write(3, 0, "Total Expense:", summary_label_format)
-    worksheet.write(3, 1, float(summary["total_expense"]), summary_value_format)
-    worksheet.write(4, 0, "Net:", summary_label_format)
-    worksheet.write(4, 1, float(summary["total_income"]) - float(summary["total_expense"]), summary_value_format)
-    
-    # Headers
-    headers = ["Date", "Wallet", "Category", "Type", "Description", "Amount"]
-    header_row = 6
-    
-    for col, header in enumerate(headers):
-        worksheet.write(header_row, col, header, header_format)
-    
-    # Data
-    for row_num, row in enumerate(data, start=header_row + 1):
-        worksheet.write(row_num, 0, row["transaction_date"], date_format)
-        worksheet.write(row_num, 1, row["wallet_name"], text_format)
-        worksheet.write(row_num, 2, row["category_name"], text_format)
-        worksheet.write(row_num, 3, row["type"], text_center_format)
-        worksheet.write(row_num, 4, row["description"] or "", text_format)
-        
-        amount_format = currency_income_format if row["type"] == "INCOME" else currency_expense_format
-        worksheet.write(row_num, 5, float(row["amount"]), amount_format)
-    
-    # Column widths
-    worksheet.set_column(0, 0, 12)  # Date
-    worksheet.set_column(1, 1, 15)  # Wallet
-    worksheet.set_column(2, 2, 15)  # Category
-    worksheet.set_column(3, 3, 10)  # Type
-    worksheet.set_column(4, 4, 30)  # Description
-    worksheet.set_column(5, 5, 18)  # Amount
-    
-    workbook.close()
-    output.seek(0)
-    
+    rows = [
+        (
+            row["transaction_date"],
+            row["wallet_name"],
+            row["category_name"],
+            row["type"],
+            row["description"] or "",
+            float(row["amount"]),
+        )
+        for row in data
+    ]
+    # Hand the connection back before the (possibly long) render
+    await conn.release()
+    content = await renderer.render(
+        render_report_excel,
+        rows,
+        float(summary["total_income"]),
+        float(summary["total_expense"]),
+        start_date,
+        end_date,
+    )
+
     filename = f"transactions_{start_date}_{end_date}.xlsx"
     
-    return StreamingResponse(
-        output,
+    return Response(
+        content=content,
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
@@ -1,33 +1,37 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import date
 from decimal import Decimal
 import asyncpg
-import io
-from fastapi.responses import StreamingResponse
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-
-from ..core.database import get_db_conn
+from fastapi.responses import Response
+
+from ..core.database import DBSession, get_db_conn
+from ..core.deps import get_read_conn
+from ..core.etag import conditional_get
+from ..core.pagination import decode_date_id_cursor, encode_cursor
 from ..core.security import get_current_user
 from ..schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
     TransactionResponse,
+    TransactionPage,
+    TransactionSearchHit,
     TransferRequest,
 )
 from ..repositories.transaction_repo import TransactionRepository
 from ..repositories.wallet_repo import WalletRepository
 from ..services.transaction_service import TransactionService
+from ..services.render_service import RenderService, get_render_service
+from ..services.suggestions import SuggestionService, get_suggestion_service
+from ..services.renderers import render_transactions_pdf
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
 
 @router.get(
     "",
-    response_model=List[TransactionResponse],
+    response_model=Union[List[TransactionResponse], TransactionPage],
+    dependencies=[Depends(conditional_get)],
     summary="List Transactions",
     description="""
 Retrieve all transactions for the authenticated user.
@@ -35,11 +39,17 @@ Retrieve all transactions for the authenticated user.
 **Filters:**
 - `type`: Filter by `INCOME` or `EXPENSE`
 - `start_date` / `end_date`: Date range filter (if provided, returns ALL in range)
-- `limit`: Maximum results to return (default: 10, max: 100) - ignored if date range provided
+- `limit`: Maximum results to return (default: 20, max: 100)
 - `offset`: Pagination offset for skipping records
+
+**Cursor Pagination:**
+- Pass `cursor` (empty for the first page) to switch to keyset mode
+- Returns `{"items": [...], "next_cursor": "..."}`; pass `next_cursor` back as `cursor`
+- Page latency stays flat regardless of depth; `offset`/`skip` are ignored
     """,
     responses={
-        200: {"description": "List of transactions"},
+        200: {"description": "List of transactions, or a page when `cursor` is given"},
+        400: {"description": "Invalid cursor"},
         401: {"description": "Not authenticated"},
         500: {"description": "Internal server error"},
     },
@@ -64,8 +74,11 @@ async def get_transactions(
     wallet_id: Optional[int] = Query(default=None, description="Filter by wallet ID"),
     category_id: Optional[int] = Query(default=None, description="Filter by category ID"),
     search: Optional[str] = Query(default=None, description="Search description or category"),
+    cursor: Optional[str] = Query(
+        default=None, description="Keyset cursor; empty string requests the first page"
+    ),
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function"),
 ):
     trans_repo = TransactionRepository(conn)
 
@@ -73,7 +86,18 @@ async def get_transactions(
     if type and type.upper() in ["INCOME", "EXPENSE"]:
         trans_type = type.upper()
 
-    effective_offset = skip if skip is not None else offset
+    try:
+        after = decode_date_id_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+
+    # Cursor mode pages by key alone, including the first (empty cursor) page
+    if cursor is not None:
+        effective_offset = 0
+    else:
+        effective_offset = skip if skip is not None else offset
 
     transactions = await trans_repo.get_by_user(
         current_user["id"],
@@ -85,15 +109,30 @@ async def get_transactions(
         wallet_id=wallet_id,
         category_id=category_id,
         search=search,
+        after=after,
     )
-    return transactions
+
+    if cursor is None:
+        return transactions
+
+    next_cursor = None
+    if transactions and len(transactions) == limit:
+        last = transactions[-1]
+        next_cursor = encode_cursor(last["transaction_date"], last["id"])
+    return {"items": transactions, "next_cursor": next_cursor}
 
 
 @router.get(
     "/suggestions",
     response_model=List[str],
+    dependencies=[Depends(conditional_get)],
     summary="Get Description Suggestions",
-    description="Retrieve unique descriptions from user's transaction history for autocomplete.",
+    description="""
+Autocomplete for transaction descriptions.
+
+Returns the user's most used descriptions starting with `q` (case- and
+whitespace-insensitive), optionally within `category_id`, at most `limit`.
+    """,
     responses={
         200: {"description": "List of unique descriptions"},
         401: {"description": "Not authenticated"},
@@ -102,12 +141,61 @@ async def get_transactions(
 async def get_description_suggestions(
     q: Optional[str] = Query(None, description="Search keyword typed by user"),
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    limit: int = Query(default=10, ge=1, le=50, description="Max suggestions"),
+    current_user: dict = Depends(get_current_user),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function"),
+    suggestions: SuggestionService = Depends(get_suggestion_service),
+):
+    return await suggestions.suggest(
+        conn, current_user["id"], q, category_id=category_id, limit=limit
+    )
+
+
+@router.get(
+    "/search",
+    response_model=List[TransactionSearchHit],
+    summary="Search Transactions",
+    description="""
+Full-text search across the user's transactions.
+
+Matches descriptions (Indonesian stemming, exact tokens and fuzzy trigram
+matching for typos) and category names. Results are ranked by relevance,
+weighted towards recent transactions, and include a `highlight` with the
+matched terms wrapped in `<mark>` (the rest of the text is HTML-escaped).
+Surrounding whitespace is ignored; `q` must still be at least 2 characters.
+    """,
+    responses={
+        200: {"description": "Ranked search results"},
+        400: {"description": "Query shorter than 2 characters"},
+        401: {"description": "Not authenticated"},
+    },
+)
+async def search_transactions(
+    q: str = Query(..., min_length=2, max_length=100, description="Search query"),
+    limit: int = Query(default=20, ge=1, le=100, description="Max results"),
+    type: Optional[str] = Query(default=None, description="Filter by INCOME or EXPENSE"),
+    wallet_id: Optional[int] = Query(default=None, description="Filter by wallet ID"),
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function"),
 ):
+    query = q.strip()
+    if len(query) < 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must be at least 2 characters",
+        )
+
+    trans_type = None
+    if type and type.upper() in ["INCOME", "EXPENSE"]:
+        trans_type = type.upper()
+
     trans_repo = TransactionRepository(conn)
-    return await trans_repo.get_distinct_descriptions(
-        current_user["id"], category_id=category_id, search_term=q
+    return await trans_repo.search(
+        current_user["id"],
+        query,
+        limit=limit,
+        trans_type=trans_type,
+        wallet_id=wallet_id,
     )
 
 
@@ -124,7 +212,8 @@ async def export_transactions_pdf(
     search: Optional[str] = Query(None),
     type: Optional[str] = Query(None),
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: DBSession = Depends(get_read_conn, scope="function"),
+    renderer: RenderService = Depends(get_render_service),
 ):
     trans_repo = TransactionRepository(conn)
     wallet_repo = WalletRepository(conn)
@@ -139,82 +228,36 @@ async def export_transactions_pdf(
     if type and type.upper() in ["INCOME", "EXPENSE"]:
         trans_type = type.upper()
 
-    transactions = await trans_repo.get_by_user(
+    transactions = []
+    async for batch in trans_repo.iter_by_user(
         current_user["id"],
-        limit=None,
-        offset=0,
         trans_type=trans_type,
         start_date=start_date,
         end_date=end_date,
         wallet_id=wallet_id,
         category_id=category_id,
         search=search,
-    )
-
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=letter,
-        rightMargin=36,
-        leftMargin=36,
-        topMargin=36,
-        bottomMargin=36,
-    )
-    elements = []
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle(
-        "DocTitle",
-        parent=styles["Heading1"],
-        fontSize=18,
-        leading=22,
-        textColor=colors.HexColor("#212121"),
-        spaceAfter=4,
-    )
-    subtitle_style = ParagraphStyle(
-        "DocSubtitle",
-        parent=styles["Normal"],
-        fontSize=9,
-        textColor=colors.HexColor("#75758a"),
-        spaceAfter=16,
-    )
+    ):
+        transactions.extend(batch)
 
-    elements.append(Paragraph(f"Transaction Report - {wallet_name}", title_style))
-    date_label = f"Period: {start_date or 'Beginning'} to {end_date or 'Present'}"
-    elements.append(Paragraph(date_label, subtitle_style))
-
-    data = [["Date", "Category", "Description", "Type", "Amount"]]
-    for t in transactions:
-        amount_str = f"IDR {float(t['amount']):,.0f}"
-        data.append([
+    rows = [
+        (
             str(t["transaction_date"]),
             t["category_name"] or "-",
             t["description"] or "-",
             t["type"],
-            amount_str,
-        ])
-
-    table = Table(data, colWidths=[75, 95, 210, 60, 100])
-    table.setStyle(
-        TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#eeece7")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.HexColor("#212121")),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-            ("TOPPADDING", (0, 0), (-1, -1), 6),
-            ("ALIGN", (4, 0), (4, -1), "RIGHT"),
-            ("LINEBELOW", (0, 0), (-1, -1), 0.5, colors.HexColor("#d9d9dd")),
-        ])
-    )
-
-    elements.append(table)
-    doc.build(elements)
-    buffer.seek(0)
+            float(t["amount"]),
+        )
+        for t in transactions
+    ]
+    date_label = f"Period: {start_date or 'Beginning'} to {end_date or 'Present'}"
+    # Hand the connection back before the (possibly long) render
+    await conn.release()
+    content = await renderer.render(render_transactions_pdf, rows, wallet_name, date_label)
 
     clean_filename = f"statement_{wallet_name.lower().replace(' ', '_')}.pdf"
-    return StreamingResponse(
-        buffer,
+    return Response(
+        content=content,
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename={clean_filename}"},
     )
@@ -237,7 +280,7 @@ async def export_transactions_pdf(
 async def create_transaction(
     trans_data: TransactionCreate,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     service = TransactionService(conn)
     return await service.create_transaction(current_user["id"], trans_data)
@@ -245,6 +288,7 @@ async def create_transaction(
 
 @router.get(
     "/summary",
+    dependencies=[Depends(conditional_get)],
     summary="Get Financial Summary",
     description="""
 Get a summary of the user's financial status.
@@ -262,7 +306,7 @@ Get a summary of the user's financial status.
 )
 async def get_summary(
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_read_conn, scope="function"),
 ):
     trans_repo = TransactionRepository(conn)
     wallet_repo = WalletRepository(conn)
@@ -304,7 +348,7 @@ async def update_transaction(
     transaction_id: int,
     trans_data: TransactionUpdate,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     service = TransactionService(conn)
     return await service.update_transaction(transaction_id, current_user["id"], trans_data)
@@ -324,7 +368,7 @@ async def update_transaction(
 async def delete_transaction(
     transaction_id: int,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     trans_repo = TransactionRepository(conn)
     deleted = await trans_repo.delete(transaction_id, current_user["id"])
@@ -359,7 +403,7 @@ Transfer funds between two wallets owned by the authenticated user.
 async def transfer_funds(
     data: TransferRequest,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     service = TransactionService(conn)
     return await service.transfer_funds(current_user["id"], data)
@@ -389,7 +433,7 @@ Create multiple transactions in a single atomic operation.
 async def batch_create_transactions(
     transactions_data: List[TransactionCreate],
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     service = TransactionService(conn)
     return await service.batch_create_transactions(current_user["id"], transactions_data)
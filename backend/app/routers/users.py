@@ -2,7 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 import asyncpg
 
 from backend.app.core.database import get_db_conn
-from backend.app.core.security import get_current_user, verify_password, hash_password
+from backend.app.core.security import (
+    get_current_user,
+    hash_password,
+    invalidate_principal,
+    verify_password,
+)
 from backend.app.schemas.user import UserUpdate, UserPasswordUpdate, UserResponse
 from backend.app.repositories.user_repo import UserRepository
 
@@ -14,12 +19,13 @@ router = APIRouter(prefix="/users", tags=["Users"])
 async def update_profile(
     data: UserUpdate,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     """Update current user's profile (username)."""
     repo = UserRepository(conn)
 
     updated_user = await repo.update_username(current_user["id"], data.username)
+    invalidate_principal(current_user["id"])
 
     if not updated_user:
         raise HTTPException(
@@ -33,7 +39,7 @@ async def update_profile(
 async def change_password(
     data: UserPasswordUpdate,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn),
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function"),
 ):
     """Change current user's password."""
     repo = UserRepository(conn)
@@ -56,6 +62,7 @@ async def change_password(
     # Hash new password and update
     new_hash = hash_password(data.new_password)
     success = await repo.update_password(current_user["id"], new_hash)
+    invalidate_principal(current_user["id"])
 
     if not success:
         raise HTTPException(
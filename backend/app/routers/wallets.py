@@ -3,6 +3,7 @@ from typing import List
 import asyncpg
 
 from ..core.database import get_db_conn
+from ..core.etag import conditional_get
 from ..core.security import get_current_user
 from ..schemas.wallet import WalletCreate, WalletResponse
 from ..repositories.wallet_repo import WalletRepository
@@ -10,10 +11,10 @@ from ..repositories.wallet_repo import WalletRepository
 router = APIRouter(prefix="/wallets", tags=["Wallets"])
 
 
-@router.get("", response_model=List[WalletResponse])
+@router.get("", response_model=List[WalletResponse], dependencies=[Depends(conditional_get)])
 async def get_wallets(
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     wallet_repo = WalletRepository(conn)
     wallets = await wallet_repo.get_by_user(current_user["id"])
@@ -24,7 +25,7 @@ async def get_wallets(
 async def create_wallet(
     wallet_data: WalletCreate,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     wallet_repo = WalletRepository(conn)
     wallet = await wallet_repo.create(
@@ -36,11 +37,11 @@ async def create_wallet(
     return wallet
 
 
-@router.get("/{wallet_id}", response_model=WalletResponse)
+@router.get("/{wallet_id}", response_model=WalletResponse, dependencies=[Depends(conditional_get)])
 async def get_wallet(
     wallet_id: int,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     wallet_repo = WalletRepository(conn)
     wallet = await wallet_repo.get_by_id(wallet_id, current_user["id"])
@@ -58,7 +59,7 @@ async def get_wallet(
 async def delete_wallet(
     wallet_id: int,
     current_user: dict = Depends(get_current_user),
-    conn: asyncpg.Connection = Depends(get_db_conn)
+    conn: asyncpg.Connection = Depends(get_db_conn, scope="function")
 ):
     wallet_repo = WalletRepository(conn)
     wallet = await wallet_repo.get_by_id(wallet_id, current_user["id"])
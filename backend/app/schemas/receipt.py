@@ -72,6 +72,40 @@ class ReceiptScanResponse(BaseModel):
     )
 
 
+class ReceiptScanJob(BaseModel):
+    """Schema for an asynchronous receipt scan job."""
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "job_id": "3f1c0d9a6b2e4c8f9a7d5e3b1c0f2a4d",
+                "status": "done",
+                "result": {
+                    "date": "2024-12-01",
+                    "total_amount": 3500,
+                    "items": [
+                        {"name": "Indomie Goreng", "price": 3500, "category_guess": "Food"}
+                    ],
+                },
+                "error": None,
+                "error_status": None,
+            }
+        }
+    )
+
+    job_id: str = Field(..., description="Identifier to poll the job with")
+    status: Literal["queued", "processing", "done", "failed"] = Field(
+        ..., description="Current job state"
+    )
+    result: Optional[ReceiptScanResponse] = Field(
+        None, description="Scan result once status is done"
+    )
+    error: Optional[str] = Field(None, description="Failure reason when status is failed")
+    error_status: Optional[int] = Field(
+        None, description="HTTP status the scan failed with (e.g. 429 quota exceeded)"
+    )
+
+
 class ReceiptScanError(BaseModel):
     """Schema for error responses."""
 
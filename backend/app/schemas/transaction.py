@@ -2,7 +2,7 @@ import re
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 
 # XSS Prevention Pattern
 XSS_PATTERN = re.compile(r'<script|javascript:|on\w+\s*=', re.IGNORECASE)
@@ -129,3 +129,27 @@ class TransactionResponse(BaseModel):
     created_at: datetime
     category_name: Optional[str] = None
     wallet_name: Optional[str] = None
+
+
+class TransactionSearchHit(TransactionResponse):
+    """Schema for a ranked full-text search result."""
+
+    rank: float = Field(..., description="Relevance, weighted towards recent transactions")
+    highlight: str = Field(
+        ..., description="HTML-escaped description with matches wrapped in <mark>"
+    )
+
+
+class TransactionPage(BaseModel):
+    """Schema for a keyset-paginated page of transactions."""
+    model_config = ConfigDict(json_schema_extra={
+        "example": {
+            "items": [],
+            "next_cursor": "WyIyMDI0LTEyLTAxIiw0Ml0"
+        }
+    })
+
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page; null on the last page"
+    )
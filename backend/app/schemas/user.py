@@ -1,7 +1,7 @@
 import re
 from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class UserCreate(BaseModel):
@@ -61,6 +61,32 @@ class UserResponse(BaseModel):
     created_at: datetime
 
 
+class AdminUserResponse(UserResponse):
+    """Schema for a user in the admin list; stats are set when requested."""
+
+    wallet_count: Optional[int] = None
+    transaction_count: Optional[int] = None
+    last_activity_at: Optional[datetime] = None
+
+
+class AdminUserPage(BaseModel):
+    """Schema for a keyset-paginated page of users."""
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [],
+                "next_cursor": "WyIyMDI0LTEyLTAxVDEwOjMwOjAwKzAwOjAwIiw0Ml0",
+            }
+        }
+    )
+
+    items: List[AdminUserResponse]
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page; null on the last page"
+    )
+
+
 class Token(BaseModel):
     """Schema for JWT access token response."""
 
@@ -0,0 +1,68 @@
+"""
+Receipt image pre-processing before OCR.
+
+Phone photos arrive as multi-megabyte, full-colour, often sideways JPEGs.
+The vision model only needs legible text, so before upload we:
+
+1. Apply the EXIF orientation so the text is upright.
+2. Downscale so the long edge is at most ``max_edge`` pixels.
+3. Convert to grayscale.
+4. Re-encode as WebP/JPEG at ``quality``.
+
+This is CPU-bound Pillow work; callers run it via ``asyncio.to_thread``.
+"""
+
+import io
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+from ..core.config import settings
+
+# Part of the scan cache key: bump when the pipeline output changes
+PREPROCESS_VERSION = "1"
+
+_FORMAT_MIME = {"WEBP": "image/webp", "JPEG": "image/jpeg"}
+
+
+def pipeline_version() -> str:
+    """Identify the pipeline and its settings, for cache keys."""
+    return ":".join([
+        PREPROCESS_VERSION,
+        str(settings.RECEIPT_IMAGE_MAX_EDGE),
+        str(settings.RECEIPT_IMAGE_QUALITY),
+        settings.RECEIPT_IMAGE_FORMAT,
+        str(settings.RECEIPT_IMAGE_GRAYSCALE),
+    ])
+
+
+def preprocess_receipt_image(image_bytes: bytes, mime_type: str) -> Tuple[bytes, str]:
+    """
+    Shrink a receipt image for OCR.
+
+    Returns the processed bytes and their MIME type. If the image cannot be
+    decoded, or re-encoding would not make it smaller, the original bytes
+    and MIME type are returned unchanged.
+    """
+    max_edge = settings.RECEIPT_IMAGE_MAX_EDGE
+    grayscale = settings.RECEIPT_IMAGE_GRAYSCALE
+    output_format = settings.RECEIPT_IMAGE_FORMAT
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            # For JPEGs, let libjpeg decode at a reduced scale (and straight
+            # to grayscale) instead of inflating the full-resolution bitmap.
+            img.draft("L" if grayscale else "RGB", (max_edge, max_edge))
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+            img = img.convert("L" if grayscale else "RGB")
+
+            out = io.BytesIO()
+            img.save(out, format=output_format, quality=settings.RECEIPT_IMAGE_QUALITY)
+    except Exception:
+        return image_bytes, mime_type
+
+    processed = out.getvalue()
+    if len(processed) >= len(image_bytes):
+        return image_bytes, mime_type
+    return processed, _FORMAT_MIME[output_format]
@@ -0,0 +1,55 @@
+"""
+Maintenance jobs run by the in-process scheduler (``core.scheduler``).
+
+All of them are leader-only: with several API workers each job runs once
+per cluster, on whichever worker currently holds scheduler leadership.
+"""
+
+from ..core import database
+from ..core.config import settings
+from ..core.scheduler import Scheduler
+from ..db.partitions import run_partition_maintenance
+from ..repositories.stats_repo import PlatformStatsRepository
+from .receipt_jobs import receipt_jobs
+from .token_reaper import token_reaper
+
+
+async def maintain_partitions():
+    return await run_partition_maintenance(settings.TRANSACTION_PARTITION_YEARS_AHEAD)
+
+
+async def prune_user_activity() -> int:
+    async with database.acquire() as conn:
+        return await PlatformStatsRepository(conn).prune_activity()
+
+
+def register_maintenance_jobs(scheduler: Scheduler) -> None:
+    scheduler.add_job(
+        "refresh_token_reaper",
+        token_reaper.reap,
+        interval=settings.REFRESH_TOKEN_REAP_INTERVAL_SECONDS,
+        jitter=60,
+        timeout=600,
+    )
+    scheduler.add_job(
+        "partition_maintenance",
+        maintain_partitions,
+        cron="15 0 * * *",
+        jitter=300,
+        timeout=1800,
+        run_at_start=True,
+    )
+    scheduler.add_job(
+        "prune_user_activity",
+        prune_user_activity,
+        cron="5 * * * *",
+        jitter=60,
+        timeout=120,
+    )
+    scheduler.add_job(
+        "prune_receipt_jobs",
+        receipt_jobs.prune,
+        cron="35 * * * *",
+        jitter=60,
+        timeout=120,
+    )
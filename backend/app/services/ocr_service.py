@@ -9,6 +9,8 @@ Uses Gemini's native Structured Outputs (response_schema) to guarantee
 and schema hallucination issues.
 """
 
+import asyncio
+import hashlib
 import json
 
 import typing_extensions as typing
@@ -55,6 +57,11 @@ class ReceiptScanner:
     preventing prompt drift and JSON formatting errors.
     """
 
+    MODEL_NAME = "gemini-2.5-flash"
+
+    # Bump when post-processing of the model output changes
+    RESULT_REVISION = 1
+
     SYSTEM_PROMPT = """Analyze this shopping receipt image. Extract every purchased item, its final price, and the transaction date.
     Attempt to guess the category based on the item name.
 Rules:
@@ -63,10 +70,22 @@ Rules:
 - Prices should be strictly numeric.
 - Category must be one of: Food, Transport, Shopping, Entertainment, Bills, Health, Hygiene, Education, Other."""
 
+    # Part of the scan cache key: any change to model, prompt or schema
+    # yields a new version and so bypasses previously cached results.
+    cache_version = hashlib.sha256(
+        "|".join([
+            MODEL_NAME,
+            SYSTEM_PROMPT,
+            repr(ExpectedReceipt.__annotations__),
+            repr(ReceiptItem.__annotations__),
+            str(RESULT_REVISION),
+        ]).encode()
+    ).hexdigest()[:16]
+
     def __init__(self):
         """Initialize the Gemini model with API key configuration."""
         genai.configure(api_key=settings.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
+        self.model = genai.GenerativeModel(self.MODEL_NAME)
 
     def _parse_json_response(self, response_text: str) -> dict:
         """
@@ -90,6 +109,9 @@ Rules:
         """
         Scan a receipt image and extract structured data.
 
+        The Gemini SDK call is synchronous, so it runs in a worker thread to
+        keep the event loop free for the multi-second vision round trip.
+
         Args:
             image_bytes: Raw bytes of the receipt image.
             mime_type: MIME type of the image (default: image/jpeg).
@@ -105,7 +127,8 @@ Rules:
             image_part = {"mime_type": mime_type, "data": image_bytes}
 
             # Generate content with structured output enforcement
-            response = self.model.generate_content(
+            response = await asyncio.to_thread(
+                self.model.generate_content,
                 [self.SYSTEM_PROMPT, image_part],
                 generation_config=genai.types.GenerationConfig(
                     temperature=0.1,  # Low temperature for consistent output
@@ -149,10 +172,39 @@ Rules:
             )
 
 
+class FakeReceiptScanner:
+    """
+    Offline stand-in for ReceiptScanner used in tests and local development.
+
+    Returns a fixed receipt without calling Gemini. Enable it with
+    ``RECEIPT_SCANNER_BACKEND=fake``.
+    """
+
+    cache_version = "fake-1"
+
+    RESULT = {
+        "date": "2024-12-01",
+        "total_amount": 8500,
+        "items": [
+            {"name": "Indomie Goreng", "price": 3500, "category_guess": "Food"},
+            {"name": "Sabun Lifebuoy", "price": 5000, "category_guess": "Hygiene"},
+        ],
+    }
+
+    async def scan_image(
+        self, image_bytes: bytes, mime_type: str = "image/jpeg"
+    ) -> dict:
+        return json.loads(json.dumps(self.RESULT))
+
+
 # Singleton instance for dependency injection
-receipt_scanner = ReceiptScanner()
+receipt_scanner = (
+    FakeReceiptScanner()
+    if settings.RECEIPT_SCANNER_BACKEND == "fake"
+    else ReceiptScanner()
+)
 
 
-def get_receipt_scanner() -> ReceiptScanner:
+def get_receipt_scanner() -> "ReceiptScanner | FakeReceiptScanner":
     """Dependency injection function for ReceiptScanner."""
     return receipt_scanner
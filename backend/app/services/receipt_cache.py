@@ -0,0 +1,91 @@
+"""
+Two-tier cache for receipt scan results.
+
+Keys are the SHA-256 of the uploaded image bytes plus the scanner's
+``cache_version`` (model, prompt and schema), so a prompt change never
+serves stale extractions. Lookups try a per-process LRU first, then the
+``receipt_scan_cache`` table shared by every worker; both tiers expire
+entries after ``ttl`` seconds.
+
+The cache is best-effort: database errors are logged and treated as a
+miss so a cache outage never fails a scan.
+"""
+
+import copy
+import hashlib
+from typing import Optional
+
+from ..core import database
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.logging_config import logger
+from ..core.metrics import metrics
+from ..repositories.receipt_cache_repo import ReceiptCacheRepository
+
+
+class ReceiptScanCache:
+    def __init__(self, max_entries: int, ttl: int):
+        self.ttl = ttl
+        self._local: TTLCache[dict] = TTLCache(max_entries, ttl)
+
+    @staticmethod
+    def make_key(image_bytes: bytes, version: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(version.encode())
+        digest.update(b"\0")
+        digest.update(image_bytes)
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Return a copy of the cached result, or None on a miss."""
+        result = self._local.get(key)
+        if result is not None:
+            metrics.inc("receipt_cache.hit", tier="memory")
+            return copy.deepcopy(result)
+
+        if database.pool is not None:
+            try:
+                async with database.acquire() as conn:
+                    result = await ReceiptCacheRepository(conn).get(key)
+            except Exception:
+                metrics.inc("receipt_cache.error")
+                logger.warning("Receipt cache lookup failed", exc_info=True)
+                result = None
+
+        if result is None:
+            metrics.inc("receipt_cache.miss")
+            return None
+
+        metrics.inc("receipt_cache.hit", tier="db")
+        self._local.set(key, result)
+        return copy.deepcopy(result)
+
+    async def put(self, key: str, result: dict) -> None:
+        """Store a successful scan result in both tiers."""
+        self._local.set(key, copy.deepcopy(result))
+
+        if database.pool is None:
+            return
+        try:
+            async with database.acquire() as conn:
+                repo = ReceiptCacheRepository(conn)
+                await repo.put(key, result, self.ttl)
+                # Writes happen once per Gemini call, so sweeping here is cheap
+                await repo.delete_expired()
+        except Exception:
+            metrics.inc("receipt_cache.error")
+            logger.warning("Receipt cache write failed", exc_info=True)
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+
+receipt_scan_cache = ReceiptScanCache(
+    max_entries=settings.RECEIPT_CACHE_MAX_ENTRIES,
+    ttl=settings.RECEIPT_CACHE_TTL_SECONDS,
+)
+
+
+def get_receipt_scan_cache() -> ReceiptScanCache:
+    """Dependency injection function for ReceiptScanCache."""
+    return receipt_scan_cache
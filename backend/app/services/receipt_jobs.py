@@ -0,0 +1,235 @@
+"""
+Receipt scan job queue.
+
+``POST /receipts/scan`` validates the upload, enqueues a job and returns
+immediately; a fixed number of worker tasks drain the queue and call the
+scanner, and clients poll ``GET /receipts/jobs/{id}`` for the result. The
+number of workers bounds concurrent calls to the OCR provider, and the
+queue limit bounds memory held by pending uploads.
+
+Uploads wait in the accepting worker's memory, but job status and results
+are stored in ``receipt_scan_jobs``, so a poll can land on any API worker.
+Jobs this process still holds when it shuts down are marked failed, and the
+``prune_receipt_jobs`` maintenance job fails jobs orphaned by a crash and
+deletes finished ones ``ttl`` seconds after they finish.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from ..core import database
+from ..core.config import settings
+from ..core.logging_config import logger
+from ..repositories.receipt_job_repo import ReceiptJobRepository
+from .receipt_cache import ReceiptScanCache, receipt_scan_cache
+
+_INTERRUPTED = "Receipt scan was interrupted. Please upload it again."
+
+
+@dataclass
+class ReceiptJob:
+    id: str
+    user_id: int
+    image_bytes: Optional[bytes] = None
+    mime_type: str = ""
+    scanner: Any = None
+    cache_key: Optional[str] = None
+    status: str = "queued"
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+
+
+class ReceiptJobQueue:
+    def __init__(
+        self,
+        workers: int,
+        queue_limit: int,
+        ttl: float,
+        cache: Optional[ReceiptScanCache] = None,
+    ):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.ttl = ttl
+        self.cache = cache
+        # Jobs accepted by this process that have not finished yet
+        self._pending: Dict[str, ReceiptJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _ensure_workers(self) -> None:
+        """Start the worker tasks on first use (lifespan does not run in tests)."""
+        if self._tasks and not all(task.done() for task in self._tasks):
+            return
+        # Keep an existing queue: jobs still waiting in it must not be orphaned
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_limit)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"receipt-scan-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def submit(
+        self,
+        user_id: int,
+        image_bytes: bytes,
+        mime_type: str,
+        scanner: Any,
+        cache_key: Optional[str] = None,
+    ) -> ReceiptJob:
+        """
+        Enqueue a scan and return the pending job.
+
+        Raises:
+            HTTPException: 503 if the queue is full.
+        """
+        self._ensure_workers()
+        if self._queue.full():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Receipt scanner is busy. Please try again shortly.",
+            )
+
+        job = ReceiptJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            image_bytes=image_bytes,
+            mime_type=mime_type,
+            scanner=scanner,
+            cache_key=cache_key,
+        )
+        async with database.acquire() as conn:
+            await ReceiptJobRepository(conn).create(job.id, user_id)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            # Filled up while the row was being written
+            await self._finish(
+                job,
+                "failed",
+                error="Receipt scanner is busy. Please try again shortly.",
+                error_status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Receipt scanner is busy. Please try again shortly.",
+            ) from None
+        self._pending[job.id] = job
+        return job
+
+    async def complete(self, user_id: int, result: dict) -> ReceiptJob:
+        """Record an already-finished job, e.g. for a scan cache hit."""
+        job = ReceiptJob(
+            id=uuid.uuid4().hex, user_id=user_id, status="done", result=result
+        )
+        async with database.acquire() as conn:
+            await ReceiptJobRepository(conn).create(job.id, user_id, "done", result)
+        return job
+
+    async def get(self, job_id: str, user_id: int) -> Optional[ReceiptJob]:
+        """Return the job if it exists and belongs to ``user_id``."""
+        async with database.acquire() as conn:
+            row = await ReceiptJobRepository(conn).get(job_id, user_id)
+        return ReceiptJob(**row) if row else None
+
+    async def _worker(self) -> None:
+        while True:
+            job: ReceiptJob = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception:
+                logger.exception(f"Receipt scan job {job.id} could not be recorded")
+            finally:
+                self._queue.task_done()
+
+    async def _finish(self, job: ReceiptJob, status_: str, **fields: Any) -> None:
+        job.status = status_
+        for name, value in fields.items():
+            setattr(job, name, value)
+        # Drop the upload and scanner reference as soon as the job settles
+        job.image_bytes = None
+        job.scanner = None
+        try:
+            async with database.acquire() as conn:
+                await ReceiptJobRepository(conn).finish(
+                    job.id, job.status, job.result, job.error, job.error_status
+                )
+        finally:
+            self._pending.pop(job.id, None)
+
+    async def _run(self, job: ReceiptJob) -> None:
+        job.status = "processing"
+        async with database.acquire() as conn:
+            await ReceiptJobRepository(conn).mark_processing(job.id)
+        try:
+            result = await job.scanner.scan_image(job.image_bytes, job.mime_type)
+            if self.cache is not None and job.cache_key:
+                await self.cache.put(job.cache_key, result)
+        except HTTPException as exc:
+            await self._finish(
+                job, "failed", error=exc.detail, error_status=exc.status_code
+            )
+        except Exception as exc:
+            logger.exception(f"Receipt scan job {job.id} crashed")
+            await self._finish(
+                job,
+                "failed",
+                error=f"AI Processing Failed: {exc}",
+                error_status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        else:
+            await self._finish(job, "done", result=result)
+
+    async def prune(self) -> int:
+        """
+        Fail jobs left unfinished by a worker that died without shutting
+        down, and delete jobs finished more than ``ttl`` seconds ago.
+        """
+        async with database.acquire() as conn:
+            repo = ReceiptJobRepository(conn)
+            failed = await repo.fail_unfinished(
+                _INTERRUPTED,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                older_than_seconds=self.ttl,
+            )
+            await repo.delete_expired(self.ttl)
+        return failed
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+        # Queued and in-flight uploads die with this process
+        pending, self._pending = list(self._pending), {}
+        if pending:
+            try:
+                async with database.acquire() as conn:
+                    await ReceiptJobRepository(conn).fail_unfinished(
+                        _INTERRUPTED,
+                        status.HTTP_503_SERVICE_UNAVAILABLE,
+                        job_ids=pending,
+                    )
+            except Exception as exc:
+                logger.error(
+                    f"Could not mark {len(pending)} receipt scan jobs failed: {exc}"
+                )
+
+
+receipt_jobs = ReceiptJobQueue(
+    workers=settings.RECEIPT_SCAN_WORKERS,
+    queue_limit=settings.RECEIPT_QUEUE_LIMIT,
+    ttl=settings.RECEIPT_JOB_TTL_SECONDS,
+    cache=receipt_scan_cache,
+)
+
+
+def get_receipt_jobs() -> ReceiptJobQueue:
+    """Dependency injection function for ReceiptJobQueue."""
+    return receipt_jobs
@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from ..core.config import settings
+from ..core.exceptions import AppException
+from ..core.logging_config import logger
+
+
+class RenderService:
+    """
+    Bounded process pool for CPU-bound document rendering (PDF, Excel).
+
+    Handlers fetch rows on the event loop, shrink them to plain tuples and
+    hand them to a function from ``renderers``; the render itself runs in a
+    worker process so a large statement never blocks other requests.
+
+    ``queue_limit`` caps renders that are running or waiting for a worker.
+    A slot is only released when the worker finishes, even if the caller
+    already gave up on a timeout, so abandoned renders still count against
+    the limit instead of piling up unseen behind the pool.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int, timeout: float):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: workers must not inherit the event loop or asyncpg sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def render(self, func: Callable[..., bytes], *args: Any) -> bytes:
+        """
+        Run ``func(*args)`` in the pool and return the rendered bytes.
+
+        Raises:
+            AppException: 503 when the render queue is full, 504 on timeout.
+        """
+        with self._lock:
+            if self._in_flight >= self.queue_limit:
+                raise AppException(
+                    "Export service is busy, please retry shortly",
+                    "RENDER_QUEUE_FULL",
+                    status_code=503,
+                )
+            self._in_flight += 1
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Render {func.__name__} timed out after {self.timeout}s")
+            raise AppException(
+                "Export took too long to generate",
+                "RENDER_TIMEOUT",
+                status_code=504,
+            ) from None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+render_service = RenderService(
+    max_workers=settings.RENDER_POOL_WORKERS,
+    queue_limit=settings.RENDER_QUEUE_LIMIT,
+    timeout=settings.RENDER_TIMEOUT_SECONDS,
+)
+
+
+def get_render_service() -> RenderService:
+    return render_service
@@ -0,0 +1,192 @@
+"""
+CPU-bound document renderers executed in the render process pool.
+
+Everything here is a plain top-level function taking picklable arguments
+(tuples of str/float/date) and returning bytes, so it can run in a worker
+process without touching the database, settings or the event loop.
+"""
+
+import io
+from datetime import date
+from typing import List, Sequence, Tuple
+
+import xlsxwriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+# (date, category, description, type, amount)
+PdfRow = Tuple[str, str, str, str, float]
+
+# (date, wallet, category, type, description, amount)
+ExcelRow = Tuple[date, str, str, str, str, float]
+
+
+def render_transactions_pdf(
+    rows: Sequence[PdfRow], wallet_name: str, date_label: str
+) -> bytes:
+    """Render a transaction statement as a PDF document."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        rightMargin=36,
+        leftMargin=36,
+        topMargin=36,
+        bottomMargin=36,
+    )
+    elements = []
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        "DocTitle",
+        parent=styles["Heading1"],
+        fontSize=18,
+        leading=22,
+        textColor=colors.HexColor("#212121"),
+        spaceAfter=4,
+    )
+    subtitle_style = ParagraphStyle(
+        "DocSubtitle",
+        parent=styles["Normal"],
+        fontSize=9,
+        textColor=colors.HexColor("#75758a"),
+        spaceAfter=16,
+    )
+
+    elements.append(Paragraph(f"Transaction Report - {wallet_name}", title_style))
+    elements.append(Paragraph(date_label, subtitle_style))
+
+    data: List[list] = [["Date", "Category", "Description", "Type", "Amount"]]
+    for day, category, description, trans_type, amount in rows:
+        data.append([day, category, description, trans_type, f"IDR {amount:,.0f}"])
+
+    table = Table(data, colWidths=[75, 95, 210, 60, 100])
+    table.setStyle(
+        TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#eeece7")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.HexColor("#212121")),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, -1), 9),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+            ("TOPPADDING", (0, 0), (-1, -1), 6),
+            ("ALIGN", (4, 0), (4, -1), "RIGHT"),
+            ("LINEBELOW", (0, 0), (-1, -1), 0.5, colors.HexColor("#d9d9dd")),
+        ])
+    )
+
+    elements.append(table)
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def render_report_excel(
+    rows: Sequence[ExcelRow],
+    total_income: float,
+    total_expense: float,
+    start_date: date,
+    end_date: date,
+) -> bytes:
+    """Render the accounting-style transaction report workbook."""
+    output = io.BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    worksheet = workbook.add_worksheet("Transactions")
+
+    # Formats
+    header_format = workbook.add_format({
+        'bold': True,
+        'align': 'center',
+        'valign': 'vcenter',
+        'bg_color': '#D9D9D9',
+        'border': 1,
+        'border_color': '#000000'
+    })
+
+    date_format = workbook.add_format({
+        'num_format': 'dd/mm/yyyy',
+        'align': 'center',
+        'border': 1
+    })
+
+    text_format = workbook.add_format({
+        'align': 'left',
+        'border': 1
+    })
+
+    text_center_format = workbook.add_format({
+        'align': 'center',
+        'border': 1
+    })
+
+    currency_income_format = workbook.add_format({
+        'num_format': '_("Rp"* #,##0_);_("Rp"* (#,##0);_("Rp"* "-"_);_(@_)',
+        'align': 'right',
+        'border': 1,
+        'font_color': '#006400'
+    })
+
+    currency_expense_format = workbook.add_format({
+        'num_format': '_("Rp"* #,##0_);_("Rp"* (#,##0);_("Rp"* "-"_);_(@_)',
+        'align': 'right',
+        'border': 1,
+        'font_color': '#8B0000'
+    })
+
+    title_format = workbook.add_format({
+        'bold': True,
+        'font_size': 14,
+        'align': 'left'
+    })
+
+    summary_label_format = workbook.add_format({
+        'bold': True,
+        'align': 'right'
+    })
+
+    summary_value_format = workbook.add_format({
+        'num_format': '_("Rp"* #,##0_);_("Rp"* (#,##0);_("Rp"* "-"_);_(@_)',
+        'bold': True
+    })
+
+    # Title
+    worksheet.write(0, 0, f"Transaction Report: {start_date.strftime('%d/%m/%Y')} - {end_date.strftime('%d/%m/%Y')}", title_format)
+
+    # Summary
+    worksheet.write(2, 0, "Total Income:", summary_label_format)
+    worksheet.write(2, 1, total_income, summary_value_format)
+    worksheet.write(3, 0, "Total Expense:", summary_label_format)
+    worksheet.write(3, 1, total_expense, summary_value_format)
+    worksheet.write(4, 0, "Net:", summary_label_format)
+    worksheet.write(4, 1, total_income - total_expense, summary_value_format)
+
+    # Headers
+    headers = ["Date", "Wallet", "Category", "Type", "Description", "Amount"]
+    header_row = 6
+
+    for col, header in enumerate(headers):
+        worksheet.write(header_row, col, header, header_format)
+
+    # Data
+    for row_num, (day, wallet, category, trans_type, description, amount) in enumerate(
+        rows, start=header_row + 1
+    ):
+        worksheet.write(row_num, 0, day, date_format)
+        worksheet.write(row_num, 1, wallet, text_format)
+        worksheet.write(row_num, 2, category, text_format)
+        worksheet.write(row_num, 3, trans_type, text_center_format)
+        worksheet.write(row_num, 4, description, text_format)
+
+        amount_format = currency_income_format if trans_type == "INCOME" else currency_expense_format
+        worksheet.write(row_num, 5, amount, amount_format)
+
+    # Column widths
+    worksheet.set_column(0, 0, 12)  # Date
+    worksheet.set_column(1, 1, 15)  # Wallet
+    worksheet.set_column(2, 2, 15)  # Category
+    worksheet.set_column(3, 3, 10)  # Type
+    worksheet.set_column(4, 4, 30)  # Description
+    worksheet.set_column(5, 5, 18)  # Amount
+
+    workbook.close()
+    return output.getvalue()
@@ -0,0 +1,126 @@
+"""
+Description autocomplete.
+
+Suggestions come from ``description_suggestions`` (see SuggestionRepository),
+so a lookup is an indexed prefix scan with a LIMIT rather than a GROUP BY
+over the user's whole history. On top of that, each active user's most used
+suggestions are held in memory as a sorted list of normalized keys: a
+prefix is a contiguous range in that list (found with bisect), which gives
+the same lookups as a trie with far less bookkeeping.
+
+A user's entry is tagged with their response-cache data version, so any
+committed write makes it stale and the next keystroke reloads it.
+"""
+
+import bisect
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+import asyncpg
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.response_cache import response_cache
+from ..repositories.suggestion_repo import SuggestionRepository, normalize_description
+
+# (normalized, category_id, description, use_count, last_used), sorted by normalized
+_Entry = Tuple[str, int, str, int, date]
+
+
+@dataclass
+class _UserIndex:
+    version: str
+    entries: List[_Entry]
+    keys: List[str]
+    # False when the user has more suggestions than fit in memory
+    complete: bool
+
+    def lookup(self, prefix: str, category_id: Optional[int], limit: int) -> Optional[List[str]]:
+        """Answer from memory, or None when only the database can."""
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\uffff", lo)
+        matched = self.entries[lo:hi]
+
+        if category_id is not None:
+            matched = [e for e in matched if e[1] == category_id]
+            # Everything not in memory is used less than everything that is,
+            # so a full page of in-memory matches is the true top of the list
+            if not self.complete and len(matched) < limit:
+                return None
+            matched.sort(key=lambda e: (e[3], e[4]), reverse=True)
+            return [e[2] for e in matched[:limit]]
+
+        # Across categories counts are summed per description, which the
+        # in-memory subset cannot do exactly unless it holds everything
+        if not self.complete:
+            return None
+        merged = {}
+        for normalized, _, description, use_count, last_used in matched:
+            best, total, latest = merged.get(normalized, (description, 0, last_used))
+            merged[normalized] = (max(best, description), total + use_count, max(latest, last_used))
+        ranked = sorted(merged.values(), key=lambda v: (v[1], v[2]), reverse=True)
+        return [v[0] for v in ranked[:limit]]
+
+
+class SuggestionService:
+    def __init__(self, max_users: int, per_user: int, ttl: float):
+        self.per_user = per_user
+        self._indexes: TTLCache[_UserIndex] = TTLCache(max_users, ttl)
+
+    async def _load(self, conn: asyncpg.Connection, user_id: int, version: str) -> _UserIndex:
+        rows = await SuggestionRepository(conn).get_top(user_id, self.per_user + 1)
+        complete = len(rows) <= self.per_user
+        entries = sorted(
+            (
+                (r["normalized"], r["category_id"], r["description"], r["use_count"], r["last_used"])
+                for r in rows[: self.per_user]
+            ),
+            key=lambda e: e[0],
+        )
+        index = _UserIndex(version, entries, [e[0] for e in entries], complete)
+        self._indexes.set(user_id, index)
+        return index
+
+    async def suggest(
+        self,
+        conn: asyncpg.Connection,
+        user_id: int,
+        query: Optional[str],
+        category_id: Optional[int] = None,
+        limit: int = 10,
+    ) -> List[str]:
+        """Most used descriptions starting with ``query``, at most ``limit``."""
+        prefix = normalize_description(query)
+        version = await response_cache.data_version(user_id)
+
+        index = self._indexes.get(user_id)
+        if index is None or index.version != version:
+            metrics.inc("suggestions.cache.miss")
+            index = await self._load(conn, user_id, version)
+        else:
+            metrics.inc("suggestions.cache.hit")
+
+        result = index.lookup(prefix, category_id, limit)
+        if result is not None:
+            return result
+
+        metrics.inc("suggestions.db_fallback")
+        return await SuggestionRepository(conn).search_prefix(
+            user_id, prefix, limit, category_id=category_id
+        )
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+suggestion_service = SuggestionService(
+    max_users=settings.SUGGESTION_CACHE_USERS,
+    per_user=settings.SUGGESTION_CACHE_PER_USER,
+    ttl=settings.SUGGESTION_CACHE_TTL_SECONDS,
+)
+
+
+def get_suggestion_service() -> SuggestionService:
+    return suggestion_service
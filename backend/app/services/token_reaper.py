@@ -0,0 +1,62 @@
+"""
+Deletion of expired and revoked refresh tokens.
+
+Every ``/auth/refresh`` inserts a row and revokes the previous one, so
+without upkeep ``refresh_tokens`` grows forever. ``reap()`` runs as a
+scheduled job (see ``services.maintenance``) and deletes dead tokens in
+batches of ``batch_size``, pausing briefly between batches so a large
+backlog never holds locks or the connection for long.
+
+A session advisory lock ensures only one pass runs at a time, even if a
+manual run overlaps the scheduled one.
+
+Metrics:
+    refresh_tokens.reaped          rows deleted
+    refresh_tokens.reap_seconds    duration of a full pass
+    refresh_tokens.reaper.skipped  passes skipped because another held the lock
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from ..core import database
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..repositories.token_repo import RefreshTokenRepository
+
+_LOCK_KEY = "refresh_token_reaper"
+_BATCH_PAUSE_SECONDS = 0.05
+
+
+class RefreshTokenReaper:
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+
+    async def reap(self) -> Optional[int]:
+        """
+        Run one pass; returns the number of tokens deleted, or None when
+        another worker holds the lock.
+        """
+        async with database.acquire() as conn:
+            if not await conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", _LOCK_KEY):
+                metrics.inc("refresh_tokens.reaper.skipped")
+                return None
+            try:
+                repo = RefreshTokenRepository(conn)
+                started = time.perf_counter()
+                total = 0
+                while True:
+                    deleted = await repo.delete_expired_batch(self.batch_size)
+                    total += deleted
+                    metrics.inc("refresh_tokens.reaped", deleted)
+                    if deleted < self.batch_size:
+                        break
+                    await asyncio.sleep(_BATCH_PAUSE_SECONDS)
+                metrics.observe("refresh_tokens.reap_seconds", time.perf_counter() - started)
+                return total
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", _LOCK_KEY)
+
+
+token_reaper = RefreshTokenReaper(batch_size=settings.REFRESH_TOKEN_REAP_BATCH_SIZE)
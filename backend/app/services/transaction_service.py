@@ -218,65 +218,68 @@ class TransactionService:
         all_categories = await self.category_repo.get_all(current_user_id)
         categories_map = {c["id"]: c for c in all_categories}
 
-        created_transactions = []
-
-        # Use a single database transaction for atomicity
-        async with self.conn.transaction():
-            for idx, trans_data in enumerate(transactions_data):
-                # Verify wallet belongs to user using cached map
-                wallet = wallets_map.get(trans_data.wallet_id)
-                if not wallet:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Item {idx + 1}: Wallet not found",
-                    )
-
-                # Verify category exists and is accessible using cached map
-                category = categories_map.get(trans_data.category_id)
-                if not category:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Item {idx + 1}: Category not found",
-                    )
-
-                if (
-                    category["user_id"] is not None
-                    and category["user_id"] != current_user_id
-                ):
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail=f"Item {idx + 1}: Category not accessible",
-                    )
-
-                # Validate category type matches transaction type
-                if category["type"] != trans_data.type:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=(
-                            f"Item {idx + 1}: Category type ({category['type']}) "
-                            f"does not match transaction type ({trans_data.type})"
-                        ),
-                    )
-
-                try:
-                    transaction = await self.trans_repo.create(
-                        user_id=current_user_id,
-                        wallet_id=trans_data.wallet_id,
-                        category_id=trans_data.category_id,
-                        amount=trans_data.amount,
-                        trans_type=trans_data.type,
-                        transaction_date=trans_data.transaction_date or date.today(),
-                        description=trans_data.description,
-                    )
-                except ValueError as exc:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Item {idx + 1}: {str(exc)}",
-                    ) from exc
-
-                # Add category and wallet names
-                transaction["category_name"] = category["name"]
-                transaction["wallet_name"] = wallet["name"]
-                created_transactions.append(transaction)
+        items = []
+        for idx, trans_data in enumerate(transactions_data):
+            # Verify wallet belongs to user using cached map
+            wallet = wallets_map.get(trans_data.wallet_id)
+            if not wallet:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Item {idx + 1}: Wallet not found",
+                )
+
+            # Verify category exists and is accessible using cached map
+            category = categories_map.get(trans_data.category_id)
+            if not category:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Item {idx + 1}: Category not found",
+                )
+
+            if (
+                category["user_id"] is not None
+                and category["user_id"] != current_user_id
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Item {idx + 1}: Category not accessible",
+                )
+
+            # Validate category type matches transaction type
+            if category["type"] != trans_data.type:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"Item {idx + 1}: Category type ({category['type']}) "
+                        f"does not match transaction type ({trans_data.type})"
+                    ),
+                )
+
+            items.append(
+                {
+                    "wallet_id": trans_data.wallet_id,
+                    "category_id": trans_data.category_id,
+                    "amount": trans_data.amount,
+                    "trans_type": trans_data.type,
+                    "transaction_date": trans_data.transaction_date or date.today(),
+                    "description": trans_data.description,
+                }
+            )
+
+        # Set-based insert: one wallet lock, one INSERT and one UPDATE per
+        # wallet, all inside a single database transaction for atomicity
+        try:
+            created_transactions = await self.trans_repo.bulk_create(
+                current_user_id, items
+            )
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            ) from exc
+
+        # Add category and wallet names
+        for transaction in created_transactions:
+            transaction["category_name"] = categories_map[transaction["category_id"]]["name"]
+            transaction["wallet_name"] = wallets_map[transaction["wallet_id"]]["name"]
 
         return created_transactions
@@ -0,0 +1,106 @@
+"""
+Compare JSON serialization paths for a large report list.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.bench_serialization [rows]
+
+* legacy   - per-row dict rebuild with float()/str(), then FastAPI's
+             jsonable_encoder + stdlib json (the old /reports/list path)
+* pydantic - List[TransactionResponse] response_model validation and dump
+* raw      - rows handed to orjson as fetched (``raw_json``)
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from backend.app.core.responses import raw_json
+from backend.app.schemas.transaction import TransactionResponse
+
+
+def make_rows(count: int) -> List[dict]:
+    start = date(2024, 1, 1)
+    return [
+        {
+            "id": i,
+            "user_id": 1,
+            "wallet_id": 1 + i % 3,
+            "category_id": 1 + i % 12,
+            "transaction_date": start + timedelta(days=i % 365),
+            "wallet_name": "Bank BCA",
+            "category_name": "Food & Dining",
+            "type": "EXPENSE" if i % 4 else "INCOME",
+            "description": f"Transaction {i}",
+            "amount": Decimal(f"{(i * 137) % 1000000}.50"),
+            "created_at": datetime(2024, 1, 1, 12, 30),
+        }
+        for i in range(count)
+    ]
+
+
+def legacy(rows: List[dict]) -> bytes:
+    content = {
+        "transactions": [
+            {
+                "transaction_date": str(row["transaction_date"]),
+                "wallet_name": row["wallet_name"],
+                "category_name": row["category_name"],
+                "type": row["type"],
+                "description": row["description"] or "",
+                "amount": float(row["amount"]),
+            }
+            for row in rows
+        ]
+    }
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+_adapter = TypeAdapter(List[TransactionResponse])
+
+
+def pydantic_model(rows: List[dict]) -> bytes:
+    return _adapter.dump_json(_adapter.validate_python(rows))
+
+
+def raw(rows: List[dict]) -> bytes:
+    return raw_json({"transactions": rows}).body
+
+
+def measure(fn, rows, repeat: int):
+    fn(rows)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows)
+    elapsed = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rows = make_rows(count)
+    repeat = max(1, 200_000 // count)
+
+    print(f"{count} rows, mean of {repeat} runs")
+    print(f"{'path':<10}{'ms/call':>10}{'peak KiB':>12}{'speedup':>10}")
+    baseline = None
+    for name, fn in (("legacy", legacy), ("pydantic", pydantic_model), ("raw", raw)):
+        elapsed, peak = measure(fn, rows, repeat)
+        baseline = baseline or elapsed
+        print(f"{name:<10}{elapsed * 1000:>10.2f}{peak / 1024:>12.0f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
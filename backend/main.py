@@ -6,6 +6,9 @@ from contextlib import asynccontextmanager
 import asyncpg
 
 from backend.app.core.database import create_pool, close_pool
+from backend.app.core.etag import NotModified, not_modified_handler
+from backend.app.core.responses import FastJSONResponse
+from backend.app.core.scheduler import scheduler
 from backend.app.core.config import settings
 from backend.app.core.security import limiter
 from backend.app.core.logging_config import logger
@@ -31,6 +34,9 @@ from backend.app.routers import (
     logs_router,
     users_router,
 )
+from backend.app.services.render_service import render_service
+from backend.app.services.receipt_jobs import receipt_jobs
+from backend.app.services.maintenance import register_maintenance_jobs
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
@@ -40,11 +46,20 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Finance Tracking API...")
     await create_pool()
     logger.info("Database connection pool created")
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+        logger.info(f"Scheduler started with {len(scheduler.jobs)} jobs")
     yield
+    await scheduler.shutdown()
+    await receipt_jobs.shutdown()
+    render_service.shutdown()
     await close_pool()
     logger.info("Database connection pool closed")
 
 
+register_maintenance_jobs(scheduler)
+
+
 app = FastAPI(
     title="Finance Tracking API",
     description="""
@@ -61,6 +76,7 @@ All endpoints (except `/auth/*`) require a valid JWT token in the `Authorization
     """,
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -75,8 +91,8 @@ app.add_middleware(
     allow_origins=settings.BACKEND_CORS_ORIGINS,
     allow_credentials=True,  # Required for cookies
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
-    expose_headers=["X-Request-ID"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["X-Request-ID", "ETag"],
 )
 
 @app.middleware("http")
@@ -92,6 +108,7 @@ async def add_security_headers(request: Request, call_next):
 
 # Exception Handlers
 app.add_exception_handler(AppException, app_exception_handler)
+app.add_exception_handler(NotModified, not_modified_handler)
 app.add_exception_handler(
     asyncpg.UniqueViolationError, asyncpg_unique_violation_handler
 )
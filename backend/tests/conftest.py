@@ -49,36 +49,20 @@ async def test_db():
     await sys_conn.execute("CREATE DATABASE finance_test_db")
     await sys_conn.close()
     
-    # Connect to test database and create schema
+    # Connect to test database and build the schema from the migrations
+    from backend.app.db.migrate import apply_migrations
+
     conn = await asyncpg.connect(TEST_DATABASE_URL)
-    
-    # Read and execute schema
-    schema_path = os.path.join(
-        os.path.dirname(__file__), "..", "app", "db", "schema.sql"
-    )
-    with open(schema_path, "r") as f:
-        schema_sql = f.read()
-    
-    await conn.execute(schema_sql)
-    
-    # Create refresh_tokens table (from security migration)
-    await conn.execute("""
-        CREATE TABLE IF NOT EXISTS refresh_tokens (
-            id SERIAL PRIMARY KEY,
-            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-            token_hash VARCHAR(64) NOT NULL,
-            expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
-            is_revoked BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-            user_agent VARCHAR(255),
-            ip_address VARCHAR(45)
-        )
-    """)
+    await apply_migrations(conn)
     
     await conn.close()
     
-    # Create connection pool for tests
-    pool = await asyncpg.create_pool(TEST_DATABASE_URL, min_size=2, max_size=5)
+    # Create connection pool for tests (same per-connection codecs as the app)
+    from backend.app.core.database import init_connection
+
+    pool = await asyncpg.create_pool(
+        TEST_DATABASE_URL, min_size=2, max_size=5, init=init_connection
+    )
     
     yield pool
     
@@ -99,16 +83,12 @@ async def db_conn(test_db):
 
 @pytest_asyncio.fixture
 async def client(test_db):
-    """Create async test client with dependency override."""
+    """Create async test client backed by the test database pool."""
     from backend.main import app
-    from backend.app.core.database import get_db_conn
-    
-    # Override database dependency
-    async def override_get_db_conn():
-        async with test_db.acquire() as conn:
-            yield conn
+    from backend.app.core import database
     
-    app.dependency_overrides[get_db_conn] = override_get_db_conn
+    # Request sessions and background work both draw from the module-level pool
+    database.pool = test_db
     
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -116,6 +96,7 @@ async def client(test_db):
     
     # Clear overrides
     app.dependency_overrides.clear()
+    database.pool = None
 
 
 @pytest_asyncio.fixture
@@ -167,3 +148,29 @@ async def auth_token(client, test_user):
 async def auth_headers(auth_token):
     """Return authorization headers."""
     return {"Authorization": f"Bearer {auth_token}"}
+
+
+@pytest_asyncio.fixture
+async def admin_headers(client, test_db):
+    """Return authorization headers for a superuser."""
+    from backend.app.core.security import invalidate_principal
+
+    password = os.getenv("TEST_PASSWORD", "TestPass123!")
+    await client.post("/auth/register", json={
+        "email": "admin@example.com",
+        "username": "testadmin",
+        "password": password
+    })
+    admin_id = await test_db.fetchval(
+        "UPDATE users SET is_superuser = TRUE WHERE email = 'admin@example.com' RETURNING id"
+    )
+    invalidate_principal(admin_id)
+
+    response = await client.post(
+        "/auth/token",
+        data={"username": "admin@example.com", "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+    if response.status_code != 200:
+        raise Exception(f"Admin login failed: {response.text}")
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,298 @@
+from httpx import AsyncClient
+
+
+class TestAdminStats:
+    """Test the admin dashboard counters."""
+
+    async def test_stats_match_raw_tables(
+        self, client: AsyncClient, admin_headers, auth_headers, test_db
+    ):
+        """Test trigger-maintained counters agree with full scans after writes."""
+        wallet = (await client.post(
+            "/wallets",
+            json={"name": "Stats Wallet", "balance": 0},
+            headers=auth_headers
+        )).json()
+        category = (await client.post(
+            "/categories",
+            json={"name": "Stats Category", "type": "INCOME", "icon": "tag"},
+            headers=auth_headers
+        )).json()
+        created = (await client.post(
+            "/transactions",
+            json={
+                "wallet_id": wallet["id"],
+                "category_id": category["id"],
+                "amount": 250,
+                "type": "INCOME",
+            },
+            headers=auth_headers
+        )).json()
+        await client.put(
+            f"/transactions/{created['id']}",
+            json={"amount": 300},
+            headers=auth_headers
+        )
+        # Cascades from deleting the wallet must be counted too
+        doomed = (await client.post(
+            "/wallets",
+            json={"name": "Stats Doomed", "balance": 0},
+            headers=auth_headers
+        )).json()
+        await client.post(
+            "/transactions",
+            json={
+                "wallet_id": doomed["id"],
+                "category_id": category["id"],
+                "amount": 40,
+                "type": "INCOME",
+            },
+            headers=auth_headers
+        )
+        await client.delete(f"/wallets/{doomed['id']}", headers=auth_headers)
+
+        # A user whose only transaction is deleted is no longer active
+        admin_wallet = (await client.post(
+            "/wallets",
+            json={"name": "Stats Admin Wallet", "balance": 0},
+            headers=admin_headers
+        )).json()
+        admin_category = (await client.post(
+            "/categories",
+            json={"name": "Stats Admin Category", "type": "INCOME", "icon": "tag"},
+            headers=admin_headers
+        )).json()
+        lone = (await client.post(
+            "/transactions",
+            json={
+                "wallet_id": admin_wallet["id"],
+                "category_id": admin_category["id"],
+                "amount": 10,
+                "type": "INCOME",
+            },
+            headers=admin_headers
+        )).json()
+        await client.delete(f"/transactions/{lone['id']}", headers=admin_headers)
+        assert not await test_db.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM user_activity_hourly WHERE user_id = $1)",
+            lone["user_id"]
+        )
+
+        response = await client.get("/admin/stats", headers=admin_headers)
+        assert response.status_code == 200
+        stats = response.json()
+
+        expected = await test_db.fetchrow(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM users) AS total_users,
+                COUNT(*) AS total_transactions,
+                COALESCE(SUM(amount) FILTER (WHERE type = 'INCOME'), 0) AS total_income,
+                COALESCE(SUM(amount) FILTER (WHERE type = 'EXPENSE'), 0) AS total_expense,
+                COUNT(DISTINCT user_id) FILTER (
+                    WHERE created_at >= CURRENT_TIMESTAMP - INTERVAL '24 hours'
+                ) AS active_users_24h
+            FROM transactions
+            """
+        )
+        assert stats["total_users"] == expected["total_users"]
+        assert stats["total_transactions"] == expected["total_transactions"]
+        assert stats["total_income"] == float(expected["total_income"])
+        assert stats["total_expense"] == float(expected["total_expense"])
+        assert stats["active_users_24h"] == expected["active_users_24h"]
+
+    async def test_stats_require_superuser(self, client: AsyncClient, auth_headers):
+        """Test regular users cannot read platform stats."""
+        response = await client.get("/admin/stats", headers=auth_headers)
+        assert response.status_code == 403
+
+
+class TestAdminUserList:
+    """Test the paginated admin user listing."""
+
+    async def _register(self, client, email, username):
+        response = await client.post("/auth/register", json={
+            "email": email,
+            "username": username,
+            "password": "TestPass123!"
+        })
+        assert response.status_code == 201
+        return response.json()
+
+    async def test_keyset_pages_cover_every_user_once(
+        self, client: AsyncClient, admin_headers, test_db
+    ):
+        """Test walking next_cursor returns each user exactly once, newest first."""
+        for i in range(3):
+            await self._register(client, f"pager{i}@example.com", f"pager_{i}")
+
+        seen, cursor = [], ""
+        while cursor is not None:
+            response = await client.get(
+                "/admin/users",
+                params={"limit": 2, "cursor": cursor},
+                headers=admin_headers
+            )
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= 2
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+
+        expected = await test_db.fetch("SELECT id FROM users ORDER BY created_at DESC, id DESC")
+        assert [u["id"] for u in seen] == [r["id"] for r in expected]
+
+    async def test_prefix_search_filters_and_stats(
+        self, client: AsyncClient, admin_headers, test_db
+    ):
+        """Test prefix search, status filters and summary counts."""
+        user = await self._register(client, "Zeta.Search@example.com", "zeta_search")
+        await self._register(client, "other@example.com", "zetaless")
+        login = await client.post(
+            "/auth/token",
+            data={"username": "Zeta.Search@example.com", "password": "TestPass123!"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        wallet = (await client.post(
+            "/wallets", json={"name": "Zeta Wallet", "balance": 100}, headers=headers
+        )).json()
+        category = (await client.post(
+            "/categories",
+            json={"name": "Zeta Category", "type": "EXPENSE", "icon": "tag"},
+            headers=headers
+        )).json()
+        response = await client.post(
+            "/transactions",
+            json={
+                "wallet_id": wallet["id"],
+                "category_id": category["id"],
+                "amount": 10,
+                "type": "EXPENSE",
+            },
+            headers=headers
+        )
+        assert response.status_code == 201
+
+        response = await client.get(
+            "/admin/users",
+            params={"q": "zeta.s", "include_stats": True},
+            headers=admin_headers
+        )
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [u["id"] for u in items] == [user["id"]]
+        # Registration also creates the default wallet
+        assert items[0]["wallet_count"] == 2
+        assert items[0]["transaction_count"] == 1
+        assert items[0]["last_activity_at"] is not None
+
+        response = await client.get(
+            "/admin/users", params={"q": "zeta"}, headers=admin_headers
+        )
+        assert {u["username"] for u in response.json()["items"]} == {"zeta_search", "zetaless"}
+        assert response.json()["items"][0]["wallet_count"] is None
+
+        # Underscore is matched literally, not as a LIKE wildcard
+        response = await client.get(
+            "/admin/users", params={"q": "zeta_"}, headers=admin_headers
+        )
+        assert [u["username"] for u in response.json()["items"]] == ["zeta_search"]
+
+        await client.patch(f"/admin/users/{user['id']}/toggle-status", headers=admin_headers)
+        response = await client.get(
+            "/admin/users", params={"is_active": False}, headers=admin_headers
+        )
+        assert [u["id"] for u in response.json()["items"]] == [user["id"]]
+
+        response = await client.get(
+            "/admin/users", params={"is_superuser": True}, headers=admin_headers
+        )
+        assert all(u["is_superuser"] for u in response.json()["items"])
+        assert response.json()["items"]
+
+    async def test_invalid_cursor(self, client: AsyncClient, admin_headers):
+        """Test a malformed cursor is rejected."""
+        response = await client.get(
+            "/admin/users", params={"cursor": "not-a-cursor"}, headers=admin_headers
+        )
+        assert response.status_code == 400
+
+
+class TestScheduledJobs:
+    """Test the in-process maintenance scheduler."""
+
+    def test_cron_next_after(self):
+        """Test cron expressions resolve to the next matching UTC minute."""
+        from datetime import datetime, timezone
+        from backend.app.core.scheduler import CronSchedule
+
+        at = datetime(2026, 3, 14, 10, 7, 30, tzinfo=timezone.utc)  # a Saturday
+        assert CronSchedule("5 * * * *").next_after(at) == at.replace(hour=11, minute=5, second=0)
+        assert CronSchedule("15 0 * * *").next_after(at) == datetime(2026, 3, 15, 0, 15, tzinfo=timezone.utc)
+        assert CronSchedule("*/20 9-17 * * 1-5").next_after(at) == datetime(
+            2026, 3, 16, 9, 0, tzinfo=timezone.utc
+        )
+        assert CronSchedule("0 0 1 1 *").next_after(at) == datetime(2027, 1, 1, tzinfo=timezone.utc)
+
+    async def test_run_job_records_status(self):
+        """Test failures and timeouts are recorded instead of raised, and followers skip."""
+        import asyncio
+        from backend.app.core.scheduler import Scheduler
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        sched = Scheduler()
+        sched.is_leader = True
+        slow_job = sched.add_job("slow", slow, interval=60, timeout=0.05)
+        broken_job = sched.add_job("broken", broken, cron="* * * * *")
+        ok_job = sched.add_job("ok", lambda: asyncio.sleep(0, result=3), interval=60)
+        for job in (slow_job, broken_job, ok_job):
+            await sched.run_job(job)
+
+        assert slow_job.failures == 1 and slow_job.last_error.startswith("Timed out")
+        assert broken_job.last_error == "RuntimeError: boom"
+        assert ok_job.failures == 0 and ok_job.last_result == "3"
+        assert ok_job.last_duration is not None
+
+        sched.is_leader = False
+        await sched.run_job(ok_job)
+        assert ok_job.runs == 1 and ok_job.skipped == 1
+
+    async def test_single_leader_and_jobs_endpoint(
+        self, client: AsyncClient, admin_headers
+    ):
+        """Test only one scheduler holds leadership and job status is exposed."""
+        import asyncpg
+        from backend.app.core.scheduler import Scheduler, scheduler
+
+        other = Scheduler()
+        try:
+            assert await scheduler.check_leadership()
+            # A dedicated session, not a connection borrowed from the request pool
+            assert isinstance(scheduler._leader_conn, asyncpg.Connection)
+            assert not await other.check_leadership()
+            # A follower does not keep its connection open
+            assert other._leader_conn is None
+
+            await scheduler.shutdown()
+            assert await other.check_leadership()
+        finally:
+            await other.shutdown()
+            await scheduler.shutdown()
+
+        response = await client.get("/admin/jobs", headers=admin_headers)
+        assert response.status_code == 200
+        body = response.json()
+        names = {job["name"] for job in body["jobs"]}
+        assert {
+            "refresh_token_reaper",
+            "partition_maintenance",
+            "prune_user_activity",
+            "prune_receipt_jobs",
+        } <= names
+        assert body["is_leader"] is False
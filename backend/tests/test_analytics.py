@@ -0,0 +1,199 @@
+import pytest
+from httpx import AsyncClient
+
+
+class TestAnalyticsRollup:
+    """Test analytics served from the daily rollup stay in sync with writes."""
+
+    @pytest.fixture
+    async def setup_wallet(self, client, auth_headers):
+        """Create a funded wallet via API."""
+        response = await client.post(
+            "/wallets",
+            json={"name": "Rollup Wallet", "balance": 1000000},
+            headers=auth_headers
+        )
+        return response.json()
+
+    @pytest.fixture
+    async def setup_category(self, client, auth_headers):
+        """Get an expense category, creating one if none exist."""
+        response = await client.get("/categories?type=EXPENSE", headers=auth_headers)
+        categories = response.json()
+        if categories:
+            return categories[0]
+
+        response = await client.post(
+            "/categories",
+            json={"name": "Rollup Food", "type": "EXPENSE", "icon": "utensils"},
+            headers=auth_headers
+        )
+        return response.json()
+
+    async def _period_summary(self, client, auth_headers):
+        response = await client.get(
+            "/analytics/period-summary?start_date=2001-03-01&end_date=2001-03-31",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    async def test_rollup_tracks_create_update_delete(
+        self, client: AsyncClient, auth_headers, setup_wallet, setup_category
+    ):
+        """Test period summary follows create, update and delete."""
+        before = await self._period_summary(client, auth_headers)
+
+        response = await client.post(
+            "/transactions",
+            json={
+                "wallet_id": setup_wallet["id"],
+                "category_id": setup_category["id"],
+                "amount": 40000,
+                "type": "EXPENSE",
+                "transaction_date": "2001-03-10",
+            },
+            headers=auth_headers
+        )
+        transaction_id = response.json()["id"]
+
+        summary = await self._period_summary(client, auth_headers)
+        assert summary["total_expense"] == before["total_expense"] + 40000
+        assert summary["transaction_count"] == before["transaction_count"] + 1
+
+        # Moving the transaction out of the range removes it from the summary
+        await client.put(
+            f"/transactions/{transaction_id}",
+            json={"amount": 55000, "transaction_date": "2001-04-02"},
+            headers=auth_headers
+        )
+        summary = await self._period_summary(client, auth_headers)
+        assert summary == before
+
+        await client.put(
+            f"/transactions/{transaction_id}",
+            json={"transaction_date": "2001-03-15"},
+            headers=auth_headers
+        )
+        summary = await self._period_summary(client, auth_headers)
+        assert summary["total_expense"] == before["total_expense"] + 55000
+
+        await client.delete(f"/transactions/{transaction_id}", headers=auth_headers)
+        summary = await self._period_summary(client, auth_headers)
+        assert summary == before
+
+    async def test_rollup_matches_raw_transactions(
+        self, client: AsyncClient, auth_headers, test_user, db_conn
+    ):
+        """Test the incrementally maintained rollup equals a full rebuild."""
+        from backend.app.repositories.rollup_repo import RollupRepository
+
+        query = """
+            SELECT day, wallet_id, category_id, type, is_system, total, txn_count
+            FROM daily_user_category_totals
+            WHERE user_id = $1
+            ORDER BY day, wallet_id, category_id, type
+        """
+        incremental = await db_conn.fetch(query, test_user["id"])
+
+        await RollupRepository(db_conn).rebuild(test_user["id"])
+        rebuilt = await db_conn.fetch(query, test_user["id"])
+
+        assert [dict(r) for r in incremental] == [dict(r) for r in rebuilt]
+
+
+class TestAnalyticsResponseCache:
+    """Test repeat analytics reads are served from the response cache."""
+
+    URL = "/analytics/category-breakdown?start_date=2002-05-01&end_date=2002-05-31"
+
+    async def test_repeat_read_cached_until_write(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test a repeat breakdown is served from cache and a write refreshes it."""
+        from backend.app.core.metrics import metrics
+
+        first = await client.get(self.URL, headers=auth_headers)
+        assert first.status_code == 200
+
+        hits = metrics.counter("response_cache.hit", endpoint="category-breakdown")
+        second = await client.get(self.URL, headers=auth_headers)
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert metrics.counter("response_cache.hit", endpoint="category-breakdown") == hits + 1
+
+        wallet = (await client.post(
+            "/wallets",
+            json={"name": "Cache Wallet", "balance": 100000},
+            headers=auth_headers
+        )).json()
+        category = (await client.post(
+            "/categories",
+            json={"name": "Cache Category", "type": "EXPENSE", "icon": "tag"},
+            headers=auth_headers
+        )).json()
+        await client.post(
+            "/transactions",
+            json={
+                "wallet_id": wallet["id"],
+                "category_id": category["id"],
+                "amount": 12000,
+                "type": "EXPENSE",
+                "transaction_date": "2002-05-20",
+            },
+            headers=auth_headers
+        )
+
+        response = await client.get(self.URL, headers=auth_headers)
+        totals = {item["name"]: item["total"] for item in response.json()}
+        assert totals["Cache Category"] == 12000
+
+    async def test_versions_shared_between_workers(self, client: AsyncClient, test_user):
+        """Test a write seen by one worker's cache changes the version on another."""
+        from backend.app.core.response_cache import PostgresCacheBackend, ResponseCache
+
+        worker_a = ResponseCache(PostgresCacheBackend(max_entries=10, ttl=60))
+        worker_b = ResponseCache(PostgresCacheBackend(max_entries=10, ttl=60))
+        user_id = test_user["id"]
+
+        before = await worker_b.data_version(user_id)
+        assert await worker_a.data_version(user_id) == before
+        await worker_a.bump(user_id)
+        assert await worker_b.data_version(user_id) != before
+
+
+class TestAnalyticsDashboard:
+    """Test the combined dashboard endpoint."""
+
+    async def test_dashboard_matches_single_endpoints(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test each dashboard section equals its standalone endpoint."""
+        range_qs = "start_date=2003-02-01&end_date=2003-02-28"
+        response = await client.get(
+            f"/analytics/dashboard?{range_qs}&group_by=wallet&month=2&year=2003",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        expected = {
+            "breakdown": f"/analytics/wallet-breakdown?{range_qs}",
+            "summary": f"/analytics/period-summary?{range_qs}",
+            "trend": f"/analytics/trend?{range_qs}",
+            "comparison": "/analytics/comparison?month=2&year=2003",
+        }
+        for key, url in expected.items():
+            single = await client.get(url, headers=auth_headers)
+            assert data[key] == single.json()
+
+    async def test_dashboard_without_month_skips_comparison(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test comparison is empty unless month and year are given."""
+        response = await client.get(
+            "/analytics/dashboard?start_date=2003-01-01&end_date=2003-12-31",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["comparison"] == []
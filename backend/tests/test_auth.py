@@ -99,3 +99,99 @@ class TestAuthentication:
         response = await client.get("/auth/me")
         
         assert response.status_code == 401
+
+    async def test_principal_cached_between_requests(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test repeat authenticated requests skip the users lookup."""
+        from backend.app.core.metrics import metrics
+
+        await client.get("/auth/me", headers=auth_headers)
+        misses = metrics.counter("auth.principal_cache.miss")
+
+        response = await client.get("/auth/me", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert metrics.counter("auth.principal_cache.miss") == misses
+
+    async def test_profile_update_invalidates_principal(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test a cached principal is refreshed after the profile changes."""
+        original = (await client.get("/auth/me", headers=auth_headers)).json()
+
+        response = await client.put(
+            "/users/profile", json={"username": "cache_renamed"}, headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        response = await client.get("/auth/me", headers=auth_headers)
+        assert response.json()["username"] == "cache_renamed"
+
+        await client.put(
+            "/users/profile",
+            json={"username": original["username"]},
+            headers=auth_headers
+        )
+
+    async def test_cached_principal_takes_no_connection(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test a request with nothing to query never acquires from the pool."""
+        from backend.app.core.metrics import metrics
+
+        await client.get("/auth/me", headers=auth_headers)
+        before = metrics.snapshot()["histograms"]["db.pool.acquire_seconds"]["count"]
+
+        await client.get("/auth/me", headers=auth_headers)
+
+        after = metrics.snapshot()["histograms"]["db.pool.acquire_seconds"]["count"]
+        assert after == before
+
+
+class TestRefreshTokenReaper:
+    """Test background cleanup of dead refresh tokens."""
+
+    async def _insert(self, conn, user_id, tag, expires, revoked):
+        await conn.execute(
+            """
+            INSERT INTO refresh_tokens (user_id, token_hash, expires_at, is_revoked)
+            VALUES ($1, $2, NOW() + make_interval(days => $3), $4)
+            """,
+            user_id, f"reaper-{tag}".ljust(64, "0"), expires, revoked
+        )
+
+    async def test_reaps_expired_and_revoked_in_batches(
+        self, client: AsyncClient, test_user, db_conn
+    ):
+        """Test only dead tokens are deleted, across several batches."""
+        from backend.app.core.metrics import metrics
+        from backend.app.services.token_reaper import RefreshTokenReaper
+
+        user_id = await db_conn.fetchval(
+            "SELECT id FROM users WHERE email = $1", test_user["email"]
+        )
+        for i in range(3):
+            await self._insert(db_conn, user_id, f"expired{i}", -1, False)
+            await self._insert(db_conn, user_id, f"revoked{i}", 1, True)
+        await self._insert(db_conn, user_id, "live", 1, False)
+        reaped_before = metrics.counter("refresh_tokens.reaped")
+
+        deleted = await RefreshTokenReaper(batch_size=2).reap()
+
+        assert deleted >= 6
+        assert metrics.counter("refresh_tokens.reaped") == reaped_before + deleted
+        remaining = await db_conn.fetch(
+            "SELECT token_hash FROM refresh_tokens WHERE token_hash LIKE 'reaper-%'"
+        )
+        assert [r["token_hash"] for r in remaining] == ["reaper-live".ljust(64, "0")]
+
+    async def test_skips_when_another_worker_holds_the_lock(self, client: AsyncClient, db_conn):
+        """Test the advisory lock keeps a second worker from reaping concurrently."""
+        from backend.app.services.token_reaper import RefreshTokenReaper
+
+        await db_conn.execute("SELECT pg_advisory_lock(hashtext('refresh_token_reaper'))")
+        try:
+            assert await RefreshTokenReaper(batch_size=2).reap() is None
+        finally:
+            await db_conn.execute("SELECT pg_advisory_unlock(hashtext('refresh_token_reaper'))")
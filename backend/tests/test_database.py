@@ -0,0 +1,152 @@
+from httpx import AsyncClient
+
+
+class TestConnectionPool:
+    """Test pool instrumentation and exhaustion handling."""
+
+    async def test_pool_exhaustion_returns_503(
+        self, client: AsyncClient, auth_headers, test_db, monkeypatch
+    ):
+        """Test a request that cannot get a connection fails fast with 503."""
+        from backend.app.core.config import settings
+        from backend.app.core.metrics import metrics
+
+        monkeypatch.setattr(settings, "DB_POOL_ACQUIRE_TIMEOUT", 0.05)
+        timeouts = metrics.counter("db.pool.acquire_timeouts")
+
+        held = []
+        try:
+            while test_db.get_idle_size() or test_db.get_size() < test_db.get_max_size():
+                held.append(await test_db.acquire())
+
+            response = await client.get("/wallets", headers=auth_headers)
+        finally:
+            for conn in held:
+                await test_db.release(conn)
+
+        assert response.status_code == 503
+        assert response.json()["code"] == "DB_POOL_EXHAUSTED"
+        assert metrics.counter("db.pool.acquire_timeouts") == timeouts + 1
+
+    async def test_jsonb_codec_registered(self, db_conn):
+        """Test pool connections decode jsonb into Python objects."""
+        value = await db_conn.fetchval("SELECT $1::jsonb", {"items": [1, 2]})
+        assert value == {"items": [1, 2]}
+
+    async def test_reads_use_replica_until_user_writes(
+        self, client: AsyncClient, auth_headers, test_user, test_db, monkeypatch
+    ):
+        """Test read endpoints go to the replica, except right after a write."""
+        from backend.app.core import database
+        from backend.app.core.config import settings
+        from backend.app.core.metrics import metrics
+        from backend.app.core.response_cache import response_cache
+
+        def replica_acquires():
+            histogram = metrics.snapshot()["histograms"].get(
+                "db.replica_pool.acquire_seconds"
+            )
+            return histogram["count"] if histogram else 0
+
+        # Stand the test pool in as the replica
+        monkeypatch.setattr(database, "read_pool", test_db)
+        monkeypatch.setattr(settings, "READ_REPLICA_PIN_SECONDS", 60)
+        # Age out writes made by earlier tests
+        user_id = await test_db.fetchval(
+            "SELECT id FROM users WHERE email = $1", test_user["email"]
+        )
+        await test_db.execute(
+            "UPDATE cache_generations SET changed_at = changed_at - INTERVAL '1 hour' "
+            "WHERE scope = $1",
+            f"gen:user:{user_id}",
+        )
+        response_cache.backend.clear()
+        url = "/analytics/period-summary?start_date=2001-01-01&end_date=2001-12-31"
+
+        before = replica_acquires()
+        response = await client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        assert replica_acquires() == before + 1
+
+        # A POST that writes nothing does not pin
+        rejected = await client.post("/wallets", json={}, headers=auth_headers)
+        assert rejected.status_code == 422
+        response_cache.backend.clear()
+        await client.get(url, headers=auth_headers)
+        assert replica_acquires() == before + 2
+
+        await client.post(
+            "/wallets",
+            json={"name": "Replica Pin Wallet", "balance": 0},
+            headers=auth_headers
+        )
+        response_cache.backend.clear()
+        response = await client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        assert replica_acquires() == before + 2
+
+
+class TestTransactionPartitions:
+    """Test yearly partitioning of transactions."""
+
+    async def test_backdated_rows_move_to_their_year(
+        self, client: AsyncClient, auth_headers, db_conn
+    ):
+        """Test maintenance splits a year out of the default partition."""
+        from backend.app.db.partitions import ensure_partitions, is_partitioned
+
+        assert await is_partitioned(db_conn)
+
+        wallet = (await client.post(
+            "/wallets",
+            json={"name": "Partition Wallet", "balance": 1000},
+            headers=auth_headers
+        )).json()
+        category = (await client.post(
+            "/categories",
+            json={"name": "Partition Category", "type": "EXPENSE", "icon": "tag"},
+            headers=auth_headers
+        )).json()
+        created = (await client.post(
+            "/transactions",
+            json={
+                "wallet_id": wallet["id"],
+                "category_id": category["id"],
+                "amount": 100,
+                "type": "EXPENSE",
+                "transaction_date": "1999-05-05",
+                "description": "Old receipt"
+            },
+            headers=auth_headers
+        )).json()
+
+        assert await db_conn.fetchval(
+            "SELECT COUNT(*) FROM transactions_default WHERE id = $1", created["id"]
+        ) == 1
+
+        assert 1999 in await ensure_partitions(db_conn, years_ahead=1)
+        assert await db_conn.fetchval(
+            "SELECT COUNT(*) FROM transactions_default WHERE id = $1", created["id"]
+        ) == 0
+        assert await db_conn.fetchval(
+            "SELECT COUNT(*) FROM transactions_y1999 WHERE id = $1", created["id"]
+        ) == 1
+
+        response = await client.get(
+            "/transactions",
+            params={"start_date": "1999-01-01", "end_date": "1999-12-31"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert [t["description"] for t in response.json()] == ["Old receipt"]
+
+        plan = "\n".join(
+            row[0] for row in await db_conn.fetch(
+                """
+                EXPLAIN SELECT * FROM transactions
+                WHERE transaction_date >= '1999-01-01' AND transaction_date < '1999-06-01'
+                """
+            )
+        )
+        assert "transactions_y1999" in plan
+        assert "transactions_default" not in plan
@@ -0,0 +1,79 @@
+import json
+import logging
+import queue
+
+
+class TestQueuedLogging:
+    """Test the background-thread logging pipeline."""
+
+    def test_records_are_formatted_off_the_calling_context(self):
+        """Test request IDs are captured at enqueue and redaction runs in the listener."""
+        from backend.app.core.logging_config import (
+            JSONFormatter,
+            LogQueueHandler,
+            PIIFilter,
+            request_id_ctx,
+        )
+
+        log_queue = queue.Queue(maxsize=10)
+        handler = LogQueueHandler(log_queue)
+        log = logging.getLogger("fintrack.test_queue")
+        log.addHandler(handler)
+        try:
+            token = request_id_ctx.set("req-123")
+            try:
+                log.warning("login with password=hunter2")
+            finally:
+                request_id_ctx.reset(token)
+        finally:
+            log.removeHandler(handler)
+
+        record = log_queue.get_nowait()
+        # Nothing has been formatted or redacted on the caller's side
+        assert record.msg == "login with password=hunter2"
+        assert record.request_id == "req-123"
+
+        PIIFilter().filter(record)
+        entry = json.loads(JSONFormatter().format(record))
+        assert entry["request_id"] == "req-123"
+        assert "hunter2" not in entry["message"]
+        assert "extra" not in entry
+
+    def test_full_queue_drops_and_counts(self):
+        """Test a full queue drops records instead of blocking the caller."""
+        from backend.app.core.logging_config import LogQueueHandler
+        from backend.app.core.metrics import metrics
+
+        handler = LogQueueHandler(queue.Queue(maxsize=2))
+        log = logging.getLogger("fintrack.test_overflow")
+        log.addHandler(handler)
+        log.propagate = False
+        before = metrics.counter("logging.dropped")
+        try:
+            for i in range(5):
+                log.warning("message %d", i)
+        finally:
+            log.removeHandler(handler)
+            log.propagate = True
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+        assert metrics.counter("logging.dropped") == before + 3
+
+    async def test_one_record_per_request(self, client):
+        """Test the middleware logs a single event carrying the request ID."""
+        from backend.app.core.logging_config import LogQueueHandler
+
+        log_queue = queue.Queue()
+        handler = LogQueueHandler(log_queue)
+        log = logging.getLogger("fintrack.middleware")
+        log.addHandler(handler)
+        try:
+            response = await client.get("/", headers={"X-Request-ID": "abc-1"})
+        finally:
+            log.removeHandler(handler)
+
+        assert response.headers["X-Request-ID"] == "abc-1"
+        records = [log_queue.get_nowait() for _ in range(log_queue.qsize())]
+        assert [r.event for r in records] == ["request_finished"]
+        assert records[0].request_id == "abc-1"
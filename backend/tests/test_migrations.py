@@ -0,0 +1,121 @@
+import asyncpg
+import pytest
+
+
+class TestMigrations:
+    """Test the versioned migration runner."""
+
+    async def test_test_database_is_fully_migrated(self, db_conn):
+        """Test the suite's schema comes from the migrations and none are pending."""
+        from backend.app.db.migrate import load_migrations, pending_migrations
+
+        recorded = await db_conn.fetch("SELECT version, checksum FROM schema_migrations")
+        files = {m.version: m.checksum for m in load_migrations()}
+        assert {r["version"]: r["checksum"].strip() for r in recorded} == files
+        assert await pending_migrations(db_conn) == []
+
+    async def test_plan_then_apply_concurrent_migration(self, db_conn, tmp_path):
+        """Test plan is a dry run and no-transaction steps can build indexes concurrently."""
+        from backend.app.db.migrate import apply_migrations, format_plan, pending_migrations
+
+        (tmp_path / "9001_widgets.sql").write_text(
+            "-- step: table\n"
+            "CREATE TABLE IF NOT EXISTS migration_test_widgets (id INT, name TEXT);\n"
+            "INSERT INTO migration_test_widgets VALUES (1, 'a'), (1, 'b');\n"
+        )
+        (tmp_path / "9002_widgets_index.sql").write_text(
+            "-- migrate: no-transaction\n"
+            "-- step: name index\n"
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_migration_test_widgets_name\n"
+            "    ON migration_test_widgets(name);\n"
+        )
+        try:
+            pending = await pending_migrations(db_conn, tmp_path)
+            plan = format_plan(pending)
+            assert "9001_widgets (transaction)" in plan
+            assert "9002_widgets_index (no transaction)" in plan
+            assert "  - name index: CREATE INDEX CONCURRENTLY" in plan
+            assert await db_conn.fetchval("SELECT to_regclass('migration_test_widgets')") is None
+
+            applied = await apply_migrations(db_conn, tmp_path)
+            assert [m.version for m in applied] == [9001, 9002]
+            assert await db_conn.fetchval(
+                "SELECT indisvalid FROM pg_index "
+                "WHERE indexrelid = 'idx_migration_test_widgets_name'::regclass"
+            )
+            durations = await db_conn.fetch(
+                "SELECT duration_ms FROM schema_migrations WHERE version > 9000"
+            )
+            assert len(durations) == 2 and all(r["duration_ms"] >= 0 for r in durations)
+            assert await apply_migrations(db_conn, tmp_path) == []
+        finally:
+            await db_conn.execute("DROP TABLE IF EXISTS migration_test_widgets")
+            await db_conn.execute("DELETE FROM schema_migrations WHERE version > 9000")
+
+    async def test_failed_concurrent_index_is_rebuilt(self, db_conn, tmp_path):
+        """Test an INVALID index from an interrupted build is dropped and retried."""
+        from backend.app.db.migrate import apply_migrations
+
+        await db_conn.execute(
+            "CREATE TABLE migration_test_codes (code TEXT);"
+            "INSERT INTO migration_test_codes VALUES ('x'), ('x');"
+        )
+        (tmp_path / "9003_codes_unique.sql").write_text(
+            "-- migrate: no-transaction\n"
+            "-- step: unique code\n"
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_migration_test_codes\n"
+            "    ON migration_test_codes(code);\n"
+        )
+        try:
+            # The duplicate makes the build fail, leaving an INVALID index behind
+            with pytest.raises(asyncpg.UniqueViolationError):
+                await apply_migrations(db_conn, tmp_path)
+            assert await db_conn.fetchval(
+                "SELECT NOT indisvalid FROM pg_index "
+                "WHERE indexrelid = 'idx_migration_test_codes'::regclass"
+            )
+            assert await db_conn.fetchval(
+                "SELECT COUNT(*) FROM schema_migrations WHERE version = 9003"
+            ) == 0
+
+            await db_conn.execute(
+                "DELETE FROM migration_test_codes "
+                "WHERE ctid = (SELECT MIN(ctid) FROM migration_test_codes)"
+            )
+            await apply_migrations(db_conn, tmp_path)
+            assert await db_conn.fetchval(
+                "SELECT indisvalid FROM pg_index "
+                "WHERE indexrelid = 'idx_migration_test_codes'::regclass"
+            )
+        finally:
+            await db_conn.execute("DROP TABLE IF EXISTS migration_test_codes")
+            await db_conn.execute("DELETE FROM schema_migrations WHERE version > 9000")
+
+    async def test_edited_applied_migration_is_refused(self, db_conn, tmp_path):
+        """Test up refuses to run while an applied file differs from its checksum."""
+        from backend.app.db.migrate import MigrationError, apply_migrations
+
+        path = tmp_path / "9004_flags.sql"
+        path.write_text("CREATE TABLE IF NOT EXISTS migration_test_flags (id INT);\n")
+        try:
+            await apply_migrations(db_conn, tmp_path)
+            path.write_text("CREATE TABLE IF NOT EXISTS migration_test_flags (id BIGINT);\n")
+            (tmp_path / "9005_more_flags.sql").write_text(
+                "ALTER TABLE migration_test_flags ADD COLUMN IF NOT EXISTS name TEXT;\n"
+            )
+
+            with pytest.raises(MigrationError, match="9004_flags"):
+                await apply_migrations(db_conn, tmp_path)
+            assert await db_conn.fetchval(
+                "SELECT COUNT(*) FROM schema_migrations WHERE version = 9005"
+            ) == 0
+            # The lock was released despite the error
+            assert await db_conn.fetchval(
+                "SELECT COUNT(*) FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()"
+            ) == 0
+
+            applied = await apply_migrations(db_conn, tmp_path, allow_changed=True)
+            assert [m.version for m in applied] == [9005]
+        finally:
+            await db_conn.execute("DROP TABLE IF EXISTS migration_test_flags")
+            await db_conn.execute("DELETE FROM schema_migrations WHERE version > 9000")
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 
@@ -33,3 +35,228 @@ class TestReceiptsSecurity:
         
         assert response.status_code == 415
         assert "Malicious file signature detected" in response.text
+
+
+def _tiny_png() -> bytes:
+    """Build a valid 1x1 PNG so uploads pass magic-byte validation."""
+    import struct
+    import zlib
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    pixels = zlib.compress(b"\x00\xff\xff\xff")
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", pixels)
+        + chunk(b"IEND", b"")
+    )
+
+
+class TestReceiptScanJobs:
+    """Test the asynchronous receipt scan job flow."""
+
+    @pytest.fixture
+    def fake_scanner(self):
+        """Route scans to the offline fake scanner."""
+        from backend.main import app
+        from backend.app.services.ocr_service import (
+            FakeReceiptScanner,
+            get_receipt_scanner,
+        )
+
+        app.dependency_overrides[get_receipt_scanner] = FakeReceiptScanner
+        yield
+        app.dependency_overrides.pop(get_receipt_scanner, None)
+
+    async def _poll(self, client, job_id, headers):
+        for _ in range(50):
+            response = await client.get(f"/receipts/jobs/{job_id}", headers=headers)
+            assert response.status_code == 200
+            job = response.json()
+            if job["status"] in ("done", "failed"):
+                return job
+            await asyncio.sleep(0.02)
+        raise AssertionError("Scan job did not finish")
+
+    async def test_scan_returns_job_and_result(
+        self, client: AsyncClient, auth_headers, fake_scanner
+    ):
+        """Test upload is accepted immediately and the result is polled."""
+        files = {"file": ("receipt.png", _tiny_png(), "image/png")}
+        response = await client.post(
+            "/receipts/scan", files=files, headers=auth_headers
+        )
+
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        job = await self._poll(client, job_id, auth_headers)
+        assert job["status"] == "done"
+        assert job["result"]["date"] == "2024-12-01"
+        assert [item["name"] for item in job["result"]["items"]] == [
+            "Indomie Goreng",
+            "Sabun Lifebuoy",
+        ]
+
+    async def test_job_visible_to_other_workers(
+        self, client: AsyncClient, auth_headers, test_user, db_conn, fake_scanner
+    ):
+        """Test a job accepted by one worker can be polled through another."""
+        from backend.app.services.receipt_jobs import ReceiptJobQueue
+
+        files = {"file": ("receipt.png", _tiny_png(), "image/png")}
+        response = await client.post(
+            "/receipts/scan", files=files, headers=auth_headers
+        )
+        job_id = response.json()["job_id"]
+        await self._poll(client, job_id, auth_headers)
+
+        user_id = await db_conn.fetchval(
+            "SELECT id FROM users WHERE email = $1", test_user["email"]
+        )
+        other_worker = ReceiptJobQueue(workers=1, queue_limit=5, ttl=900)
+        job = await other_worker.get(job_id, user_id)
+        assert job is not None
+        assert job.status == "done"
+        assert job.result["date"] == "2024-12-01"
+
+    async def test_restart_keeps_queue_and_shutdown_fails_held_jobs(
+        self, client: AsyncClient, test_user, db_conn
+    ):
+        """Test restarted workers drain the old queue and shutdown fails what is left."""
+        from backend.app.services.ocr_service import FakeReceiptScanner
+        from backend.app.services.receipt_jobs import ReceiptJobQueue
+
+        release = asyncio.Event()
+
+        class GatedScanner(FakeReceiptScanner):
+            async def scan_image(self, image_bytes, mime_type="image/jpeg"):
+                await release.wait()
+                return await super().scan_image(image_bytes, mime_type)
+
+        user_id = await db_conn.fetchval(
+            "SELECT id FROM users WHERE email = $1", test_user["email"]
+        )
+        jobs = ReceiptJobQueue(workers=1, queue_limit=5, ttl=900)
+        stuck = await jobs.submit(user_id, _tiny_png(), "image/png", GatedScanner())
+        waiting = await jobs.submit(user_id, _tiny_png(), "image/png", GatedScanner())
+        for _ in range(50):
+            if stuck.status == "processing":
+                break
+            await asyncio.sleep(0.01)
+
+        # Worker dies mid-scan; the next submit restarts workers on the same queue
+        for task in jobs._tasks:
+            task.cancel()
+        await asyncio.gather(*jobs._tasks, return_exceptions=True)
+        queue = jobs._queue
+        later = await jobs.submit(user_id, _tiny_png(), "image/png", GatedScanner())
+        assert jobs._queue is queue
+
+        release.set()
+        for _ in range(50):
+            if waiting.status == later.status == "done":
+                break
+            await asyncio.sleep(0.01)
+        assert (await jobs.get(waiting.id, user_id)).status == "done"
+        assert (await jobs.get(later.id, user_id)).status == "done"
+
+        await jobs.shutdown()
+        job = await jobs.get(stuck.id, user_id)
+        assert job.status == "failed"
+        assert job.error_status == 503
+
+    async def test_unknown_job_returns_404(self, client: AsyncClient, auth_headers):
+        """Test polling a job that does not exist (or is not yours) is 404."""
+        response = await client.get("/receipts/jobs/missing", headers=auth_headers)
+        assert response.status_code == 404
+
+    async def test_identical_upload_served_from_cache(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test re-uploading the same image skips the scanner (memory, then DB tier)."""
+        import uuid
+        from backend.main import app
+        from backend.app.services.ocr_service import (
+            FakeReceiptScanner,
+            get_receipt_scanner,
+        )
+        from backend.app.services.receipt_cache import receipt_scan_cache
+
+        class CountingScanner(FakeReceiptScanner):
+            cache_version = f"counting-{uuid.uuid4().hex}"
+            calls = 0
+
+            async def scan_image(self, image_bytes, mime_type="image/jpeg"):
+                CountingScanner.calls += 1
+                return await super().scan_image(image_bytes, mime_type)
+
+        app.dependency_overrides[get_receipt_scanner] = CountingScanner
+        try:
+            files = {"file": ("receipt.png", _tiny_png(), "image/png")}
+            response = await client.post(
+                "/receipts/scan", files=files, headers=auth_headers
+            )
+            job = await self._poll(client, response.json()["job_id"], auth_headers)
+            assert job["status"] == "done"
+
+            # Memory tier
+            response = await client.post(
+                "/receipts/scan", files=files, headers=auth_headers
+            )
+            assert response.status_code == 202
+            assert response.json()["status"] == "done"
+            assert response.json()["result"] == job["result"]
+
+            # Persistent tier
+            receipt_scan_cache.clear_local()
+            response = await client.post(
+                "/receipts/scan", files=files, headers=auth_headers
+            )
+            assert response.json()["status"] == "done"
+            assert CountingScanner.calls == 1
+        finally:
+            app.dependency_overrides.pop(get_receipt_scanner, None)
+
+
+class TestReceiptImagePreprocess:
+    """Test the pre-OCR image shrinking pipeline."""
+
+    def test_preprocess_orients_downscales_and_grays(self):
+        """Test a large sideways colour photo comes out upright, small and gray."""
+        import io
+        import random
+        from PIL import Image, ImageChops
+        from backend.app.services.image_preprocess import preprocess_receipt_image
+
+        # Noisy landscape JPEG tagged "rotate 90° CW" (EXIF orientation 6)
+        rng = random.Random(0)
+        img = Image.frombytes("RGB", (3000, 2000), rng.randbytes(3000 * 2000 * 3))
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=95, exif=exif)
+        original = buffer.getvalue()
+
+        processed, mime = preprocess_receipt_image(original, "image/jpeg")
+
+        assert mime == "image/webp"
+        assert len(processed) < len(original)
+        with Image.open(io.BytesIO(processed)) as out:
+            # WebP has no grayscale mode; check the colour channels agree instead
+            rgb = out.convert("RGB")
+            gray = rgb.convert("L").convert("RGB")
+            assert max(hi for _, hi in ImageChops.difference(rgb, gray).getextrema()) <= 2
+            assert max(out.size) <= 1600
+            assert out.height > out.width
+
+    def test_preprocess_keeps_undecodable_bytes(self):
+        """Test bytes Pillow cannot decode are passed through unchanged."""
+        from backend.app.services.image_preprocess import preprocess_receipt_image
+
+        data = b"\xff\xd8\xff\xe0 not really a jpeg"
+        assert preprocess_receipt_image(data, "image/jpeg") == (data, "image/jpeg")
@@ -0,0 +1,113 @@
+import csv
+from io import StringIO
+
+import pytest
+from httpx import AsyncClient
+
+
+class TestReportExports:
+    """Test report export endpoints."""
+
+    @pytest.fixture
+    async def setup_transactions(self, client, auth_headers):
+        """Create a wallet with three expenses in June 2002."""
+        response = await client.post(
+            "/wallets",
+            json={"name": "Export Wallet", "balance": 1000000},
+            headers=auth_headers
+        )
+        wallet = response.json()
+
+        response = await client.get("/categories?type=EXPENSE", headers=auth_headers)
+        categories = response.json()
+        if categories:
+            category = categories[0]
+        else:
+            response = await client.post(
+                "/categories",
+                json={"name": "Export Food", "type": "EXPENSE"},
+                headers=auth_headers
+            )
+            category = response.json()
+
+        for day in (3, 2, 1):
+            await client.post(
+                "/transactions",
+                json={
+                    "wallet_id": wallet["id"],
+                    "category_id": category["id"],
+                    "amount": 1000 * day,
+                    "type": "EXPENSE",
+                    "transaction_date": f"2002-06-0{day}",
+                    "description": f"Export {day}"
+                },
+                headers=auth_headers
+            )
+        return wallet
+
+    async def test_export_csv_streams_in_chunks(
+        self, client: AsyncClient, auth_headers, setup_transactions, monkeypatch
+    ):
+        """Test CSV export yields every row when flushed one row per chunk."""
+        from backend.app.core.config import settings
+
+        monkeypatch.setattr(settings, "EXPORT_CSV_CHUNK_ROWS", 1)
+
+        response = await client.get(
+            "/reports/export/csv?start_date=2002-06-01&end_date=2002-06-30",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert "text/csv" in response.headers["content-type"]
+        rows = list(csv.reader(StringIO(response.text)))
+        assert rows[0] == ["Date", "Wallet", "Category", "Type", "Description", "Amount"]
+        export_rows = [r for r in rows[1:] if r[1] == "Export Wallet"]
+        assert [r[4] for r in export_rows] == ["Export 3", "Export 2", "Export 1"]
+
+    async def test_report_list_serializes_rows(
+        self, client: AsyncClient, auth_headers, setup_transactions
+    ):
+        """Test the raw-row list keeps its JSON types and the ETag header."""
+        response = await client.get(
+            "/reports/list?start_date=2002-06-01&end_date=2002-06-30",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('W/"')
+        data = response.json()
+        rows = [r for r in data["transactions"] if r["wallet_name"] == "Export Wallet"]
+        assert rows[0]["transaction_date"] == "2002-06-03"
+        assert rows[0]["amount"] == 3000.0
+        assert isinstance(data["summary"]["total_expense"], float)
+
+    async def test_export_excel_renders_workbook(
+        self, client: AsyncClient, auth_headers, setup_transactions
+    ):
+        """Test Excel export returns an xlsx produced by the render pool."""
+        response = await client.get(
+            "/reports/export/excel?start_date=2002-06-01&end_date=2002-06-30",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert "spreadsheetml" in response.headers["content-type"]
+        # xlsx files are zip archives
+        assert response.content[:2] == b"PK"
+
+    async def test_export_excel_rejected_when_render_queue_full(
+        self, client: AsyncClient, auth_headers, monkeypatch
+    ):
+        """Test exports fail fast with 503 instead of queueing without bound."""
+        from backend.app.services.render_service import render_service
+
+        monkeypatch.setattr(render_service, "queue_limit", 0)
+
+        response = await client.get(
+            "/reports/export/excel?start_date=2002-06-01&end_date=2002-06-30",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 503
+        assert response.json()["code"] == "RENDER_QUEUE_FULL"
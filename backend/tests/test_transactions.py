@@ -1,3 +1,5 @@
+import secrets
+
 import pytest
 from httpx import AsyncClient
 
@@ -147,6 +149,167 @@ class TestTransactions:
         assert len(data) == 1
         assert data[0]["description"] == "UniqueSearchKeywordXYZ"
 
+    async def test_search_transactions_ranked_with_highlights(
+        self, client: AsyncClient, auth_headers, setup_wallets, setup_category
+    ):
+        """Test full-text search stems, tolerates typos and highlights matches."""
+        wallet_id = setup_wallets["wallet_a"]["id"]
+        for description in (
+            "Makan siang di warung padang",
+            "Bayar tagihan listrik 5 < 10",
+            "Parkir motor",
+        ):
+            await client.post(
+                "/transactions",
+                json={
+                    "wallet_id": wallet_id,
+                    "category_id": setup_category["id"],
+                    "amount": 10000,
+                    "type": "EXPENSE",
+                    "description": description
+                },
+                headers=auth_headers
+            )
+
+        async def search(q):
+            response = await client.get(
+                f"/transactions/search?q={q}&wallet_id={wallet_id}",
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        hits = await search("listrik")
+        assert [h["description"] for h in hits] == ["Bayar tagihan listrik 5 < 10"]
+        assert hits[0]["highlight"] == "Bayar tagihan <mark>listrik</mark> 5 &lt; 10"
+
+        # Typo still finds the row through trigram similarity
+        hits = await search("padng")
+        assert hits[0]["description"] == "Makan siang di warung padang"
+
+        assert await search("zzqqxx") == []
+
+        # LIKE wildcards are literal, not "every category"
+        assert await search("%25%25") == []
+        assert await search("__") == []
+
+    async def test_search_transactions_rejects_blank_query(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test a query that is too short once trimmed is rejected with 400."""
+        response = await client.get(
+            "/transactions/search?q=%20%20a%20",
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    async def test_get_transactions_cursor_pagination(
+        self, client: AsyncClient, auth_headers, setup_wallets, setup_category
+    ):
+        """Test keyset pagination walks every row exactly once."""
+        wallet_id = setup_wallets["wallet_b"]["id"]
+
+        created_ids = []
+        for day in ("2024-01-01", "2024-01-02", "2024-01-02"):
+            response = await client.post(
+                "/transactions",
+                json={
+                    "wallet_id": wallet_id,
+                    "category_id": setup_category["id"],
+                    "amount": 1000,
+                    "type": "EXPENSE",
+                    "transaction_date": day,
+                    "description": "CursorPage"
+                },
+                headers=auth_headers
+            )
+            created_ids.append(response.json()["id"])
+
+        response = await client.get(
+            f"/transactions?wallet_id={wallet_id}&limit=2&cursor=",
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        first_page = response.json()
+        assert [t["id"] for t in first_page["items"]] == [created_ids[2], created_ids[1]]
+        assert first_page["next_cursor"]
+
+        # offset/skip never shift a cursor page, the first one included
+        response = await client.get(
+            f"/transactions?wallet_id={wallet_id}&limit=2&offset=1&skip=1&cursor=",
+            headers=auth_headers
+        )
+        assert response.json()["items"] == first_page["items"]
+
+        response = await client.get(
+            f"/transactions?wallet_id={wallet_id}&limit=2&cursor={first_page['next_cursor']}",
+            headers=auth_headers
+        )
+        second_page = response.json()
+        assert [t["id"] for t in second_page["items"]] == [created_ids[0]]
+        assert second_page["next_cursor"] is None
+
+    async def test_get_transactions_invalid_cursor(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test a malformed cursor is rejected with 400."""
+        response = await client.get(
+            "/transactions?cursor=not-a-cursor",
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    async def test_batch_create_transactions(
+        self, client: AsyncClient, auth_headers, setup_wallets, setup_category
+    ):
+        """Test batch create inserts in order and applies one net balance change."""
+        wallet = setup_wallets["wallet_b"]
+        items = [
+            {
+                "wallet_id": wallet["id"],
+                "category_id": setup_category["id"],
+                "amount": amount,
+                "type": "EXPENSE",
+                "description": f"Batch item {idx}"
+            }
+            for idx, amount in enumerate([100000, 250000, 150000])
+        ]
+
+        response = await client.post("/transactions/batch", json=items, headers=auth_headers)
+
+        assert response.status_code == 201
+        data = response.json()
+        assert [t["description"] for t in data] == ["Batch item 0", "Batch item 1", "Batch item 2"]
+        assert all(t["wallet_name"] == "Wallet B" for t in data)
+
+        response = await client.get(f"/wallets/{wallet['id']}", headers=auth_headers)
+        assert float(response.json()["balance"]) == float(wallet["balance"]) - 500000
+
+    async def test_batch_create_insufficient_balance_is_atomic(
+        self, client: AsyncClient, auth_headers, setup_wallets, setup_category
+    ):
+        """Test a batch whose running balance goes negative creates nothing."""
+        wallet = setup_wallets["wallet_b"]
+        items = [
+            {
+                "wallet_id": wallet["id"],
+                "category_id": setup_category["id"],
+                "amount": amount,
+                "type": "EXPENSE"
+            }
+            for amount in [300000, 300000]
+        ]
+
+        response = await client.post("/transactions/batch", json=items, headers=auth_headers)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Item 2: Insufficient balance in wallet"
+
+        response = await client.get(
+            f"/transactions?wallet_id={wallet['id']}", headers=auth_headers
+        )
+        assert response.json() == []
+
     async def test_export_transactions_pdf(
         self, client: AsyncClient, auth_headers, setup_wallets
     ):
@@ -287,3 +450,175 @@ class TestTransferFunds:
         
         assert response.status_code == 400
         assert "greater than 0" in response.json()["detail"]
+
+
+class TestConditionalGet:
+    """Test ETag / If-None-Match handling on read endpoints."""
+
+    async def test_unchanged_list_returns_304_after_version_lookup(
+        self, client: AsyncClient, auth_headers
+    ):
+        """Test a matching ETag short-circuits after only the version lookup."""
+        from backend.app.core.metrics import metrics
+
+        first = await client.get("/wallets", headers=auth_headers)
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+
+        before = metrics.snapshot()["histograms"]["db.pool.acquire_seconds"]["count"]
+        response = await client.get(
+            "/wallets", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+        after = metrics.snapshot()["histograms"]["db.pool.acquire_seconds"]["count"]
+        # One short-lived connection to read the shared generation counters
+        assert after == before + 1
+
+    async def test_write_changes_etag(self, client: AsyncClient, auth_headers):
+        """Test a write makes the previous ETag stale."""
+        etag = (await client.get("/wallets", headers=auth_headers)).headers["etag"]
+
+        await client.post(
+            "/wallets",
+            json={"name": "ETag Wallet", "balance": 0},
+            headers=auth_headers
+        )
+        response = await client.get(
+            "/wallets", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert any(w["name"] == "ETag Wallet" for w in response.json())
+
+    async def test_write_on_another_worker_changes_etag(
+        self, client: AsyncClient, auth_headers, test_user, db_conn
+    ):
+        """Test an ETag is not revalidated after a write handled elsewhere."""
+        from backend.app.core.response_cache import PostgresCacheBackend, ResponseCache
+
+        etag = (await client.get("/wallets", headers=auth_headers)).headers["etag"]
+        other_worker = ResponseCache(PostgresCacheBackend(max_entries=10, ttl=60))
+        user_id = await db_conn.fetchval(
+            "SELECT id FROM users WHERE email = $1", test_user["email"]
+        )
+        await other_worker.bump(user_id)
+
+        response = await client.get(
+            "/wallets", headers={**auth_headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    async def test_etag_depends_on_query(self, client: AsyncClient, auth_headers):
+        """Test different filters on the same path get different ETags."""
+        income = await client.get("/categories?type=INCOME", headers=auth_headers)
+        expense = await client.get("/categories?type=EXPENSE", headers=auth_headers)
+        assert income.headers["etag"] != expense.headers["etag"]
+
+
+class TestDescriptionSuggestions:
+    """Test the description autocomplete index."""
+
+    @pytest.fixture
+    async def setup(self, client, auth_headers):
+        wallet = (await client.post(
+            "/wallets",
+            json={"name": "Suggest Wallet", "balance": 1000000},
+            headers=auth_headers
+        )).json()
+        category = (await client.post(
+            "/categories",
+            json={"name": f"Suggest {secrets.token_hex(4)}", "type": "EXPENSE", "icon": "tag"},
+            headers=auth_headers
+        )).json()
+        return wallet, category
+
+    async def _create(self, client, auth_headers, wallet, category, description):
+        response = await client.post(
+            "/transactions",
+            json={
+                "wallet_id": wallet["id"],
+                "category_id": category["id"],
+                "amount": 1000,
+                "type": "EXPENSE",
+                "description": description
+            },
+            headers=auth_headers
+        )
+        return response.json()
+
+    async def _suggest(self, client, auth_headers, category, q, limit=10):
+        response = await client.get(
+            "/transactions/suggestions",
+            params={"q": q, "category_id": category["id"], "limit": limit},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    async def test_prefix_ranked_by_use_and_maintained_on_write(
+        self, client: AsyncClient, auth_headers, setup
+    ):
+        """Test suggestions follow creates, updates and deletes."""
+        wallet, category = setup
+        for description in ("Kopi susu", "kopi  SUSU", "Kopi hitam", "Teh manis"):
+            created = await self._create(client, auth_headers, wallet, category, description)
+
+        assert await self._suggest(client, auth_headers, category, "kop") == [
+            "kopi SUSU", "Kopi hitam"
+        ]
+        assert await self._suggest(client, auth_headers, category, "kop", limit=1) == ["kopi SUSU"]
+
+        # Renaming the last one moves it to a different suggestion
+        await client.put(
+            f"/transactions/{created['id']}",
+            json={"description": "Kopi tubruk"},
+            headers=auth_headers
+        )
+        assert await self._suggest(client, auth_headers, category, "teh") == []
+        assert "Kopi tubruk" in await self._suggest(client, auth_headers, category, "kopi t")
+
+        hitam = await self._suggest(client, auth_headers, category, "kopi h")
+        assert hitam == ["Kopi hitam"]
+
+    async def test_incremental_index_matches_rebuild(
+        self, client: AsyncClient, auth_headers, setup, db_conn
+    ):
+        """Test write-time maintenance agrees with a rebuild from raw rows."""
+        from backend.app.repositories.suggestion_repo import SuggestionRepository
+
+        wallet, category = setup
+        created = await self._create(client, auth_headers, wallet, category, "Roti bakar")
+        await self._create(client, auth_headers, wallet, category, "Roti  bakar")
+        await client.delete(f"/transactions/{created['id']}", headers=auth_headers)
+
+        query = """
+            SELECT user_id, category_id, normalized, use_count
+            FROM description_suggestions ORDER BY 1, 2, 3
+        """
+        incremental = [tuple(r) for r in await db_conn.fetch(query)]
+        await SuggestionRepository(db_conn).rebuild()
+        rebuilt = [tuple(r) for r in await db_conn.fetch(query)]
+        assert incremental == rebuilt
+
+    async def test_deleting_wallet_removes_its_suggestions(
+        self, client: AsyncClient, auth_headers, setup
+    ):
+        """Test descriptions only used in a deleted wallet stop being suggested."""
+        wallet, category = setup
+        other = (await client.post(
+            "/wallets",
+            json={"name": "Suggest Other", "balance": 1000000},
+            headers=auth_headers
+        )).json()
+        await self._create(client, auth_headers, wallet, category, "Nasi goreng")
+        await self._create(client, auth_headers, other, category, "Nasi goreng")
+        await self._create(client, auth_headers, other, category, "Nasi uduk")
+        await self._create(client, auth_headers, other, category, "nasi UDUK")
+
+        response = await client.delete(f"/wallets/{other['id']}", headers=auth_headers)
+        assert response.status_code == 204
+
+        assert await self._suggest(client, auth_headers, category, "nasi") == ["Nasi goreng"]